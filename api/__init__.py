@@ -1,4 +1,4 @@
 from .routes import router
-from .models import KeywordRequest, KeywordResponse, CreativityRequest, CreativityResponse
+from .models import KeywordRequest, KeywordResponse, BatchKeywordRequest, BatchKeywordItem, CreativityRequest, CreativityResponse, ScoredSuggestion, TokenUsage
 
-__all__ = ['router', 'KeywordRequest', 'KeywordResponse', 'CreativityRequest', 'CreativityResponse']
+__all__ = ['router', 'KeywordRequest', 'KeywordResponse', 'BatchKeywordRequest', 'BatchKeywordItem', 'CreativityRequest', 'CreativityResponse', 'ScoredSuggestion', 'TokenUsage']
@@ -10,6 +10,7 @@ class KeywordRequest(BaseModel):
     topic_description: str = Field(..., description="Description of the topic/concept")
     use_search: bool = Field(default=True, description="Enable web search for trending keywords")
     creativity_level: str = Field(default="high", description="Creativity level: low, medium, or high")
+    fast_path: Optional[bool] = Field(default=None, description="Answer with one direct LLM call when web search is disabled (defaults to server setting)")
     
     class Config:
         json_schema_extra = {
@@ -21,14 +22,59 @@ class KeywordRequest(BaseModel):
         }
 
 
+class RunUsage(BaseModel):
+    """LLM tokens of the whole run behind a cached or shared keyword response"""
+    prompt_tokens: int = Field(default=0, description="Prompt tokens of the run")
+    completion_tokens: int = Field(default=0, description="Completion tokens of the run")
+
+
+class TokenUsage(BaseModel):
+    """LLM tokens used to generate a keyword response"""
+    prompt_tokens: int = Field(default=0, description="Prompt tokens this request spent, including agent and tool messages")
+    completion_tokens: int = Field(default=0, description="Completion tokens this request spent")
+    task_tokens: int = Field(default=0, description="Tokens of the task prompt after topic and inspiration budgeting")
+    shared_by: int = Field(default=1, description="Topics that shared this LLM run (packed batch requests)")
+    cached: bool = Field(default=False, description="Served from the result cache or an identical concurrent request, so no tokens were spent")
+    run: Optional[RunUsage] = Field(default=None, description="Tokens of the whole LLM run, for cached and packed results")
+
+
 class KeywordResponse(BaseModel):
     """Response model for keyword generation"""
     success: bool
     keywords: Optional[str] = None
+    taken_keywords: Optional[List[str]] = Field(default=None, description="Suggested names in keywords that are already taken (when a taken-name index is configured)")
     creative_suggestions: Optional[Dict[str, List[str]]] = None
     topic: Optional[str] = None
     creativity_level: Optional[str] = None
     search_enabled: Optional[bool] = None
+    usage: Optional[TokenUsage] = None
+    error: Optional[str] = None
+
+
+class BatchKeywordRequest(BaseModel):
+    """Request model for batch keyword generation"""
+    requests: List[KeywordRequest] = Field(..., min_length=1, max_length=1000, description="Keyword requests to process")
+    max_parallel: int = Field(default=4, ge=1, le=32, description="Maximum crew runs in flight for this batch")
+    pack_size: int = Field(default=1, ge=1, le=10, description="Topics packed into one LLM prompt (requests without web search only)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {"topic_description": "Organic cold brew coffee", "use_search": False, "creativity_level": "high"},
+                    {"topic_description": "Bamboo toothbrush for kids", "use_search": False, "creativity_level": "high"}
+                ],
+                "max_parallel": 4,
+                "pack_size": 2
+            }
+        }
+
+
+class BatchKeywordItem(BaseModel):
+    """One streamed result of a batch keyword generation"""
+    index: int
+    success: bool
+    result: Optional[KeywordResponse] = None
     error: Optional[str] = None
 
 
@@ -36,6 +82,9 @@ class CreativityRequest(BaseModel):
     """Request model for creativity tool suggestions"""
     topic: str = Field(..., description="Topic or phrase to generate suggestions for")
     count: int = Field(default=20, description="Number of suggestions per category")
+    seed: Optional[int] = Field(default=None, description="Seed for a different reproducible set of suggestions (defaults to one derived from the topic)")
+    case_insensitive: bool = Field(default=False, description="Treat names differing only in case as duplicates")
+    separator_insensitive: bool = Field(default=False, description="Treat names differing only in spaces, '_', '-' or '.' as duplicates")
     
     class Config:
         json_schema_extra = {
@@ -46,10 +95,17 @@ class CreativityRequest(BaseModel):
         }
 
 
+class ScoredSuggestion(BaseModel):
+    """A suggestion with its name quality score"""
+    name: str
+    score: float = Field(..., description="Weighted length, pronounceability and letter-pattern score from 0 to 1")
+
+
 class CreativityResponse(BaseModel):
     """Response model for creativity suggestions"""
     success: bool
     suggestions: Optional[Dict[str, List[str]]] = None
+    scores: Optional[Dict[str, List[ScoredSuggestion]]] = Field(default=None, description="Best suggestions per category, highest score first")
     error: Optional[str] = None
 
 
@@ -1,19 +1,27 @@
 """
 FastAPI routes for CrewAI backend
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from api.models import (
     KeywordRequest,
     KeywordResponse,
+    BatchKeywordRequest,
+    BatchKeywordItem,
     CreativityRequest,
     CreativityResponse,
+    ScoredSuggestion,
     HealthResponse
 )
-from crew import CrewManager
-from tools import memory_store, creativity_tool
+from crew import CrewBusyError, get_crew_manager
+from tools import memory_store, creativity_tool, search_cache
+from tools.taken_names import get_taken_filter
+from monitoring.metrics import stage
+from datetime import datetime
+from typing import Optional
+import json
 
 router = APIRouter()
-crew_manager = CrewManager()
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -29,37 +37,119 @@ async def health_check():
 async def generate_keywords(request: KeywordRequest):
     """Generate keyword and word suggestions for a topic"""
     try:
-        result = crew_manager.generate_keywords(
+        result = await get_crew_manager().generate_keywords_async(
             topic_description=request.topic_description,
             use_search=request.use_search,
-            creativity_level=request.creativity_level
+            creativity_level=request.creativity_level,
+            fast_path=request.fast_path
         )
         
         # Save to memory
-        memory_store.save("keyword_generation", {
-            "topic": request.topic_description,
-            "creativity_level": request.creativity_level,
-            "result": result.get("keywords", "")
-        })
+        with stage("memory_save"):
+            memory_store.save("keyword_generation", {
+                "topic": request.topic_description,
+                "creativity_level": request.creativity_level,
+                "result": result.get("keywords", "")
+            })
         
         return KeywordResponse(**result)
     
+    except CrewBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/generate-keywords/stream")
+async def stream_keywords(request: KeywordRequest):
+    """
+    Generate keywords as a Server-Sent Events stream
+    
+    Emits a "suggestions" event immediately, then "step" and "token" events
+    while the crew runs, and finishes with a "result" event carrying the
+    KeywordResponse payload (or an "error" event).
+    """
+    async def event_stream():
+        try:
+            async for event, data in get_crew_manager().stream_keywords(
+                topic_description=request.topic_description,
+                use_search=request.use_search,
+                creativity_level=request.creativity_level,
+                fast_path=request.fast_path
+            ):
+                if event == "result":
+                    with stage("memory_save"):
+                        memory_store.save("keyword_generation", {
+                            "topic": request.topic_description,
+                            "creativity_level": request.creativity_level,
+                            "result": data.get("keywords", "")
+                        })
+                    data = KeywordResponse(**data).model_dump()
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'success': False, 'error': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/generate-keywords/batch")
+async def generate_keywords_batch(request: BatchKeywordRequest):
+    """
+    Generate keywords for many topics, streaming NDJSON results as they complete
+    
+    Each line is a BatchKeywordItem with the index of the originating request.
+    Items finish in any order and fail independently.
+    """
+    async def item_stream():
+        async for index, result in get_crew_manager().generate_keywords_batch(
+            [item.model_dump() for item in request.requests],
+            max_parallel=request.max_parallel,
+            pack_size=request.pack_size
+        ):
+            if result.get("success"):
+                item = request.requests[index]
+                with stage("memory_save"):
+                    memory_store.save("keyword_generation", {
+                        "topic": item.topic_description,
+                        "creativity_level": item.creativity_level,
+                        "result": result.get("keywords", "")
+                    })
+            yield BatchKeywordItem(
+                index=index,
+                success=bool(result.get("success")),
+                result=KeywordResponse(**result),
+                error=result.get("error")
+            ).model_dump_json() + "\n"
+    
+    return StreamingResponse(item_stream(), media_type="application/x-ndjson")
+
+
 @router.post("/creative-suggestions", response_model=CreativityResponse)
 async def get_creative_suggestions(request: CreativityRequest):
     """Get creative word suggestions using the creativity tool"""
     try:
-        suggestions = creativity_tool.get_creative_suggestions(
-            topic=request.topic,
-            count=request.count
-        )
+        with stage("creativity"):
+            suggestions = creativity_tool.get_creative_suggestions(
+                topic=request.topic,
+                count=request.count,
+                seed=request.seed,
+                case_insensitive=request.case_insensitive,
+                separator_insensitive=request.separator_insensitive
+            )
+        
+        ranked = creativity_tool.rank_suggestions(suggestions, top_k=request.count)
         
         return CreativityResponse(
             success=True,
-            suggestions=suggestions
+            suggestions=suggestions,
+            scores={
+                category: [ScoredSuggestion(name=name, score=score) for name, score in items]
+                for category, items in ranked.items()
+            }
         )
     
     except Exception as e:
@@ -69,22 +159,132 @@ async def get_creative_suggestions(request: CreativityRequest):
         )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get keyword result cache, search cache, creativity memo, taken-name filter, executor and crew pool statistics"""
+    crew_manager = get_crew_manager()
+    cache = crew_manager.result_cache
+    taken_filter = get_taken_filter()
+    return {
+        "success": True,
+        "enabled": cache is not None,
+        "cache": cache.stats() if cache is not None else None,
+        "search": search_cache.stats(),
+        "creativity": creativity_tool.cache_stats(),
+        "taken_names": taken_filter.stats() if taken_filter is not None else None,
+        "executor": crew_manager.executor_stats(),
+        "crew_pool": crew_manager.crew_pool.stats()
+    }
+
+
+@router.delete("/cache")
+async def clear_cache():
+    """Clear the keyword result cache"""
+    crew_manager = get_crew_manager()
+    if crew_manager.result_cache is not None:
+        crew_manager.result_cache.clear()
+    return {
+        "success": True,
+        "message": "Keyword result cache cleared"
+    }
+
+
+# Memory routes are plain functions so FastAPI runs them in its threadpool;
+# backends take locks and the SQLite backend reads from disk
+@router.get("/memory/stats")
+def get_memory_stats():
+    """Get memory store footprint, limits and eviction counters"""
+    return {
+        "success": True,
+        "stats": memory_store.stats()
+    }
+
+
+@router.get("/memory/search")
+def search_memory(
+    q: str = Query(..., min_length=1, description="Topic text to match"),
+    creativity_level: Optional[str] = Query(default=None, description="Only entries saved with this level"),
+    session_id: Optional[str] = Query(default=None, description="Only entries stored under this session"),
+    limit: int = Query(default=10, ge=1, le=100, description="Maximum matches to return")
+):
+    """Rank previously saved generations by topic similarity"""
+    try:
+        matches = memory_store.search(
+            q,
+            creativity_level=creativity_level,
+            key=session_id,
+            limit=limit
+        )
+        return {
+            "success": True,
+            "query": q,
+            "matches": matches
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _local_time(since: Optional[datetime]) -> Optional[datetime]:
+    """Convert a timezone-aware timestamp to naive local time, as stored in memory entries"""
+    if since is not None and since.tzinfo is not None:
+        return since.astimezone().replace(tzinfo=None)
+    return since
+
+
 @router.get("/memory/{session_id}")
-async def get_memory(session_id: str):
-    """Retrieve memory for a session"""
+def get_memory(
+    session_id: str,
+    cursor: Optional[int] = Query(default=None, description="next_cursor from the previous page"),
+    offset: int = Query(default=0, ge=0, description="Entries to skip"),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Maximum entries to return (default: 100 when paging)"),
+    since: Optional[datetime] = Query(default=None, description="Only entries saved at or after this ISO timestamp")
+):
+    """
+    Retrieve memory for a session, oldest first
+    
+    Without any of cursor, offset, limit or since, all entries are returned
+    as before pagination existed. Otherwise one page is returned with
+    next_cursor, has_more and total.
+    """
     try:
-        entries = memory_store.retrieve(session_id)
+        if cursor is None and not offset and limit is None and since is None:
+            return {
+                "success": True,
+                "session_id": session_id,
+                "entries": memory_store.retrieve(session_id)
+            }
+        
+        page = memory_store.retrieve_page(
+            session_id,
+            cursor=cursor,
+            offset=offset,
+            limit=limit or 100,
+            since=_local_time(since)
+        )
         return {
             "success": True,
             "session_id": session_id,
-            "entries": entries
+            **page
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/memory/{session_id}/export")
+def export_memory(
+    session_id: str,
+    since: Optional[datetime] = Query(default=None, description="Only entries saved at or after this ISO timestamp")
+):
+    """Stream all memory entries for a session as NDJSON, one entry per line"""
+    def entry_lines():
+        for entry in memory_store.iter_entries(session_id, since=_local_time(since)):
+            yield json.dumps(entry, default=str) + "\n"
+    
+    return StreamingResponse(entry_lines(), media_type="application/x-ndjson")
+
+
 @router.delete("/memory/{session_id}")
-async def clear_memory(session_id: str):
+def clear_memory(session_id: str):
     """Clear memory for a session"""
     try:
         memory_store.clear(session_id)
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the keyword generation backend
+
+Run from the repository root, e.g. python -m benchmarks.bench_crew_setup
+"""
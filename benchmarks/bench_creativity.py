@@ -0,0 +1,92 @@
+"""
+Benchmark for CreativityTool candidate generation against topic length
+
+Compares building every combination/blend and truncating afterwards
+(previous behaviour) with the lazy, deduplicating generators that stop once
+enough unique candidates are produced. The memo cache is disabled, so every
+call does the full work.
+
+Usage:
+    python -m benchmarks.bench_creativity [--repeats N]
+"""
+import argparse
+import random
+import string
+import time
+
+from tools.creativity_tool import CreativityTool
+
+
+def eager_combinations(words, max_combinations):
+    """Build all pair and triple combinations, then truncate"""
+    combinations = []
+    for i, word1 in enumerate(words):
+        for word2 in words[i+1:]:
+            combinations.append(f"{word1.capitalize()}{word2.capitalize()}")
+            combinations.append(f"{word1}{word2}".title())
+            combinations.append(f"{word1}_{word2}")
+            combinations.append(f"{word1}-{word2}")
+    for i in range(len(words) - 2):
+        combinations.append(f"{words[i].capitalize()}{words[i+1].capitalize()}{words[i+2].capitalize()}")
+    return list(dict.fromkeys(combinations))[:max_combinations]
+
+
+def eager_blends(word1, word2, count=10):
+    """Build every blend of two words, then truncate"""
+    w1, w2 = word1.lower(), word2.lower()
+    blends = [(w1[:i] + w2[j:]).capitalize() for i in range(2, len(w1)) for j in range(1, len(w2) - 1)]
+    blends += [(w2[:i] + w1[j:]).capitalize() for i in range(2, len(w2)) for j in range(1, len(w1) - 1)]
+    return list(dict.fromkeys(blends))[:count]
+
+
+def random_words(rng: random.Random, count: int, length: int = 7):
+    return ["".join(rng.choices(string.ascii_lowercase, k=length)) for _ in range(count)]
+
+
+def timed(func, repeats: int) -> float:
+    """Best wall time of func() in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Eager vs lazy CreativityTool candidate generation")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per case, best is reported (default: 5)")
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+    repeats = args.repeats
+    rng = random.Random(0)
+    tool = CreativityTool(cache_size=0)
+
+    print("combine_words (max_combinations=20)")
+    print(f"  {'words':>7} {'eager ms':>12} {'lazy ms':>12} {'speedup':>9}")
+    for count in (10, 100, 300, 1000):
+        words = random_words(rng, count)
+        assert eager_combinations(words, 20) == tool.combine_words(words, 20)
+        eager = timed(lambda: eager_combinations(words, 20), repeats)
+        lazy = timed(lambda: tool.combine_words(words, 20), repeats)
+        print(f"  {count:>7} {eager:>12.3f} {lazy:>12.3f} {eager / lazy:>8.1f}x")
+
+    print("blend_words (count=10)")
+    print(f"  {'chars':>7} {'eager ms':>12} {'lazy ms':>12} {'speedup':>9}")
+    for length in (10, 50, 200):
+        word1, word2 = random_words(rng, 2, length)
+        assert eager_blends(word1, word2) == tool.blend_words(word1, word2)
+        eager = timed(lambda: eager_blends(word1, word2), repeats)
+        lazy = timed(lambda: tool.blend_words(word1, word2), repeats)
+        print(f"  {length:>7} {eager:>12.3f} {lazy:>12.3f} {eager / lazy:>8.1f}x")
+
+    print("get_creative_suggestions (count=20)")
+    print(f"  {'words':>7} {'ms':>12}")
+    for count in (10, 100, 1000, 10000):
+        topic = " ".join(random_words(rng, count))
+        print(f"  {count:>7} {timed(lambda: tool.get_creative_suggestions(topic, 20), repeats):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark for batched creativity suggestions
+
+Compares calling get_creative_suggestions once per topic with a single
+get_creative_suggestions_many call over the same topics, and checks that
+both return identical results. Topics are 1-5 words drawn from the scoring
+wordlist; the memo cache is disabled so every topic does the full work.
+
+Usage:
+    python -m benchmarks.bench_creativity_batch [--sizes 1000,10000,100000]
+"""
+import argparse
+import random
+import time
+
+from tools.creativity_tool import CreativityTool, np
+from tools.name_scoring import load_wordlist
+
+
+def make_topics(words, size, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(words, rng.randint(1, 5))) for _ in range(size)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-topic loop vs batched creativity suggestions")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated topic counts (default: 1000,10000,100000)")
+    args = parser.parse_args()
+    try:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    except ValueError:
+        parser.error(f"--sizes must be comma-separated integers, got {args.sizes!r}")
+    if any(size < 1 for size in sizes):
+        parser.error("--sizes must all be at least 1")
+    words = load_wordlist()
+    print(f"NumPy affix selection: {'yes' if np is not None else 'no (pure Python fallback)'}")
+
+    for size in sizes:
+        topics = make_topics(words, size)
+
+        tool = CreativityTool(cache_size=0)
+        start = time.perf_counter()
+        single = [tool.get_creative_suggestions(topic) for topic in topics]
+        loop = time.perf_counter() - start
+
+        tool = CreativityTool(cache_size=0)
+        start = time.perf_counter()
+        batch = tool.get_creative_suggestions_many(topics)
+        batched = time.perf_counter() - start
+
+        assert single == batch, "batched results differ from per-topic results"
+        print(
+            f"{size:>7} topics: loop {loop:7.2f}s ({size / loop:7.0f}/s)  "
+            f"batch {batched:7.2f}s ({size / batched:7.0f}/s)  speedup {loop / batched:4.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Microbenchmark for per-request agent/task/crew setup overhead
+
+Compares rebuilding the agent, task and crew for every request against
+checking a prebuilt crew out of the CrewPool. No LLM calls are made.
+
+Usage:
+    python -m benchmarks.bench_crew_setup [iterations]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("SERPER_API_KEY", "benchmark")
+
+from crew import CrewManager
+from crew.crew_manager import _step_callback
+from crewai.utilities.string_utils import interpolate_only
+
+
+def bench_rebuild(manager: CrewManager, iterations: int) -> float:
+    """Build a fresh crew for every request (previous behaviour)"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        crew = manager._build_crew(i % 2 == 0, "high")
+        crew.tasks[0].description = interpolate_only(
+            crew.tasks[0].description, {"task_description": f"topic {i}"}
+        )
+    return time.perf_counter() - start
+
+
+def bench_pooled(manager: CrewManager, iterations: int) -> float:
+    """Check out a prebuilt crew and inject the task description"""
+    manager.crew_pool.prewarm([(True, "high"), (False, "high")])
+    start = time.perf_counter()
+    for i in range(iterations):
+        with manager.crew_pool.acquire(i % 2 == 0, "high") as crew:
+            crew.step_callback = _step_callback(lambda event, data: None)
+            crew.tasks[0].interpolate_inputs_and_add_conversation_history(
+                {"task_description": f"topic {i}"}
+            )
+            crew.step_callback = None
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    manager = CrewManager()
+    manager.verbose = False
+    
+    rebuild = bench_rebuild(manager, iterations)
+    pooled = bench_pooled(manager, iterations)
+    
+    print(f"Per-request setup over {iterations} iterations")
+    print(f"  rebuild agent/task/crew: {rebuild / iterations * 1e3:8.3f} ms")
+    print(f"  pooled crew:             {pooled / iterations * 1e3:8.3f} ms")
+    print(f"  speedup:                 {rebuild / pooled:8.1f}x")
+    print(f"  pool: {manager.crew_pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Import-time benchmark for worker cold start
+
+Runs `python -X importtime` in fresh interpreters and reports the cumulative
+import cost of the application, the heaviest top-level packages, and the
+cost of warming up CrewAI on top (what a lazy worker pays on its first
+keyword request, or APP_INIT_MODE=startup/preload pays up front).
+
+Usage:
+    python -m benchmarks.bench_import_time [--json] [--top N]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def import_profile(statement: str) -> dict:
+    """Run a statement under -X importtime and collect per-module cumulative costs"""
+    env = dict(os.environ, OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "sk-benchmark"))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{completed.stderr[-2000:]}")
+
+    # Lines look like "import time:  self [us] | cumulative | imported package",
+    # with nested imports indented by two spaces per level
+    top_level = {}
+    second_level = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            top_level[name.strip()] = int(cumulative_us)
+        elif depth == 1:
+            second_level[name.strip()] = int(cumulative_us)
+
+    return {
+        "wall_seconds": round(wall, 4),
+        "import_seconds": round(sum(top_level.values()) / 1e6, 4),
+        "top_level": top_level,
+        "second_level": second_level
+    }
+
+
+def main() -> None:
+    as_json = "--json" in sys.argv
+    top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else 10
+
+    results = {
+        "import_main": import_profile("import main"),
+        "import_main_and_warm_up": import_profile(
+            "import main; from crew import get_crew_manager; get_crew_manager().warm_up(prewarm_crews=False)"
+        )
+    }
+
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        print(f"{name}: {result['import_seconds']:.3f}s imports, {result['wall_seconds']:.3f}s wall")
+        modules = {**result["second_level"], **result["top_level"]}
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+        for module, cost in heaviest:
+            print(f"  {cost / 1e3:10.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
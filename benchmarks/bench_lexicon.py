@@ -0,0 +1,70 @@
+"""
+Benchmark for the memory-mapped lexicon index
+
+Reports compile time, map (load) time, lookup latency and the resident
+memory added by loading, compared with parsing the TSV into a dict.
+
+Usage:
+    python -m benchmarks.bench_lexicon [--source lexicon.tsv] [--lookups N]
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from tools.lexicon import DEFAULT_SOURCE, MmapLexicon, compile_lexicon, read_source
+
+
+def rss_kb() -> int:
+    """Current resident set size in KB (Linux), falling back to the peak"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory-mapped lexicon index vs parsing the TSV")
+    parser.add_argument("--source", default=DEFAULT_SOURCE, help="Lexicon TSV to compile (default: the bundled lexicon)")
+    parser.add_argument("--lookups", type=int, default=100000, help="Lookups to time (default: 100000)")
+    args = parser.parse_args()
+    if args.lookups < 1:
+        parser.error("--lookups must be at least 1")
+    if not os.path.isfile(args.source):
+        parser.error(f"--source not found: {args.source}")
+    source, lookups = args.source, args.lookups
+    path = os.path.join(tempfile.mkdtemp(), "lexicon.idx")
+
+    start = time.perf_counter()
+    count = compile_lexicon(source, path)
+    compiled = time.perf_counter() - start
+
+    before = rss_kb()
+    start = time.perf_counter()
+    lexicon = MmapLexicon(path)
+    mapped = time.perf_counter() - start
+    mapped_rss = rss_kb() - before
+
+    before = rss_kb()
+    start = time.perf_counter()
+    parsed = {entry.word: entry for entry in read_source(source)}
+    parse = time.perf_counter() - start
+    parsed_rss = rss_kb() - before
+
+    words = list(parsed)
+    start = time.perf_counter()
+    for i in range(lookups):
+        lexicon.lookup(words[i % len(words)])
+    lookup = time.perf_counter() - start
+
+    print(f"Lexicon with {count} entries ({os.path.getsize(path)} bytes compiled)")
+    print(f"  compile:          {compiled * 1e3:8.3f} ms")
+    print(f"  mmap load:        {mapped * 1e3:8.3f} ms  (+{mapped_rss} KB RSS)")
+    print(f"  parse TSV:        {parse * 1e3:8.3f} ms  (+{parsed_rss} KB RSS)")
+    print(f"  lookup:           {lookup / lookups * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
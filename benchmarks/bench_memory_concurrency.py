@@ -0,0 +1,102 @@
+"""
+Stress benchmark for concurrent MemoryStore access
+
+Hammers save/retrieve from many threads and reports throughput, then checks
+correctness: no lost or duplicated entries and per-thread ordering preserved
+within each key. Throughput that holds steady as threads are added means the
+backend's single lock is not a bottleneck.
+
+Usage:
+    python -m benchmarks.bench_memory_concurrency [--json] [--ops N] [--keys N]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import threading
+import time
+
+from tools.memory_backends import InMemoryBackend
+from tools.memory_tool import MemoryStore
+
+
+def hammer(store: MemoryStore, threads: int, ops_per_thread: int, keys: int) -> dict:
+    """Run a 4:1 save/retrieve mix from several threads"""
+    barrier = threading.Barrier(threads)
+    
+    def work(worker: int) -> int:
+        barrier.wait()
+        retrieved = 0
+        for seq in range(ops_per_thread):
+            key = f"session-{(worker + seq) % keys}"
+            if seq % 5 == 4:
+                retrieved += len(store.retrieve(key))
+            else:
+                store.save(key, {"worker": worker, "seq": seq})
+        return retrieved
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "threads": threads,
+        "ops": threads * ops_per_thread,
+        "seconds": round(elapsed, 4),
+        "ops_per_second": round(threads * ops_per_thread / elapsed),
+        "errors": verify(store, threads, ops_per_thread)
+    }
+
+
+def verify(store: MemoryStore, threads: int, ops_per_thread: int) -> list:
+    """Check that every save landed exactly once and in per-thread order"""
+    errors = []
+    expected = {
+        (worker, seq)
+        for worker in range(threads)
+        for seq in range(ops_per_thread)
+        if seq % 5 != 4
+    }
+    seen = set()
+    for key, entries in store.to_dict().items():
+        last_seq = {}
+        for entry in entries:
+            item = (entry["data"]["worker"], entry["data"]["seq"])
+            if item in seen:
+                errors.append(f"duplicate {item} in {key}")
+            seen.add(item)
+            if last_seq.get(item[0], -1) > item[1]:
+                errors.append(f"out of order {item} in {key}")
+            last_seq[item[0]] = item[1]
+    missing = expected - seen
+    if missing:
+        errors.append(f"{len(missing)} entries missing")
+    if store.stats()["entries"] != len(expected):
+        errors.append(f"entry counter {store.stats()['entries']} != {len(expected)}")
+    return errors[:10]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent MemoryStore throughput and correctness")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations per run, split across threads (default: 20000)")
+    parser.add_argument("--keys", type=int, default=64, help="Distinct session keys (default: 64)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = [
+        hammer(MemoryStore(backend=InMemoryBackend()), threads, args.ops // threads, args.keys)
+        for threads in (1, 4, 16)
+    ]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'threads':>7} {'ops/s':>10}  correctness")
+    for result in results:
+        status = "ok" if not result["errors"] else "; ".join(result["errors"])
+        print(f"{result['threads']:>7} {result['ops_per_second']:>10}  {status}")
+
+
+if __name__ == "__main__":
+    main()
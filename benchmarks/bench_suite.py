@@ -0,0 +1,255 @@
+"""
+End-to-end benchmark suite with a fake LLM and stub web search
+
+Drives the FastAPI app in-process (httpx ASGI transport, no network) with
+CrewManager.llm swapped for benchmarks.fakes.FakeLLM and web search served
+by the stub backend, then runs microbenchmarks of CreativityTool and
+MemoryStore. No API keys are needed.
+
+For every endpoint scenario and concurrency level it reports throughput and
+p50/p95/p99 latency; results are printed as a table and, with --output,
+written as JSON so runs can be compared to catch regressions.
+
+Usage:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --concurrency 1,8,32 --requests 200 --llm-latency 0.2 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+SCENARIOS = ("generate-keywords", "generate-keywords-fast", "creative-suggestions", "memory")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    return samples[min(int(fraction * len(samples)), len(samples) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1e3, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1e3, 3)
+    }
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Point the app at local stand-ins; must run before the app is imported"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("SERPER_API_KEY", "benchmark")
+    os.environ["WEB_SEARCH_BACKEND"] = "stub"
+    os.environ["WEB_SEARCH_STUB_LATENCY"] = str(args.search_latency)
+    os.environ["CREW_VERBOSE"] = str(args.crew_verbose)
+    os.environ["CREW_MAX_CONCURRENCY"] = str(args.crew_concurrency)
+    os.environ["CREW_MAX_QUEUE"] = str(args.requests)
+    if not args.result_cache:
+        os.environ["KEYWORD_CACHE_BACKEND"] = "none"
+    # Keep CrewAI from phoning home or prompting about traces
+    os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+    os.environ["CREWAI_TRACING_ENABLED"] = "false"
+    os.environ["OTEL_SDK_DISABLED"] = "true"
+
+
+def make_request(scenario: str, index: int) -> tuple:
+    """(method, path, params, json body) for the index-th request of a scenario"""
+    topic = f"eco friendly product {index} for remote teams"
+    if scenario == "generate-keywords":
+        return "POST", "/api/generate-keywords", None, {"topic_description": topic, "use_search": True}
+    if scenario == "generate-keywords-fast":
+        return "POST", "/api/generate-keywords", None, {
+            "topic_description": topic, "use_search": False, "fast_path": True
+        }
+    if scenario == "creative-suggestions":
+        return "POST", "/api/creative-suggestions", None, {"topic": topic, "count": 15}
+    # memory: a mix of page reads, searches and stats
+    if index % 3 == 0:
+        return "GET", "/api/memory/search", {"q": f"product {index % 50}", "limit": 10}, None
+    if index % 3 == 1:
+        return "GET", f"/api/memory/bench-{index % 20}", {"limit": 50}, None
+    return "GET", "/api/memory/stats", None, None
+
+
+async def run_load(client, scenario: str, requests: int, concurrency: int) -> dict:
+    """Closed-loop load: concurrency workers send requests back to back"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            method, path, params, body = make_request(scenario, index)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                failed = response.status_code >= 400 or response.json().get("success") is False
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def run_endpoints(args: argparse.Namespace, llm) -> List[dict]:
+    import httpx
+    from main import app
+    from tools import memory_store
+
+    for index in range(args.memory_entries):
+        memory_store.save(f"bench-{index % 20}", {
+            "topic": f"eco friendly product {index % 50} for remote teams",
+            "creativity_level": "high",
+            "result": "- EcoNest\n- GreenFlow"
+        })
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm up imports, the LLM client and pooled crews outside the measurements
+        for scenario in args.scenarios:
+            method, path, params, body = make_request(scenario, -1)
+            await client.request(method, path, params=params, json=body)
+
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                before = llm.token_usage()
+                result = await run_load(client, scenario, args.requests, concurrency)
+                after = llm.token_usage()
+                result.update({
+                    "scenario": scenario,
+                    "concurrency": concurrency,
+                    "prompt_tokens": after["prompt_tokens"] - before["prompt_tokens"],
+                    "completion_tokens": after["completion_tokens"] - before["completion_tokens"]
+                })
+                results.append(result)
+                print(
+                    f"{scenario:<24} c={concurrency:<4} {result['throughput_rps']:9.1f} req/s  "
+                    f"p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms  "
+                    f"p99 {result['p99_ms']:9.2f} ms  errors {result['errors']}",
+                    file=sys.stderr
+                )
+    return results
+
+
+def time_calls(func: Callable[[int], object], iterations: int) -> dict:
+    """Per-call latency distribution of func(i) over iterations calls"""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        call_start = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - call_start)
+    result = summarize(latencies, time.perf_counter() - start, 0)
+    result["ops_per_second"] = result.pop("throughput_rps")
+    del result["errors"]
+    return result
+
+
+def run_micro(iterations: int) -> Dict[str, dict]:
+    from tools.creativity_tool import CreativityTool
+    from tools.memory_tool import MemoryStore
+
+    topics = [f"eco friendly product {i} for remote teams" for i in range(iterations)]
+    uncached = CreativityTool(cache_size=0)
+    cached = CreativityTool(cache_size=16)
+    cached.get_creative_suggestions(topics[0])
+    suggestions = uncached.get_creative_suggestions(topics[0], count=15)
+
+    store = MemoryStore(max_entries_per_key=iterations)
+    results = {
+        "creativity.get_creative_suggestions": time_calls(
+            lambda i: uncached.get_creative_suggestions(topics[i], count=15), iterations
+        ),
+        "creativity.get_creative_suggestions_cached": time_calls(
+            lambda i: cached.get_creative_suggestions(topics[0]), iterations
+        ),
+        "creativity.get_creative_suggestions_many_100": time_calls(
+            lambda i: uncached.get_creative_suggestions_many(topics[i:i + 100], count=15), max(iterations // 100, 1)
+        ),
+        "creativity.rank_suggestions": time_calls(
+            lambda i: uncached.rank_suggestions(suggestions, top_k=5), iterations
+        ),
+        "memory.save": time_calls(
+            lambda i: store.save(f"session-{i % 100}", {"topic": topics[i], "creativity_level": "high", "result": ""}),
+            iterations
+        ),
+        "memory.retrieve": time_calls(lambda i: store.retrieve(f"session-{i % 100}"), iterations),
+        "memory.retrieve_page": time_calls(lambda i: store.retrieve_page(f"session-{i % 100}", limit=20), iterations),
+        "memory.search": time_calls(lambda i: store.search(f"product {i}", limit=10), iterations)
+    }
+    for name, result in results.items():
+        print(f"{name:<46} {result['ops_per_second']:11.0f} ops/s  p99 {result['p99_ms']:8.3f} ms", file=sys.stderr)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end and micro benchmarks with a fake LLM and stub search")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario and concurrency level (default: 100)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM seconds to first token (default: 0.05)")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Fake LLM seconds per output token (default: 0)")
+    parser.add_argument("--output-tokens", type=int, default=200, help="Fake LLM tokens per answer (default: 200)")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Stub search seconds per call (default: 0.02)")
+    parser.add_argument("--crew-concurrency", type=int, default=8, help="CREW_MAX_CONCURRENCY for the run (default: 8)")
+    parser.add_argument("--crew-verbose", action="store_true", help="Run crews with CREW_VERBOSE=True (console output)")
+    parser.add_argument("--result-cache", action="store_true", help="Keep the keyword result cache enabled")
+    parser.add_argument("--memory-entries", type=int, default=2000, help="Memory entries saved before the memory scenario (default: 2000)")
+    parser.add_argument("--micro-iterations", type=int, default=2000, help="Iterations per microbenchmark, 0 to skip (default: 2000)")
+    parser.add_argument("--output", help="Write results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    args.scenarios = [scenario for scenario in args.scenarios.split(",") if scenario]
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    configure_environment(args)
+    from benchmarks.fakes import FakeLLM
+    from crew import get_crew_manager
+
+    llm = FakeLLM(latency=args.llm_latency, token_latency=args.token_latency, output_tokens=args.output_tokens)
+    get_crew_manager().llm = llm
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value for key, value in vars(args).items() if key != "output"
+        },
+        "endpoints": asyncio.run(run_endpoints(args, llm)) if args.scenarios else [],
+        "micro": run_micro(args.micro_iterations) if args.micro_iterations else {}
+    }
+    get_crew_manager().shutdown(wait=False)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
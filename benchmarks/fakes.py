@@ -0,0 +1,156 @@
+"""
+Local stand-ins for the chat model used by the benchmarks
+
+FakeLLM replaces CrewManager.llm so keyword generation can be measured
+without an OpenAI key. It works both as a CrewAI LLM (call(), used by the
+agent loop) and as a LangChain chat model (invoke() and stream(), used by
+the direct fast path). Web search is replaced through the existing
+WEB_SEARCH_BACKEND=stub setting, see tools/web_search_tool.py.
+"""
+from types import SimpleNamespace
+from typing import Any, Iterator, List
+import itertools
+import json
+import threading
+import time
+
+from crewai.llms.base_llm import BaseLLM
+
+SEARCH_TOOL_NAME = "Search the internet with Serper"
+WORDS = (
+    "cloud", "nest", "vault", "spark", "nova", "pulse", "orbit", "flow",
+    "bright", "hub", "lab", "forge", "peak", "wave", "core", "sync"
+)
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count, about four characters per token"""
+    return max(len(text) // 4, 1)
+
+
+def _as_dicts(messages: Any) -> List[dict]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    converted = []
+    for message in messages:
+        if isinstance(message, tuple):
+            role, content = message
+            converted.append({"role": role, "content": content})
+        else:
+            converted.append(message)
+    return converted
+
+
+class FakeLLM(BaseLLM):
+    """
+    Deterministic chat model with configurable latency and output size
+
+    Each completion waits latency seconds (time to first token) plus
+    token_latency per output token, then returns a categorized keyword list
+    of about output_tokens tokens. When the agent has the search tool, the
+    first call of a run asks for one search and the answer follows the
+    observation, so the stub search backend is exercised too.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        output_tokens: int = 200,
+        use_search_tool: bool = True,
+        model: str = "fake-llm"
+    ):
+        super().__init__(model=model, temperature=0.0)
+        self.latency = latency
+        self.token_latency = token_latency
+        self.output_tokens = output_tokens
+        self.use_search_tool = use_search_tool
+        self._usage_lock = threading.Lock()
+
+    def _answer_tokens(self) -> List[str]:
+        """Output split into stream chunks of roughly one token each"""
+        tokens = ["Core keywords:\n"]
+        words = itertools.cycle(WORDS)
+        for position in range(max(self.output_tokens - 1, 0)):
+            if position % 6 == 0:
+                tokens.append(f"\n- {next(words).capitalize()}")
+            else:
+                tokens.append(next(words).capitalize())
+        return tokens
+
+    def _track(self, prompt: str, completion: str) -> None:
+        with self._usage_lock:
+            self._track_token_usage_internal({
+                "prompt_tokens": count_tokens(prompt),
+                "completion_tokens": count_tokens(completion)
+            })
+
+    @staticmethod
+    def _usage(prompt: str, completion: str) -> dict:
+        return {"input_tokens": count_tokens(prompt), "output_tokens": count_tokens(completion)}
+
+    def _wait(self, tokens: int) -> None:
+        delay = self.latency + self.token_latency * tokens
+        if delay:
+            time.sleep(delay)
+
+    def call(
+        self,
+        messages: Any,
+        tools: Any = None,
+        callbacks: Any = None,
+        available_functions: Any = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None
+    ) -> str:
+        messages = _as_dicts(messages)
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        searched = any(message.get("role") == "assistant" for message in messages)
+
+        if self.use_search_tool and SEARCH_TOOL_NAME in prompt and not searched:
+            query = messages[-1]["content"].split('"')[1] if '"' in messages[-1]["content"] else "keywords"
+            completion = (
+                "Thought: I should look up trending keywords first\n"
+                f"Action: {SEARCH_TOOL_NAME}\n"
+                f"Action Input: {json.dumps({'search_query': query[:80]})}"
+            )
+            self._wait(count_tokens(completion))
+        else:
+            tokens = self._answer_tokens()
+            self._wait(len(tokens))
+            completion = "Thought: I now know the final answer\nFinal Answer: " + " ".join(tokens)
+
+        self._track(prompt, completion)
+        return completion
+
+    def invoke(self, messages: Any) -> SimpleNamespace:
+        """LangChain-style single completion"""
+        messages = _as_dicts(messages)
+        prompt = "\n".join(str(message["content"]) for message in messages)
+        tokens = self._answer_tokens()
+        self._wait(len(tokens))
+        content = " ".join(tokens)
+        self._track(prompt, content)
+        return SimpleNamespace(content=content, usage_metadata=self._usage(prompt, content))
+
+    def stream(self, messages: Any) -> Iterator[SimpleNamespace]:
+        """LangChain-style streaming completion, one chunk per token"""
+        messages = _as_dicts(messages)
+        prompt = "\n".join(str(message["content"]) for message in messages)
+        if self.latency:
+            time.sleep(self.latency)
+        tokens = self._answer_tokens()
+        for token in tokens:
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield SimpleNamespace(content=token + " ", usage_metadata=None)
+        content = " ".join(tokens)
+        self._track(prompt, content)
+        # Like LangChain with stream_usage, the final chunk carries the usage
+        yield SimpleNamespace(content="", usage_metadata=self._usage(prompt, content))
+
+    def token_usage(self) -> dict:
+        """Prompt and completion tokens counted so far"""
+        with self._usage_lock:
+            return dict(self._token_usage)
@@ -0,0 +1,210 @@
+"""
+Bulk offline creativity suggestions for large topic lists
+
+Streams topics from a JSONL or CSV file through
+CreativityTool.get_creative_suggestions_many on a process pool, without any LLM
+calls, and appends one JSON result per line to the output file. Rerunning
+with the same output file resumes: topics already written are skipped.
+
+Usage:
+    python bulk_suggestions.py topics.jsonl results.jsonl
+    python bulk_suggestions.py skus.csv results.jsonl --topic-field name --workers 8
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Set, Tuple
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+_tool = None
+
+
+def read_topics(path: str, topic_field: str, input_format: Optional[str] = None) -> Iterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    Yield (line number, topic, error) triples from a JSONL or CSV file
+
+    JSONL lines may be objects carrying topic_field or plain JSON strings.
+    CSV files need a header row with a topic_field column. Blank topics are
+    skipped but keep their line number, so numbering is stable on resume.
+    A line that is not valid JSON or has no usable topic is yielded with an
+    error instead of a topic, so one bad line does not abort the run.
+    """
+    input_format = input_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            reader = csv.DictReader(f)
+            if topic_field not in (reader.fieldnames or []):
+                raise ValueError(f"CSV has no '{topic_field}' column")
+            rows = ((number, row, None) for number, row in enumerate(reader, start=1))
+        else:
+            rows = _json_lines(f)
+        for number, row, error in rows:
+            topic = row.get(topic_field) if isinstance(row, dict) else row
+            if error is None and isinstance(row, dict) and topic is None:
+                error = f"missing '{topic_field}' field"
+            elif error is None and topic is not None and not isinstance(topic, str):
+                error = f"topic must be a string, not {type(topic).__name__}"
+            if error is not None:
+                yield number, None, error
+            elif topic and topic.strip():
+                yield number, topic, None
+
+
+def _json_lines(f) -> Iterator[Tuple[int, object, Optional[str]]]:
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            yield number, None, None
+            continue
+        try:
+            yield number, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield number, None, f"invalid JSON: {e}"
+
+
+def completed_lines(path: str) -> Set[int]:
+    """
+    Collect the input line numbers already written to an output file
+
+    A trailing partial line left by an interrupted run is truncated, so new
+    results start on a fresh line.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        valid = 0
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            valid += len(raw)
+            try:
+                done.add(json.loads(raw)["line"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        f.truncate(valid)
+    return done
+
+
+def _init_worker(cache_size: int) -> None:
+    global _tool
+    from tools.creativity_tool import CreativityTool
+    _tool = CreativityTool(cache_size=cache_size)
+
+
+def _process_chunk(chunk: List[Tuple[int, Optional[str], Optional[str]]], count: int, seed: Optional[int], top_k: int) -> Tuple[List[str], int]:
+    """Generate suggestions for a chunk of topics, returning serialized result lines and the error count"""
+    lines = []
+    errors = 0
+    valid = [(number, topic) for number, topic, error in chunk if error is None]
+    try:
+        batch = _tool.get_creative_suggestions_many([topic for _, topic in valid], count=count, seed=seed)
+    except Exception:
+        # Fall back to one topic at a time, so a bad topic only fails its own line
+        batch = [None] * len(valid)
+    suggestions_by_line = {number: suggestions for (number, _), suggestions in zip(valid, batch)}
+    for number, topic, error in chunk:
+        if error is not None:
+            # Written like any other result, so a resumed run skips the line
+            lines.append(json.dumps({"line": number, "error": error}, ensure_ascii=False) + "\n")
+            errors += 1
+            continue
+        suggestions = suggestions_by_line[number]
+        result = {"line": number, "topic": topic}
+        try:
+            if suggestions is None:
+                suggestions = _tool.get_creative_suggestions(topic, count=count, seed=seed)
+            result["suggestions"] = suggestions
+            if top_k:
+                result["scores"] = _tool.rank_suggestions(suggestions, top_k=top_k)
+        except Exception as e:
+            result["error"] = str(e)
+            errors += 1
+        lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+    return lines, errors
+
+
+def _chunks(topics: Iterator[Tuple[int, Optional[str], Optional[str]]], size: int) -> Iterator[List[Tuple[int, Optional[str], Optional[str]]]]:
+    while True:
+        chunk = list(itertools.islice(topics, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(args: argparse.Namespace) -> int:
+    done = completed_lines(args.output)
+    topics = (
+        row
+        for row in read_topics(args.input, args.topic_field, args.format)
+        if row[0] not in done
+    )
+    if done:
+        print(f"Resuming: {len(done)} topics already in {args.output}", file=sys.stderr)
+
+    workers = args.workers or os.cpu_count() or 1
+    processed = errors = 0
+    start = last_report = time.monotonic()
+    chunks = _chunks(topics, args.chunk_size)
+
+    with open(args.output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.cache_size,)
+    ) as pool:
+        pending = set()
+        try:
+            while True:
+                # Keep a bounded number of chunks in flight, so huge inputs stream
+                for chunk in itertools.islice(chunks, workers * 2 - len(pending)):
+                    pending.add(pool.submit(_process_chunk, chunk, args.count, args.seed, args.top_k))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    lines, failed = future.result()
+                    out.writelines(lines)
+                    processed += len(lines)
+                    errors += failed
+                out.flush()
+
+                now = time.monotonic()
+                if now - last_report >= args.report_interval:
+                    print(f"{processed} topics, {processed / (now - start):.0f} topics/s", file=sys.stderr)
+                    last_report = now
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print(f"Interrupted after {processed} topics; rerun to resume", file=sys.stderr)
+            return 130
+
+    elapsed = time.monotonic() - start
+    rate = processed / elapsed if elapsed else 0.0
+    print(
+        f"Done: {processed} topics in {elapsed:.1f}s ({rate:.0f} topics/s, {workers} workers, "
+        f"{errors} errors)",
+        file=sys.stderr
+    )
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate creativity suggestions for many topics offline")
+    parser.add_argument("input", help="JSONL or CSV file of topics")
+    parser.add_argument("output", help="JSONL file to append results to (resumed if it exists)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--topic-field", default="topic", help="JSON key or CSV column holding the topic (default: topic)")
+    parser.add_argument("--count", type=int, default=20, help="Suggestions per category (default: 20)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a different reproducible set")
+    parser.add_argument("--top-k", type=int, default=0, help="Also include the k best-scoring suggestions per category")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Topics per work unit (default: 500)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Per-worker memo size for repeated topics (default: 1024)")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="Seconds between progress reports (default: 5)")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,20 @@
-from .crew_manager import CrewManager
-from .agents import create_keyword_agent
-from .tasks import create_keyword_task
+from .crew_manager import CrewManager, CrewBusyError, get_crew_manager
 
 __all__ = [
     'CrewManager',
+    'CrewBusyError',
+    'get_crew_manager',
     'create_keyword_agent',
     'create_keyword_task'
 ]
+
+
+def __getattr__(name):
+    # Agent and task factories import crewai, so load them on first use
+    if name == 'create_keyword_agent':
+        from .agents import create_keyword_agent
+        return create_keyword_agent
+    if name == 'create_keyword_task':
+        from .tasks import create_keyword_task
+        return create_keyword_task
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
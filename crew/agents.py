@@ -2,11 +2,18 @@
 CrewAI agents configuration
 """
 from crewai import Agent
-from tools import web_search_tool
+from tools.web_search_tool import web_search_tool
 from langchain_openai import ChatOpenAI
 
 
-def create_keyword_agent(llm: ChatOpenAI, goal: str, backstory: str, use_search: bool = True) -> Agent:
+def create_keyword_agent(
+    llm: ChatOpenAI,
+    goal: str,
+    backstory: str,
+    use_search: bool = True,
+    verbose: bool = True,
+    role: str = 'Keyword & Word Suggestion Specialist'
+) -> Agent:
     """
     Create a keyword suggestion agent specialized in generating creative word suggestions
     and keywords based on topic descriptions
@@ -14,12 +21,12 @@ def create_keyword_agent(llm: ChatOpenAI, goal: str, backstory: str, use_search:
     tools_list = [web_search_tool] if use_search else []
     
     return Agent(
-        role='Keyword & Word Suggestion Specialist',
+        role=role,
         goal=goal,
         backstory=backstory,
         tools=tools_list,
         llm=llm,
-        verbose=True,
+        verbose=verbose,
         allow_delegation=False,
         memory=True
     )
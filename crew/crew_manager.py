@@ -1,51 +1,379 @@
 """
 CrewAI crew manager for orchestrating agents and tasks
 """
-from crewai import Crew, Process
-from langchain_openai import ChatOpenAI
-from crew.agents import create_keyword_agent
-from crew.tasks import create_keyword_task
+from crew.result_cache import create_result_cache
+from crew.crew_pool import CrewPool
+from crew.prompt_budget import create_prompt_budget
+from monitoring.metrics import observe_stage, record_tokens, stage
+from monitoring.profiling import profiled
 from tools import creativity_tool
+from tools.taken_names import extract_candidates, get_taken_filter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import functools
+import threading
 import os
+import re
+import time
+
+if TYPE_CHECKING:
+    from crewai import Crew
+
+# crewai, crewai_tools and langchain_openai take seconds to import, so they
+# are imported on first use rather than when the API module loads.
+
+KEYWORD_AGENT_ROLE = "Keyword & Word Suggestion Specialist"
+EXPECTED_OUTPUT = "A comprehensive, categorized list of keyword and word suggestions"
+TASK_DESCRIPTION_TEMPLATE = "{task_description}"
+PACKED_TOPIC_HEADER = "### Topic"
+PACKED_TOPIC_PATTERN = re.compile(r"^\W*Topic\s+(\d+)\W*$", re.IGNORECASE | re.MULTILINE)
+_UNSET = object()
+
+
+class CrewBusyError(RuntimeError):
+    """Raised when the keyword generation queue is full"""
+
+
+def _step_callback(on_event: Callable[[str, dict], None]) -> Callable:
+    """Adapt a crew step callback to emit "step" events"""
+    def callback(step) -> None:
+        on_event("step", {
+            "type": type(step).__name__,
+            "thought": getattr(step, "thought", None),
+            "tool": getattr(step, "tool", None),
+            "output": str(getattr(step, "result", None) or getattr(step, "output", "") or "")
+        })
+    return callback
 
 
 class CrewManager:
     """Manages CrewAI crews and executes tasks"""
     
-    def __init__(self, model: str = "gpt-4-turbo-preview", temperature: float = 0.9):
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(
+        self,
+        model: str = "gpt-4-turbo-preview",
+        temperature: float = 0.9,
+        max_concurrency: int = None,
+        max_queue: int = None
+    ):
+        self.model = model
+        self.temperature = temperature
+        self._llm = None
+        self._llm_lock = threading.Lock()
         self.creativity_tool = creativity_tool
+        
+        # Token budgets for the topic and creativity samples pasted into prompts
+        self.prompt_budget = create_prompt_budget(model)
+        
+        # Dedicated executor so blocking crew runs never stall the event loop
+        self.max_concurrency = max_concurrency or int(os.getenv("CREW_MAX_CONCURRENCY", 8))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("CREW_MAX_QUEUE", 32))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="crew"
+        )
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        
+        # Cache of successful results keyed on the normalized request
+        self.result_cache = create_result_cache()
+        
+        # Answer requests without web search with one direct LLM call
+        self.fast_path = os.getenv("CREW_FAST_PATH", "False").lower() in ("1", "true", "yes")
+        
+        # Prebuilt crews per (use_search, creativity_level)
+        self.verbose = os.getenv("CREW_VERBOSE", "True").lower() in ("1", "true", "yes")
+        self.crew_pool = CrewPool(
+            self._build_crew,
+            max_idle=int(os.getenv("CREW_POOL_MAX_IDLE", self.max_concurrency))
+        )
     
-    def generate_keywords(
+    @property
+    def llm(self):
+        """Chat model, created on first use"""
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    from langchain_openai import ChatOpenAI
+                    self._llm = ChatOpenAI(
+                        model=self.model,
+                        temperature=self.temperature,
+                        api_key=os.getenv("OPENAI_API_KEY"),
+                        stream_usage=True
+                    )
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm) -> None:
+        self._llm = llm
+    
+    def warm_up(self, prewarm_crews: bool = True) -> None:
+        """
+        Import CrewAI, create the LLM client and search tool and load the tokenizer ahead of the first request
+        
+        Args:
+            prewarm_crews: Also build one pooled crew per use_search setting
+                at the default creativity level
+        """
+        self.llm
+        self.prompt_budget.tokenizer.load()
+        from crew.agents import create_keyword_agent  # noqa: F401 - imports crewai and the search tool
+        if prewarm_crews:
+            self.crew_pool.prewarm([(True, "high"), (False, "high")])
+    
+    def _acquire_slot(self) -> None:
+        """Reserve a running or queued slot, failing fast when the queue is full"""
+        with self._pending_lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                raise CrewBusyError(
+                    f"Keyword generation queue is full ({self._pending} requests pending)"
+                )
+            self._pending += 1
+    
+    def _release_slot(self, _future=None) -> None:
+        """Release a slot once the underlying crew run has finished"""
+        with self._pending_lock:
+            self._pending -= 1
+    
+    async def run_in_executor(self, func, *args, **kwargs):
+        """
+        Run a blocking callable on the crew executor, respecting the queue limit
+        
+        The slot is released when the worker finishes rather than when the
+        awaiting coroutine returns, so cancelled requests still count until
+        their crew run actually completes. When the request is being
+        profiled, the worker thread joins its profile.
+        """
+        self._acquire_slot()
+        try:
+            future = self._executor.submit(profiled(functools.partial(func, *args, **kwargs)))
+        except Exception:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return await asyncio.wrap_future(future)
+    
+    def use_fast_path(self, use_search: bool, fast_path: bool = None) -> bool:
+        """Whether a request is answered by a single direct LLM call"""
+        if use_search:
+            return False
+        return self.fast_path if fast_path is None else fast_path
+    
+    def _cache_key(
         self,
         topic_description: str,
         use_search: bool = True,
-        creativity_level: str = "high"
+        creativity_level: str = "high",
+        fast_path: bool = None
+    ) -> str:
+        """Result cache key for a keyword request"""
+        return self.result_cache.make_key(
+            topic_description,
+            use_search=use_search,
+            creativity_level=creativity_level,
+            fast_path=self.use_fast_path(use_search, fast_path)
+        )
+    
+    async def generate_keywords_async(
+        self,
+        topic_description: str,
+        use_search: bool = True,
+        creativity_level: str = "high",
+        fast_path: bool = None
     ) -> dict:
         """
-        Generate keyword and word suggestions for a given topic
+        Async variant of generate_keywords that runs the crew on the executor
         
-        Args:
-            topic_description: Description of the topic/concept
-            use_search: Whether to enable web search for trending keywords
-            creativity_level: Level of creativity (low, medium, high)
+        Results are served from the result cache when enabled, and concurrent
+        identical requests share a single crew run.
         
-        Returns:
-            Dictionary with keyword suggestions and metadata
+        Raises:
+            CrewBusyError: If max_concurrency + max_queue requests are already pending
         """
+        compute = functools.partial(
+            self.run_in_executor,
+            self.generate_keywords,
+            topic_description=topic_description,
+            use_search=use_search,
+            creativity_level=creativity_level,
+            fast_path=fast_path
+        )
+        if self.result_cache is None:
+            return await compute()
+        
+        key = self._cache_key(topic_description, use_search, creativity_level, fast_path)
+        result = await self.result_cache.get_or_compute(key, compute)
+        return {**result, "topic": topic_description}
+    
+    async def stream_keywords(
+        self,
+        topic_description: str,
+        use_search: bool = True,
+        creativity_level: str = "high",
+        fast_path: bool = None
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Generate keywords while yielding (event, data) pairs as they become available
+        
+        Events, in order:
+            suggestions: Creativity tool suggestions, computed locally up front
+            step / token: Intermediate agent steps and LLM tokens from the crew
+                (only token events on the direct-LLM fast path)
+            result: The final result, same shape as generate_keywords
+        
+        Raises:
+            CrewBusyError: If max_concurrency + max_queue requests are already pending
+        """
+        key = None
+        if self.result_cache is not None:
+            key = self._cache_key(topic_description, use_search, creativity_level, fast_path)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                yield "suggestions", {"creative_suggestions": cached.get("creative_suggestions")}
+                yield "result", {**cached, "topic": topic_description}
+                return
+        
+        with stage("creativity"):
+            creative_suggestions = self.inspiration_suggestions(topic_description)
+        yield "suggestions", {"creative_suggestions": creative_suggestions}
+        
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def on_event(event: str, data: dict) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+        
+        run = asyncio.ensure_future(self.run_in_executor(
+            self.generate_keywords,
+            topic_description=topic_description,
+            use_search=use_search,
+            creativity_level=creativity_level,
+            fast_path=fast_path,
+            creative_suggestions=creative_suggestions,
+            on_event=on_event
+        ))
         try:
-            # Get creative suggestions using creativity tool
-            creative_suggestions = self.creativity_tool.get_creative_suggestions(
-                topic_description, 
-                count=15
-            )
+            while not run.done():
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, run}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event.done():
+                    yield next_event.result()
+                else:
+                    next_event.cancel()
+            
+            # Events emitted just before the run finished
+            while not events.empty():
+                yield events.get_nowait()
             
-            # Build backstory for the agent
-            backstory = f"""
+            result = run.result()
+        finally:
+            if not run.done():
+                run.cancel()
+        
+        if key is not None and result.get("success"):
+            self.result_cache.backend.set(key, result)
+        yield "result", result
+    
+    async def generate_keywords_batch(
+        self,
+        requests: List[dict],
+        max_parallel: int = 4,
+        pack_size: int = 1
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """
+        Generate keywords for many requests, yielding (index, result) as each completes
+        
+        Args:
+            requests: Keyword requests as dictionaries with topic_description,
+                use_search and creativity_level
+            max_parallel: Maximum number of crew runs in flight for this batch
+            pack_size: Number of non-search topics packed into one LLM prompt
+        
+        Failures are reported per item, so one bad topic doesn't fail the batch.
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+        
+        async def run_single(index: int, request: dict) -> List[Tuple[int, dict]]:
+            async with semaphore:
+                return [(index, await self.generate_keywords_async(**request))]
+        
+        async def run_packed(items: List[Tuple[int, dict]], creativity_level: str, fast_path: bool) -> List[Tuple[int, dict]]:
+            async with semaphore:
+                results = await self.run_in_executor(
+                    self.generate_keywords_packed,
+                    [request["topic_description"] for _, request in items],
+                    creativity_level=creativity_level,
+                    fast_path=fast_path
+                )
+            for (_, request), result in zip(items, results):
+                if self.result_cache is not None and result.get("success"):
+                    self.result_cache.backend.set(self._cache_key(**request), result)
+            return [(index, result) for (index, _), result in zip(items, results)]
+        
+        groups = []
+        packable: Dict[Tuple[str, bool], List[Tuple[int, dict]]] = {}
+        for index, request in enumerate(requests):
+            if pack_size > 1 and not request.get("use_search", True):
+                cached = None
+                if self.result_cache is not None:
+                    cached = self.result_cache.get(self._cache_key(**request))
+                if cached is not None:
+                    yield index, {**cached, "topic": request["topic_description"]}
+                    continue
+                pack_key = (
+                    request.get("creativity_level", "high"),
+                    self.use_fast_path(False, request.get("fast_path"))
+                )
+                packable.setdefault(pack_key, []).append((index, request))
+            else:
+                groups.append(((index,), run_single(index, request)))
+        
+        for (creativity_level, fast_path), items in packable.items():
+            for start in range(0, len(items), pack_size):
+                chunk = items[start:start + pack_size]
+                groups.append((tuple(index for index, _ in chunk), run_packed(chunk, creativity_level, fast_path)))
+        
+        tasks = {asyncio.ensure_future(coro): indexes for indexes, coro in groups}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        for index in tasks[task]:
+                            yield index, {
+                                "success": False,
+                                "error": str(task.exception()),
+                                "topic": requests[index]["topic_description"]
+                            }
+                        continue
+                    for index, result in task.result():
+                        yield index, result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def executor_stats(self) -> dict:
+        """Get current executor load"""
+        with self._pending_lock:
+            pending = self._pending
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "pending": pending,
+            "running": min(pending, self.max_concurrency),
+            "queued": max(pending - self.max_concurrency, 0)
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the crew executor"""
+        self._executor.shutdown(wait=wait)
+    
+    def build_backstory(self, creativity_level: str) -> str:
+        """Build the keyword agent backstory for a creativity level"""
+        return f"""
 You are an expert in generating creative and relevant keywords and word suggestions.
 Your specialties include:
 - Understanding topic context and extracting key concepts
@@ -56,10 +384,48 @@ Your specialties include:
 
 Creativity Level: {creativity_level}
 """
-            
-            # Build task description
-            task_description = f"""
-Based on the following topic description: "{topic_description}"
+    
+    def inspiration_suggestions(self, topic_description: str) -> Dict[str, List[str]]:
+        """
+        Creativity tool suggestions used as prompt inspiration
+        
+        Names that differ only in case or separators (CloudStorage,
+        cloud_storage) would spend prompt tokens on the same idea, so they
+        count as duplicates here regardless of the API defaults.
+        """
+        return self.creativity_tool.get_creative_suggestions(
+            topic_description,
+            count=15,
+            case_insensitive=True,
+            separator_insensitive=True
+        )
+    
+    def _format_inspiration(self, creative_suggestions: Dict[str, List[str]]) -> str:
+        """Format the best-scoring creativity tool suggestions, within the inspiration token budget, as prompt lines"""
+        best = {
+            category: [name for name, _ in ranked]
+            for category, ranked in self.creativity_tool.rank_suggestions(creative_suggestions, top_k=5).items()
+        }
+        if "acronyms" in best:
+            best["acronyms"] = best["acronyms"][:3]
+        best = self.prompt_budget.fit_samples(best)
+        return f"""- Variations: {', '.join(best.get('variations', []))}
+- Combinations: {', '.join(best.get('combinations', []))}
+- Styled words: {', '.join(best.get('styled', []))}
+- Acronyms: {', '.join(best.get('acronyms', []))}
+- Blends: {', '.join(best.get('blends', []))}"""
+    
+    def find_taken_keywords(self, keywords: str) -> List[str] | None:
+        """List suggested names in an answer that are already taken, or None without a filter"""
+        taken_filter = get_taken_filter()
+        if taken_filter is None:
+            return None
+        return taken_filter.taken(extract_candidates(keywords))
+    
+    def build_task_description(self, topic_description: str, creative_suggestions: Dict[str, List[str]]) -> str:
+        """Build the keyword task description for a single topic, compacting an oversized topic"""
+        return f"""
+Based on the following topic description: "{self.prompt_budget.compact_topic(topic_description)}"
 
 Generate a comprehensive list of keyword and word suggestions. Include:
 1. Core keywords that directly relate to the topic
@@ -69,47 +435,199 @@ Generate a comprehensive list of keyword and word suggestions. Include:
 5. Trending keywords (if web search is enabled)
 
 Consider these creative suggestions as inspiration:
-- Variations: {', '.join(creative_suggestions.get('variations', [])[:5])}
-- Combinations: {', '.join(creative_suggestions.get('combinations', [])[:5])}
-- Styled words: {', '.join(creative_suggestions.get('styled', [])[:5])}
-- Acronyms: {', '.join(creative_suggestions.get('acronyms', [])[:3])}
-- Blends: {', '.join(creative_suggestions.get('blends', [])[:5])}
+{self._format_inspiration(creative_suggestions)}
 
 Format the output as a clear, organized list with categories.
 """
+    
+    def build_packed_task_description(
+        self,
+        topic_descriptions: List[str],
+        creative_suggestions: List[Dict[str, List[str]]]
+    ) -> str:
+        """Build one task description covering several topics"""
+        sections = "\n\n".join(
+            f"""{PACKED_TOPIC_HEADER} {number}
+Topic description: "{self.prompt_budget.compact_topic(topic)}"
+Inspiration:
+{self._format_inspiration(suggestions)}"""
+            for number, (topic, suggestions) in enumerate(zip(topic_descriptions, creative_suggestions), start=1)
+        )
+        return f"""
+Generate a comprehensive list of keyword and word suggestions for each of the
+{len(topic_descriptions)} topics below. For every topic include core keywords,
+related keywords and synonyms, creative variations and combinations, and
+industry-specific terminology (if applicable).
+
+{sections}
+
+Answer every topic in order. Start each answer with a line containing exactly
+"{PACKED_TOPIC_HEADER} <number>" and format it as a clear, organized list with categories.
+"""
+    
+    def _build_crew(self, use_search: bool, creativity_level: str) -> "Crew":
+        """
+        Build a reusable single-agent crew for a configuration
+        
+        The task description is a template filled in per run through
+        crew.kickoff(inputs={"task_description": ...}).
+        """
+        from crewai import Crew, Process
+        from crew.agents import create_keyword_agent
+        from crew.tasks import create_keyword_task
+        
+        # Create keyword agent
+        agent = create_keyword_agent(
+            llm=self.llm,
+            goal="Generate the most relevant and creative keywords for the given topic",
+            backstory=self.build_backstory(creativity_level),
+            use_search=use_search,
+            verbose=self.verbose,
+            role=KEYWORD_AGENT_ROLE
+        )
+        
+        # Create task
+        task = create_keyword_task(
+            agent=agent,
+            description=TASK_DESCRIPTION_TEMPLATE,
+            expected_output=EXPECTED_OUTPUT
+        )
+        
+        return Crew(
+            agents=[agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=self.verbose
+        )
+    
+    def _run_crew(
+        self,
+        creativity_level: str,
+        task_description: str,
+        use_search: bool,
+        on_event: Callable[[str, dict], None] = None
+    ) -> Tuple[str, dict]:
+        """
+        Run a pooled crew for the configuration with the given task description
+        
+        Returns:
+            The answer and the prompt and completion tokens the run used
+        """
+        from crewai.types.streaming import CrewStreamingOutput
+        
+        acquire_start = time.perf_counter()
+        with self.crew_pool.acquire(use_search, creativity_level) as crew:
+            observe_stage("crew_acquire", time.perf_counter() - acquire_start)
+            agent_state = _agent_state(crew)
+            crew.stream = on_event is not None
+            crew.step_callback = _step_callback(on_event) if on_event else None
+            # Agent LLMs count tokens cumulatively; a pooled crew runs one request at a time
+            usage_before = crew.calculate_usage_metrics()
+            try:
+                with stage("kickoff"):
+                    result = crew.kickoff(inputs={"task_description": task_description})
+                    
+                    if isinstance(result, CrewStreamingOutput):
+                        for chunk in result:
+                            if chunk.content:
+                                on_event("token", {"content": chunk.content})
+                        result = result.result
+            finally:
+                crew.stream = False
+                crew.step_callback = None
+                _restore_agent_state(agent_state)
+            usage_after = crew.calculate_usage_metrics()
+            usage = {
+                "prompt_tokens": usage_after.prompt_tokens - usage_before.prompt_tokens,
+                "completion_tokens": usage_after.completion_tokens - usage_before.completion_tokens
+            }
+            record_tokens(usage["prompt_tokens"], usage["completion_tokens"])
+        
+        return str(result), usage
+    
+    def _run_direct(
+        self,
+        creativity_level: str,
+        task_description: str,
+        on_event: Callable[[str, dict], None] = None
+    ) -> Tuple[str, dict]:
+        """
+        Answer the task with a single chat completion, bypassing the agent loop
+        
+        Sends the same backstory and task prompt the crew would use.
+        
+        Returns:
+            The answer and the prompt and completion tokens the model reported
+        """
+        messages = [
+            ("system", f"You are a {KEYWORD_AGENT_ROLE}.\n{self.build_backstory(creativity_level)}"),
+            ("human", f"{task_description}\nExpected output: {EXPECTED_OUTPUT}")
+        ]
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        with stage("direct_llm"):
+            if on_event is None:
+                response = self.llm.invoke(messages)
+                _record_usage(response, usage)
+                return str(response.content), usage
             
-            # Create keyword agent
-            agent = create_keyword_agent(
-                llm=self.llm,
-                goal="Generate the most relevant and creative keywords for the given topic",
-                backstory=backstory,
-                use_search=use_search
-            )
-            
-            # Create task
-            task = create_keyword_task(
-                agent=agent,
-                description=task_description,
-                expected_output="A comprehensive, categorized list of keyword and word suggestions"
-            )
+            parts = []
+            for chunk in self.llm.stream(messages):
+                _record_usage(chunk, usage)
+                if chunk.content:
+                    parts.append(chunk.content)
+                    on_event("token", {"content": chunk.content})
+            return "".join(parts), usage
+    
+    def generate_keywords(
+        self,
+        topic_description: str,
+        use_search: bool = True,
+        creativity_level: str = "high",
+        fast_path: bool = None,
+        creative_suggestions: Dict[str, List[str]] = None,
+        on_event: Callable[[str, dict], None] = None
+    ) -> dict:
+        """
+        Generate keyword and word suggestions for a given topic
+        
+        Args:
+            topic_description: Description of the topic/concept
+            use_search: Whether to enable web search for trending keywords
+            creativity_level: Level of creativity (low, medium, high)
+            fast_path: Use a single direct LLM call when web search is disabled;
+                None uses the CREW_FAST_PATH setting
+            creative_suggestions: Precomputed creativity tool suggestions
+            on_event: Optional callback receiving ("token" | "step", data) while
+                the crew runs; enables crew output streaming
+        
+        Returns:
+            Dictionary with keyword suggestions and metadata
+        """
+        try:
+            # Get creative suggestions using creativity tool
+            if creative_suggestions is None:
+                with stage("creativity"):
+                    creative_suggestions = self.inspiration_suggestions(topic_description)
             
-            # Create and run crew
-            crew = Crew(
-                agents=[agent],
-                tasks=[task],
-                process=Process.sequential,
-                verbose=True
-            )
+            # Build task description for the agent
+            with stage("prompt"):
+                task_description = self.build_task_description(topic_description, creative_suggestions)
+                task_tokens = self.prompt_budget.count(task_description)
             
-            result = crew.kickoff()
+            if self.use_fast_path(use_search, fast_path):
+                result, usage = self._run_direct(creativity_level, task_description, on_event)
+            else:
+                result, usage = self._run_crew(creativity_level, task_description, use_search, on_event)
             
             return {
                 "success": True,
-                "keywords": str(result),
+                "keywords": result,
+                "taken_keywords": self.find_taken_keywords(result),
                 "creative_suggestions": creative_suggestions,
                 "topic": topic_description,
                 "creativity_level": creativity_level,
-                "search_enabled": use_search
+                "search_enabled": use_search,
+                "usage": {**usage, "task_tokens": task_tokens}
             }
             
         except Exception as e:
@@ -119,3 +637,142 @@ Format the output as a clear, organized list with categories.
                 "topic": topic_description
             }
   
+    
+    def generate_keywords_packed(
+        self,
+        topic_descriptions: List[str],
+        creativity_level: str = "high",
+        fast_path: bool = None
+    ) -> List[dict]:
+        """
+        Generate keywords for several topics with a single crew run
+        
+        The topics share one prompt and the answer is split back per topic on
+        the "### Topic <n>" headers. Web search is never used for packed runs.
+        
+        Returns:
+            One result dictionary per topic, in input order
+        """
+        try:
+            with stage("creativity"):
+                creative_suggestions = [
+                    self.inspiration_suggestions(topic)
+                    for topic in topic_descriptions
+                ]
+            
+            with stage("prompt"):
+                task_description = self.build_packed_task_description(topic_descriptions, creative_suggestions)
+                task_tokens = self.prompt_budget.count(task_description)
+            
+            if self.use_fast_path(False, fast_path):
+                answer, usage = self._run_direct(creativity_level, task_description)
+            else:
+                answer, usage = self._run_crew(creativity_level, task_description, use_search=False)
+            usage = {**usage, "task_tokens": task_tokens, "shared_by": len(topic_descriptions)}
+            answers = split_packed_answer(answer, len(topic_descriptions))
+        except Exception as e:
+            return [
+                {"success": False, "error": str(e), "topic": topic}
+                for topic in topic_descriptions
+            ]
+        
+        results = []
+        for position, (topic, suggestions, answer) in enumerate(zip(topic_descriptions, creative_suggestions, answers)):
+            if answer:
+                results.append({
+                    "success": True,
+                    "keywords": answer,
+                    "taken_keywords": self.find_taken_keywords(answer),
+                    "creative_suggestions": suggestions,
+                    "topic": topic,
+                    "creativity_level": creativity_level,
+                    "search_enabled": False,
+                    "usage": _usage_share(usage, position)
+                })
+            else:
+                results.append({
+                    "success": False,
+                    "error": "No answer for this topic in the packed response",
+                    "topic": topic
+                })
+        return results
+
+
+def _agent_state(crew: "Crew") -> List[tuple]:
+    """
+    Agent settings that kickoff() changes in place on a pooled crew
+    
+    Kickoff copies the crew step callback onto agents that have none, and
+    streaming turns on streaming for every agent LLM; neither is undone.
+    """
+    return [(agent, agent.step_callback, vars(agent.llm).get("stream", _UNSET)) for agent in crew.agents]
+
+
+def _restore_agent_state(state: List[tuple]) -> None:
+    """Put back agent settings captured with _agent_state"""
+    for agent, step_callback, stream in state:
+        agent.step_callback = step_callback
+        if stream is not _UNSET:
+            agent.llm.stream = stream
+        elif "stream" in vars(agent.llm):
+            # LLMs without a stream setting (e.g. a stream() method) had one added
+            delattr(agent.llm, "stream")
+
+
+def _usage_share(usage: dict, position: int) -> dict:
+    """
+    Usage of one topic in a packed run: an even share of the run's tokens
+    
+    Leftover tokens go to the first topics, so the shares add up to the run,
+    whose totals are kept under "run".
+    """
+    share = {}
+    for field in ("prompt_tokens", "completion_tokens"):
+        quotient, remainder = divmod(usage[field], usage["shared_by"])
+        share[field] = quotient + (1 if position < remainder else 0)
+    return {
+        **usage,
+        **share,
+        "run": {"prompt_tokens": usage["prompt_tokens"], "completion_tokens": usage["completion_tokens"]}
+    }
+
+
+def _record_usage(message, totals: Optional[dict] = None) -> None:
+    """Count tokens reported on a LangChain message or stream chunk, if any, adding them to totals"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        record_tokens(usage.get("input_tokens"), usage.get("output_tokens"))
+        if totals is not None:
+            totals["prompt_tokens"] += usage.get("input_tokens") or 0
+            totals["completion_tokens"] += usage.get("output_tokens") or 0
+
+
+def split_packed_answer(text: str, count: int) -> List[str]:
+    """
+    Split a packed crew answer into per-topic sections
+    
+    Returns:
+        List of length count; topics missing from the answer are empty strings
+    """
+    answers = [""] * count
+    headers = list(PACKED_TOPIC_PATTERN.finditer(text))
+    for position, header in enumerate(headers):
+        number = int(header.group(1))
+        end = headers[position + 1].start() if position + 1 < len(headers) else len(text)
+        if 1 <= number <= count and not answers[number - 1]:
+            answers[number - 1] = text[header.end():end].strip()
+    return answers
+
+
+_crew_manager: CrewManager = None
+_crew_manager_lock = threading.Lock()
+
+
+def get_crew_manager() -> CrewManager:
+    """Get the process-wide CrewManager, creating it on first use"""
+    global _crew_manager
+    if _crew_manager is None:
+        with _crew_manager_lock:
+            if _crew_manager is None:
+                _crew_manager = CrewManager()
+    return _crew_manager
@@ -0,0 +1,88 @@
+"""
+Pool of prebuilt crews so agents and tasks aren't rebuilt on every request
+"""
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List
+from contextlib import contextmanager
+from collections import deque
+import threading
+
+if TYPE_CHECKING:
+    from crewai import Crew
+
+
+class CrewPool:
+    """
+    Keeps idle prebuilt crews per configuration key
+
+    A crew is checked out exclusively for one run, because kickoff()
+    interpolates inputs into its tasks and agents in place. Crews are built
+    on demand and returned to the pool afterwards, up to max_idle per key.
+    """
+
+    def __init__(self, build: Callable[..., "Crew"], max_idle: int = 8, max_keys: int = 32):
+        self.build = build
+        self.max_idle = max_idle
+        self.max_keys = max_keys
+        self._idle: Dict[Hashable, deque] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def _checkout(self, key: tuple) -> tuple:
+        """Take an idle crew for key, or None with whether it may be pooled"""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle is None and len(self._idle) < self.max_keys:
+                idle = self._idle[key] = deque()
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.created += 1
+            return None, idle is not None
+
+    @contextmanager
+    def acquire(self, *key):
+        """
+        Check out a crew for the configuration key, building one if none is idle
+
+        The key is passed to the build callable as positional arguments.
+        """
+        crew, poolable = self._checkout(key)
+        if crew is None:
+            crew = self.build(*key)
+        try:
+            yield crew
+        except Exception:
+            # A failed run may leave the crew half-interpolated; don't reuse it
+            poolable = False
+            raise
+        finally:
+            if poolable:
+                with self._lock:
+                    idle = self._idle.get(key)
+                    if idle is not None and len(idle) < self.max_idle:
+                        idle.append(crew)
+
+    def prewarm(self, keys: List[tuple], per_key: int = 1) -> None:
+        """Build crews ahead of time for the given configuration keys"""
+        for key in keys:
+            crews = [self.build(*key) for _ in range(per_key)]
+            with self._lock:
+                idle = self._idle.setdefault(key, deque())
+                self.created += len(crews)
+                idle.extend(crews[:max(self.max_idle - len(idle), 0)])
+
+    def clear(self) -> None:
+        """Drop all idle crews"""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        """Get pool usage counters"""
+        with self._lock:
+            return {
+                "keys": len(self._idle),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "created": self.created,
+                "reused": self.reused
+            }
@@ -0,0 +1,219 @@
+"""
+Token budgets for keyword prompts
+
+The topic description is user input of any length, and it is pasted into
+every prompt together with creativity tool samples. PromptBudget keeps both
+within a token budget so prompt size, latency and cost stay predictable for
+long product descriptions:
+
+    topic       - an oversized topic is summarized extractively (the lead
+                  sentence plus the sentences sharing the most words with
+                  the rest of the text, in their original order) or
+                  truncated, depending on PROMPT_TOPIC_COMPACTION
+    inspiration - creativity samples are taken round-robin across
+                  categories, best first, until the budget is used up
+
+Tokens are counted with tiktoken when it is installed and its encoding can
+be loaded, otherwise estimated at four characters per token.
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+import os
+import re
+import threading
+
+from monitoring.metrics import PROMPT_COMPACTIONS
+
+STRATEGIES = ("summarize", "truncate")
+CHARS_PER_TOKEN = 4
+ELLIPSIS = "..."
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\s*\n+\s*")
+WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the their "
+    "this to was were which while will with our your you we can all also more most very".split()
+)
+
+
+class Tokenizer:
+    """Counts and truncates text in model tokens"""
+
+    def __init__(self, model: str = "gpt-4-turbo-preview", use_tiktoken: bool = True):
+        self.model = model
+        self.use_tiktoken = use_tiktoken
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """
+        Load the tiktoken encoding once; returns whether counts are exact
+
+        tiktoken downloads encodings on first use, so any failure (not
+        installed, offline) falls back to the estimate for the process lifetime.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    if self.use_tiktoken:
+                        try:
+                            import tiktoken
+                            try:
+                                self._encoding = tiktoken.encoding_for_model(self.model)
+                            except KeyError:
+                                self._encoding = tiktoken.get_encoding("cl100k_base")
+                        except Exception:
+                            self._encoding = None
+                    self._loaded = True
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.load():
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens, at a word boundary, marking the cut"""
+        if self.count(text) <= max_tokens:
+            return text
+        budget = max(max_tokens - self.count(ELLIPSIS), 0)
+        if self.load():
+            head = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:budget])
+        else:
+            head = text[:budget * CHARS_PER_TOKEN]
+        # Drop a partial last word unless that would drop everything
+        cut = head.rstrip()
+        if not text[len(head):len(head) + 1].isspace():
+            cut = cut.rsplit(None, 1)[0] if " " in cut else cut
+        return f"{cut.rstrip(' ,;:-')}{ELLIPSIS}"
+
+
+def _sentences(text: str) -> List[str]:
+    """Distinct sentences of text, in order; pasted descriptions often repeat themselves"""
+    sentences = {}
+    for sentence in SENTENCE_BREAK.split(text):
+        sentence = sentence.strip()
+        if sentence:
+            sentences.setdefault(sentence.lower(), sentence)
+    return list(sentences.values())
+
+
+def _content_words(sentence: str) -> set:
+    return {word for word in WORD.findall(sentence.lower()) if len(word) > 2 and word not in STOPWORDS}
+
+
+class PromptBudget:
+    """Fits the variable parts of keyword prompts into token budgets"""
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer = None,
+        max_topic_tokens: int = 400,
+        max_inspiration_tokens: int = 64,
+        topic_strategy: str = "summarize"
+    ):
+        if topic_strategy not in STRATEGIES:
+            raise ValueError(f"Unknown topic compaction strategy: {topic_strategy}")
+        self.tokenizer = tokenizer or Tokenizer()
+        self.max_topic_tokens = max_topic_tokens
+        self.max_inspiration_tokens = max_inspiration_tokens
+        self.topic_strategy = topic_strategy
+
+    def count(self, text: str) -> int:
+        return self.tokenizer.count(text)
+
+    def compact_topic(self, topic: str) -> str:
+        """Topic unchanged when within max_topic_tokens, otherwise summarized or truncated to fit"""
+        if not self.max_topic_tokens or self.count(topic) <= self.max_topic_tokens:
+            return topic
+        PROMPT_COMPACTIONS.inc(part="topic")
+        topic = " ".join(topic.split())
+        if self.topic_strategy == "summarize":
+            return self.summarize(topic, self.max_topic_tokens)
+        return self.tokenizer.truncate(topic, self.max_topic_tokens)
+
+    def summarize(self, text: str, max_tokens: int) -> str:
+        """
+        Extractive summary of text in at most max_tokens
+
+        Keeps the lead sentence, which usually says what the product is, then
+        adds the sentences whose words recur most across the text (per word,
+        so long sentences are not favoured) while they fit, in original order.
+        Repeated sentences are kept once.
+        """
+        sentences = _sentences(text)
+        if len(sentences) < 2:
+            return self.tokenizer.truncate(text, max_tokens)
+
+        words = [_content_words(sentence) for sentence in sentences]
+        frequency = Counter(word for sentence_words in words for word in sentence_words)
+        costs = [self.count(sentence) + 1 for sentence in sentences]
+        if costs[0] > max_tokens:
+            return self.tokenizer.truncate(sentences[0], max_tokens)
+
+        def score(index: int) -> float:
+            if not words[index]:
+                return 0.0
+            return sum(frequency[word] - 1 for word in words[index]) / len(words[index]) ** 0.5
+
+        chosen = [0]
+        used = costs[0]
+        for index in sorted(range(1, len(sentences)), key=lambda index: (-score(index), index)):
+            if used + costs[index] <= max_tokens:
+                chosen.append(index)
+                used += costs[index]
+        summary = " ".join(sentences[index] for index in sorted(chosen))
+        # Per-sentence counts can undershoot the joined text by a token or two
+        return self.tokenizer.truncate(summary, max_tokens)
+
+    def fit_samples(self, samples: Dict[str, List[str]], max_tokens: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        Keep the leading samples of each category within max_tokens
+
+        Samples are taken round-robin, one per category at a time in the
+        given (best first) order, so every category keeps its best names
+        before any category gets its fifth. Each name costs its tokens plus
+        one for the separator.
+        """
+        max_tokens = self.max_inspiration_tokens if max_tokens is None else max_tokens
+        if not max_tokens:
+            return samples
+
+        fitted: Dict[str, List[str]] = {category: [] for category in samples}
+        used = 0
+        full = False
+        for position in range(max((len(names) for names in samples.values()), default=0)):
+            for category, names in samples.items():
+                if position >= len(names):
+                    continue
+                cost = self.count(names[position]) + 1
+                if used + cost > max_tokens:
+                    full = True
+                    continue
+                fitted[category].append(names[position])
+                used += cost
+        if full:
+            PROMPT_COMPACTIONS.inc(part="inspiration")
+        return fitted
+
+
+def create_prompt_budget(model: str = "gpt-4-turbo-preview") -> PromptBudget:
+    """
+    Create a PromptBudget for a model, configured from the environment
+
+    PROMPT_TOPIC_MAX_TOKENS: Topic tokens kept in prompts, 0 for no limit (default: 400)
+    PROMPT_INSPIRATION_MAX_TOKENS: Tokens of creativity samples in prompts, 0 for no limit (default: 64)
+    PROMPT_TOPIC_COMPACTION: summarize or truncate oversized topics (default: summarize)
+    PROMPT_TOKENIZER: tiktoken, or estimate to skip loading it (default: tiktoken)
+    """
+    return PromptBudget(
+        tokenizer=Tokenizer(
+            model=model,
+            use_tiktoken=os.getenv("PROMPT_TOKENIZER", "tiktoken").lower() == "tiktoken"
+        ),
+        max_topic_tokens=int(os.getenv("PROMPT_TOPIC_MAX_TOKENS", 400)),
+        max_inspiration_tokens=int(os.getenv("PROMPT_INSPIRATION_MAX_TOKENS", 64)),
+        topic_strategy=os.getenv("PROMPT_TOPIC_COMPACTION", "summarize").lower()
+    )
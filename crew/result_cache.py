@@ -0,0 +1,141 @@
+"""
+Result cache with in-flight request coalescing for keyword generation
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from tools.cache import CacheBackend, create_cache_backend
+import asyncio
+import functools
+import hashlib
+import json
+import os
+
+
+class KeywordResultCache:
+    """
+    Caches successful keyword generation results by normalized request
+
+    Concurrent identical requests share a single in-flight computation
+    (singleflight), so N callers trigger only one crew run.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(topic_description: str, **params: Any) -> str:
+        """
+        Build a cache key from a normalized request
+
+        The topic is case-folded and whitespace-collapsed; string parameters
+        are lower-cased so "High" and "high" share an entry.
+        """
+        normalized = {
+            "topic": " ".join(topic_description.split()).casefold(),
+            **{
+                name: value.strip().lower() if isinstance(value, str) else value
+                for name, value in sorted(params.items())
+            }
+        }
+        payload = json.dumps(normalized, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a cached result, marked as reused (see reused_result), and record the hit, or None"""
+        result = self.backend.get(key)
+        if result is not None:
+            self.hits += 1
+            result = reused_result(result)
+        return result
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Return the cached result for key, computing it at most once
+
+        Only results with success=True are stored. The computation runs as
+        its own task, so a cancelled caller does not cancel the work that
+        other coalesced callers are waiting on. Only the caller that started
+        the computation gets its token usage; cache hits and coalesced
+        callers get the result marked as reused.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._store, key))
+
+        result = await asyncio.shield(task)
+        return reused_result(result) if coalesced else result
+
+    def _store(self, key: str, task: asyncio.Future) -> None:
+        """Store a finished computation and release its in-flight slot"""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if isinstance(result, dict) and result.get("success"):
+            self.backend.set(key, result)
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Get cache hit/miss counters"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+
+def reused_result(result: dict) -> dict:
+    """
+    Copy of a keyword result for a request that did not run the LLM itself
+
+    usage counts the tokens a request spent, so prompt_tokens and
+    completion_tokens are zeroed and usage is marked cached; the figures of
+    the run that produced the result are kept under usage["run"].
+    """
+    usage = result.get("usage")
+    if not usage:
+        return result
+    run = usage.get("run") or {
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0)
+    }
+    return {**result, "usage": {**usage, "prompt_tokens": 0, "completion_tokens": 0, "cached": True, "run": run}}
+
+
+def create_result_cache() -> Optional[KeywordResultCache]:
+    """
+    Create the keyword result cache from environment configuration
+
+    KEYWORD_CACHE_BACKEND: memory (default), sqlite or none
+    KEYWORD_CACHE_TTL: Seconds before an entry expires (default: 3600)
+    KEYWORD_CACHE_MAX_ENTRIES: LRU size bound (default: 1024)
+    KEYWORD_CACHE_PATH: SQLite file path (default: .cache/keyword_cache.sqlite3)
+    """
+    backend = create_cache_backend(
+        os.getenv("KEYWORD_CACHE_BACKEND", "memory"),
+        ttl_seconds=float(os.getenv("KEYWORD_CACHE_TTL", 3600)),
+        max_entries=int(os.getenv("KEYWORD_CACHE_MAX_ENTRIES", 1024)),
+        path=os.getenv("KEYWORD_CACHE_PATH", ".cache/keyword_cache.sqlite3")
+    )
+    return KeywordResultCache(backend) if backend is not None else None
@@ -1,20 +1,48 @@
 """
 FastAPI main application entry point
 """
-from fastapi import FastAPI
+from dotenv import load_dotenv
+
+# Load environment variables before the app modules, which read settings at import
+load_dotenv()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse
 from api.routes import router
-from dotenv import load_dotenv
+from crew import get_crew_manager
+from monitoring.metrics import CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from monitoring.profiling import ProfilingMiddleware, get_profiler
+from tools import creativity_tool, memory_store, search_cache
 import os
 
-# Load environment variables
-load_dotenv()
+# When heavy state (CrewAI imports, LLM client, pooled crews) is created:
+#   lazy    - on the first keyword request (fastest worker start)
+#   startup - in the lifespan hook, before the worker accepts traffic
+#   preload - at import, so `gunicorn --preload` forks share it copy-on-write
+APP_INIT_MODE = os.getenv("APP_INIT_MODE", "lazy").lower()
+CREW_POOL_PREWARM = os.getenv("CREW_POOL_PREWARM", "True").lower() in ("1", "true", "yes")
+
+if APP_INIT_MODE == "preload":
+    get_crew_manager().warm_up(prewarm_crews=CREW_POOL_PREWARM)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize heavy state on startup and stop the crew executor on shutdown"""
+    if APP_INIT_MODE == "startup":
+        get_crew_manager().warm_up(prewarm_crews=CREW_POOL_PREWARM)
+    yield
+    get_crew_manager().shutdown(wait=False)
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Keyword Generation AI API",
     description="AI-powered keyword and word suggestion generator using CrewAI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Get frontend URL from environment or use default
@@ -38,6 +66,52 @@ app.add_middleware(
 # Include API routes
 app.include_router(router, prefix="/api", tags=["Keyword Generation"])
 
+def _keyword_cache_stats() -> dict:
+    cache = get_crew_manager().result_cache
+    return cache.stats() if cache is not None else {}
+
+
+# Per-route request counts and latency, plus executor, pool and cache stats at scrape time
+if metrics_registry.enabled:
+    app.add_middleware(MetricsMiddleware)
+    metrics_registry.register_stats("crew_executor", lambda: get_crew_manager().executor_stats())
+    metrics_registry.register_stats("crew_pool", lambda: get_crew_manager().crew_pool.stats())
+    metrics_registry.register_stats("keyword_cache", _keyword_cache_stats)
+    metrics_registry.register_stats("creativity_cache", creativity_tool.cache_stats)
+    metrics_registry.register_stats("search_cache", search_cache.stats)
+    metrics_registry.register_stats("memory", memory_store.stats)
+
+
+# Opt-in per-request profiles (X-Profile header or ?profile=1), outermost so they cover everything
+profiler = get_profiler()
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    
+    @app.get("/debug/profiles", include_in_schema=False)
+    async def list_profiles():
+        """Saved request profiles, most recent first"""
+        return {"success": True, "profiles": profiler.saved()}
+    
+    @app.get("/debug/profiles/{request_id}", include_in_schema=False)
+    async def get_profile(request_id: str, format: str = "raw"):
+        """Download a saved profile, or a text summary of a pstats profile with ?format=text"""
+        path = profiler.find(request_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail=f"No profile for request: {request_id}")
+        if format == "text" and path.endswith(".prof"):
+            return PlainTextResponse(profiler.summary(path))
+        return FileResponse(path, filename=os.path.basename(path))
+
+
+# A plain function, so FastAPI runs scrapes in its threadpool: collectors call
+# stats() methods that take locks, purge expired memory or query SQLite
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics in text exposition format"""
+    if not metrics_registry.enabled:
+        return PlainTextResponse("Metrics are disabled (METRICS_ENABLED=False)\n", status_code=404)
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
 
 @app.get("/")
 async def root():
@@ -48,7 +122,8 @@ async def root():
         "health": "/api/health",
         "endpoints": {
             "generate_keywords": "/api/generate-keywords",
-            "creative_suggestions": "/api/creative-suggestions"
+            "creative_suggestions": "/api/creative-suggestions",
+            "metrics": "/metrics"
         }
     }
 
@@ -0,0 +1,15 @@
+from .metrics import registry, stage, observe_stage, record_tokens, MetricsMiddleware, MetricsRegistry
+from .profiling import get_profiler, profiled, Profiler, ProfilingMiddleware
+
+__all__ = [
+    'registry',
+    'stage',
+    'observe_stage',
+    'record_tokens',
+    'MetricsMiddleware',
+    'MetricsRegistry',
+    'get_profiler',
+    'profiled',
+    'Profiler',
+    'ProfilingMiddleware'
+]
@@ -0,0 +1,378 @@
+"""
+Prometheus metrics for request stages, in-flight work, LLM tokens and errors
+
+Metrics live in process memory and are rendered in the Prometheus text
+exposition format only when /metrics is scraped, so no client library is
+needed. Recording a value costs one lock and a few additions; with
+METRICS_ENABLED=False every recording call returns immediately. Each worker
+process keeps its own metrics.
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; spans cache hits (milliseconds) to slow crew runs (minutes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# stats() fields that only ever grow
+COUNTER_FIELDS = ("hits", "misses", "coalesced", "created", "reused", "evicted_entries", "evicted_keys", "expired_entries")
+# A collector returns (name, type, help, [(labels, value), ...]) families at scrape time
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base class for a metric family with a fixed set of label names"""
+
+    type = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines for every label combination, in exposition format"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. work in flight"""
+
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Count the block as in flight while it runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][position] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        lines = []
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metric families and scrape-time collectors, and renders them"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets=buckets))
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable producing metric families when scraped, e.g. from existing stats()"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register_stats(self, prefix: str, stats: Callable[[], dict], counters: Iterable[str] = COUNTER_FIELDS) -> None:
+        """
+        Expose the numeric fields of a stats() dictionary when scraped
+
+        Fields named in counters become "<prefix>_<field>_total" counters,
+        other numbers "<prefix>_<field>" gauges; nested values are skipped.
+        """
+        counters = set(counters)
+
+        def collect():
+            for field, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                description = f"{prefix.replace('_', ' ')} {field.replace('_', ' ')}"
+                if field in counters:
+                    yield f"namegenie_{prefix}_{field}_total", "counter", description, [({}, value)]
+                else:
+                    yield f"namegenie_{prefix}_{field}", "gauge", description, [({}, value)]
+
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        blocks = [metric.render() for metric in metrics]
+        for collector in collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+                for labels, value in samples:
+                    names = tuple(labels)
+                    lines.append(f"{name}{_format_labels(names, tuple(labels[label] for label in names))} {_format_value(value)}")
+                blocks.append("\n".join(lines))
+        return "\n".join(blocks) + "\n"
+
+    def clear(self) -> None:
+        """Reset every recorded value"""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+registry = MetricsRegistry(enabled=os.getenv("METRICS_ENABLED", "True").lower() in ("1", "true", "yes"))
+
+STAGE_SECONDS = registry.histogram(
+    "namegenie_stage_duration_seconds",
+    "Time spent in each stage of keyword generation",
+    ["stage"]
+)
+STAGE_IN_FLIGHT = registry.gauge(
+    "namegenie_stage_in_flight",
+    "Stages currently running",
+    ["stage"]
+)
+STAGE_ERRORS = registry.counter(
+    "namegenie_stage_errors_total",
+    "Stages that raised an error",
+    ["stage"]
+)
+LLM_TOKENS = registry.counter(
+    "namegenie_llm_tokens_total",
+    "LLM tokens used, by type (prompt or completion)",
+    ["type"]
+)
+PROMPT_COMPACTIONS = registry.counter(
+    "namegenie_prompt_compactions_total",
+    "Prompt parts cut down to fit their token budget, by part (topic or inspiration)",
+    ["part"]
+)
+HTTP_REQUESTS = registry.counter(
+    "namegenie_http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"]
+)
+HTTP_SECONDS = registry.histogram(
+    "namegenie_http_request_duration_seconds",
+    "HTTP request latency, until the response has been sent",
+    ["method", "route"]
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "namegenie_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ["method"]
+)
+
+
+class _Stage:
+    """Context manager behind stage(); a plain class is cheaper than a generator"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        if registry.enabled:
+            STAGE_IN_FLIGHT.inc(stage=self.name)
+            self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if registry.enabled and self.start:
+            if exc_type is not None and issubclass(exc_type, Exception):
+                STAGE_ERRORS.inc(stage=self.name)
+            STAGE_SECONDS.observe(time.perf_counter() - self.start, stage=self.name)
+            STAGE_IN_FLIGHT.dec(stage=self.name)
+        return False
+
+
+def stage(name: str) -> _Stage:
+    """
+    Instrument a stage: latency histogram, in-flight gauge and error counter
+
+    Stages: creativity, prompt, crew_acquire, kickoff, direct_llm, search,
+    memory_save.
+    """
+    return _Stage(name)
+
+
+def observe_stage(name: str, seconds: float) -> None:
+    """Record a stage duration measured by the caller"""
+    STAGE_SECONDS.observe(seconds, stage=name)
+
+
+def record_tokens(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Count LLM tokens used by a request"""
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, type="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, type="completion")
+
+
+def _route_label(scope: dict) -> str:
+    """Path template of the matched route, including any router prefix"""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    # Some FastAPI versions report included routes without their router prefix
+    position = scope["path"].find(template.split("{")[0])
+    return scope["path"][:position] + template if position > 0 else template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting HTTP requests per route template and status
+
+    Routes are labelled with their path template (e.g. /api/memory/{session_id})
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app, skip_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route_label(scope)
+            HTTP_SECONDS.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            HTTP_IN_FLIGHT.dec(method=method)
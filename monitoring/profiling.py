@@ -0,0 +1,377 @@
+"""
+Opt-in per-request profiling
+
+When PROFILING_ENABLED is set, a request carrying an "X-Profile" header or a
+"profile" query parameter runs under a profiler and the result is stored
+under PROFILING_DIR, keyed by request id (suffixed if that id was already
+profiled, so a reused X-Request-ID never overwrites a profile). The response
+carries "X-Request-ID" and an "X-Profile" header with the URL to fetch the
+profile from.
+
+Two modes:
+    pstats    - deterministic cProfile; saved as a .prof file, or rendered
+                as a text summary with ?format=text
+    collapsed - sampling profiler; saved as folded stacks ("a;b;c count"),
+                ready for flamegraph.pl or speedscope
+
+The profile covers the event loop thread while the request runs and every
+crew executor thread working for it (see CrewManager.run_in_executor), so
+it includes the route, CrewManager.generate_keywords and CreativityTool.
+Other requests served by the event loop at the same time show up too, so
+profile on an otherwise quiet instance. One request is profiled at a time;
+a concurrent request asking for a profile gets "X-Profile: busy".
+"""
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+
+MODES = ("pstats", "collapsed")
+EXTENSIONS = {"pstats": ".prof", "collapsed": ".collapsed"}
+REQUEST_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile(ABC):
+    """Profile of one request, collected from every thread working on it"""
+
+    mode = ""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = 0.0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    @abstractmethod
+    def run(self, func: Callable, *args, **kwargs):
+        """Run func on the calling (worker) thread as part of this profile"""
+
+    @abstractmethod
+    def save(self, path: str) -> None:
+        """Write the profile to path"""
+
+
+class CProfileRequestProfile(RequestProfile):
+    """Deterministic cProfile, one profiler per thread, merged on save"""
+
+    mode = "pstats"
+
+    def __init__(self, request_id: str):
+        super().__init__(request_id)
+        self._main = cProfile.Profile()
+        self._workers: List[cProfile.Profile] = []
+
+    def start(self) -> None:
+        super().start()
+        self._main.enable()
+
+    def stop(self) -> None:
+        self._main.disable()
+        super().stop()
+
+    def run(self, func: Callable, *args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile at a time, and it sees every thread
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._workers.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            workers = list(self._workers)
+        stats = pstats.Stats(self._main)
+        for profiler in workers:
+            stats.add(profiler)
+        return stats
+
+    def save(self, path: str) -> None:
+        self.stats().dump_stats(path)
+
+
+class SamplingRequestProfile(RequestProfile):
+    """Samples the stacks of the request's threads at a fixed interval"""
+
+    mode = "collapsed"
+
+    def __init__(self, request_id: str, interval: float = 0.005):
+        super().__init__(request_id)
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._threads: Dict[int, str] = {}
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def _add_thread(self) -> None:
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+
+    def _remove_thread(self) -> None:
+        with self._lock:
+            self._threads.pop(threading.get_ident(), None)
+
+    def start(self) -> None:
+        super().start()
+        self._add_thread()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.request_id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._sampler.join()
+        self._remove_thread()
+        super().stop()
+
+    def run(self, func: Callable, *args, **kwargs):
+        self._add_thread()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._remove_thread()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, name in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if stack:
+                    stack.append(name)
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Profile of the request being handled in this context, if any"""
+    return _current.get()
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Bind func to the current request's profile, for running on another thread
+
+    Thread pools don't carry context variables over, so call this where the
+    work is submitted. Without an active profile func is returned unchanged.
+    """
+    profile = _current.get()
+    if profile is None:
+        return func
+
+    def run(*args, **kwargs):
+        return profile.run(func, *args, **kwargs)
+    return run
+
+
+class Profiler:
+    """Creates request profiles and keeps the most recent ones on disk"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        directory: str = ".cache/profiles",
+        mode: str = "pstats",
+        interval: float = 0.005,
+        keep: int = 100
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.enabled = enabled
+        self.directory = directory
+        self.mode = mode
+        self.interval = interval
+        self.keep = keep
+        self._busy = threading.Lock()
+        self._saved: Deque[str] = deque()
+        self._saved_lock = threading.Lock()
+
+    def requested_mode(self, headers: Dict[str, str], query_string: bytes) -> Optional[str]:
+        """Mode asked for by the X-Profile header or profile query parameter, or None"""
+        value = headers.get("x-profile")
+        if value is None:
+            values = parse_qs(query_string.decode("latin-1")).get("profile")
+            value = values[0] if values else None
+        if value is None or value.lower() in ("0", "false", "no", "off"):
+            return None
+        value = value.lower()
+        return value if value in MODES else self.mode
+
+    def try_begin(self, request_id: str, mode: str) -> Optional[RequestProfile]:
+        """
+        Start profiling a request, or return None if another one is being profiled
+
+        The profile is stored under request_id unless a profile with that id
+        already exists (a client reusing X-Request-ID), in which case a random
+        suffix is added; the profile's request_id is the one it is saved under.
+        """
+        if not self._busy.acquire(blocking=False):
+            return None
+        if self.find(request_id) is not None:
+            request_id = f"{request_id[:55]}-{uuid.uuid4().hex[:8]}"
+        if mode == "collapsed":
+            profile = SamplingRequestProfile(request_id, self.interval)
+        else:
+            profile = CProfileRequestProfile(request_id)
+        try:
+            profile.start()
+        except BaseException:
+            # e.g. another profiler is already active; don't stay busy forever
+            self._busy.release()
+            raise
+        return profile
+
+    def finish(self, profile: RequestProfile) -> str:
+        """Stop and save a profile, dropping the oldest saved profiles beyond keep"""
+        try:
+            profile.stop()
+        finally:
+            self._busy.release()
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{profile.request_id}{EXTENSIONS[profile.mode]}")
+        profile.save(path)
+        with self._saved_lock:
+            self._saved.append(path)
+            while len(self._saved) > self.keep:
+                old = self._saved.popleft()
+                if old not in self._saved and os.path.exists(old):
+                    os.remove(old)
+        return path
+
+    def find(self, request_id: str) -> Optional[str]:
+        """Path of a saved profile for a request id"""
+        if not REQUEST_ID.match(request_id):
+            return None
+        for extension in EXTENSIONS.values():
+            path = os.path.join(self.directory, f"{request_id}{extension}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def saved(self) -> List[dict]:
+        """Saved profiles, most recent first"""
+        with self._saved_lock:
+            paths = list(self._saved)
+        return [
+            {
+                "request_id": os.path.splitext(os.path.basename(path))[0],
+                "mode": "collapsed" if path.endswith(EXTENSIONS["collapsed"]) else "pstats",
+                "bytes": os.path.getsize(path)
+            }
+            for path in reversed(paths) if os.path.exists(path)
+        ]
+
+    @staticmethod
+    def summary(path: str, limit: int = 40, sort: str = "cumulative") -> str:
+        """Text report of the top functions in a pstats file"""
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests asking for it"""
+
+    def __init__(self, app, profiler: "Profiler" = None, url_prefix: str = "/debug/profiles"):
+        self.app = app
+        self.profiler = profiler or get_profiler()
+        self.url_prefix = url_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        mode = self.profiler.requested_mode(headers, scope.get("query_string", b""))
+        if mode is None or scope["path"].startswith(self.url_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get("x-request-id", "")
+        if not REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        profile = self.profiler.try_begin(request_id, mode)
+        status = f"{self.url_prefix}/{profile.request_id}" if profile is not None else "busy"
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-profile", status.encode("latin-1"))
+                ]
+            await send(message)
+
+        if profile is None:
+            await self.app(scope, receive, send_with_headers)
+            return
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            self.profiler.finish(profile)
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """
+    Get the shared Profiler, configured from the environment
+
+    PROFILING_ENABLED: Allow per-request profiling (default: False)
+    PROFILING_DIR: Where profiles are stored (default: .cache/profiles)
+    PROFILING_MODE: Default mode, pstats or collapsed (default: pstats)
+    PROFILING_INTERVAL: Seconds between samples in collapsed mode (default: 0.005)
+    PROFILING_KEEP: Number of profiles kept on disk (default: 100)
+    """
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = Profiler(
+                    enabled=os.getenv("PROFILING_ENABLED", "False").lower() in ("1", "true", "yes"),
+                    directory=os.getenv("PROFILING_DIR", ".cache/profiles"),
+                    mode=os.getenv("PROFILING_MODE", "pstats").lower(),
+                    interval=float(os.getenv("PROFILING_INTERVAL", 0.005)),
+                    keep=int(os.getenv("PROFILING_KEEP", 100))
+                )
+    return _profiler
@@ -0,0 +1,29 @@
+"""
+Shared test setup
+
+Settings are read when modules are imported, so the environment is set
+here, before any test module imports the app. Tests never reach OpenAI or
+Serper: the LLM is benchmarks.fakes.FakeLLM and web search uses the stub
+backend.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for name, value in {
+    "OPENAI_API_KEY": "sk-test",
+    "SERPER_API_KEY": "test",
+    "WEB_SEARCH_BACKEND": "stub",
+    "WEB_SEARCH_CACHE_BACKEND": "memory",
+    "KEYWORD_CACHE_BACKEND": "none",
+    "MEMORY_BACKEND": "memory",
+    "METRICS_ENABLED": "False",
+    "PROMPT_TOKENIZER": "estimate",
+    # Verbose crews skip CrewAI's wait for a console tree on every task
+    "CREW_VERBOSE": "True",
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "CREWAI_TRACING_ENABLED": "false",
+    "OTEL_SDK_DISABLED": "true"
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,74 @@
+import json
+
+import bulk_suggestions
+
+
+def write_lines(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def run(input_path, output_path):
+    return bulk_suggestions.main([
+        str(input_path), str(output_path), "--workers", "1", "--chunk-size", "2", "--count", "3"
+    ])
+
+
+def test_malformed_lines_become_error_records(tmp_path):
+    source = tmp_path / "topics.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_lines(source, [
+        json.dumps({"topic": "coffee shop"}),
+        "{not json",
+        json.dumps({"name": "no topic here"}),
+        "",
+        json.dumps("bike repair"),
+        json.dumps(42),
+    ])
+
+    assert run(source, output) == 0
+
+    results = {result["line"]: result for result in read_results(output)}
+    assert sorted(results) == [1, 2, 3, 5, 6]
+    assert results[1]["topic"] == "coffee shop" and results[1]["suggestions"]
+    assert results[5]["topic"] == "bike repair" and results[5]["suggestions"]
+    assert results[2]["error"].startswith("invalid JSON")
+    assert results[3]["error"] == "missing 'topic' field"
+    assert "error" in results[6]
+
+
+def test_csv_row_without_topic_is_an_error_record(tmp_path):
+    source = tmp_path / "topics.csv"
+    output = tmp_path / "results.jsonl"
+    write_lines(source, ["id,topic", "1,coffee shop", "2"])
+
+    assert run(source, output) == 0
+
+    results = {result["line"]: result for result in read_results(output)}
+    assert results[1]["suggestions"]
+    assert results[2]["error"] == "missing 'topic' field"
+
+
+def test_resume_skips_written_lines(tmp_path):
+    source = tmp_path / "topics.jsonl"
+    output = tmp_path / "results.jsonl"
+    write_lines(source, [json.dumps({"topic": topic}) for topic in ("coffee", "tea", "juice")] + ["{bad"])
+
+    assert run(source, output) == 0
+    complete = read_results(output)
+
+    # Simulate an interrupted run: keep the first result and half of the second
+    lines = output.read_text(encoding="utf-8").splitlines(keepends=True)
+    output.write_text(lines[0] + lines[1][:10], encoding="utf-8")
+
+    assert run(source, output) == 0
+    resumed = read_results(output)
+    assert sorted(result["line"] for result in resumed) == [1, 2, 3, 4]
+    assert sorted(resumed, key=lambda result: result["line"]) == sorted(complete, key=lambda result: result["line"])
+
+    # Nothing left to do, error line included
+    assert run(source, output) == 0
+    assert len(read_results(output)) == 4
@@ -0,0 +1,83 @@
+"""
+Tests for reproducible and memoized creativity suggestions
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tools.creativity_tool import CreativityTool, select_affixes, select_affixes_many
+
+# tools/__init__ exports a CreativityTool instance under the module's name
+creativity_module = sys.modules["tools.creativity_tool"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOPIC = "organic cold brew coffee subscription"
+TOPICS = [TOPIC, "bamboo toothbrush for kids", "cloud storage", TOPIC, "ai"]
+
+
+def test_suggestions_are_reproducible_without_the_cache():
+    first = CreativityTool(cache_size=0).get_creative_suggestions(TOPIC, count=10)
+    second = CreativityTool(cache_size=0).get_creative_suggestions(TOPIC, count=10)
+    assert first == second
+    assert all(first.values())
+
+
+def test_seed_selects_another_reproducible_set():
+    tool = CreativityTool(cache_size=0)
+    seeded = tool.get_creative_suggestions("cloud storage", count=10, seed=7)
+    assert seeded == tool.get_creative_suggestions("cloud storage", count=10, seed=7)
+    assert seeded["variations"] != tool.get_creative_suggestions("cloud storage", count=10)["variations"]
+
+
+def test_suggestions_match_across_processes():
+    script = (
+        "import json; from tools.creativity_tool import CreativityTool; "
+        f"print(json.dumps(CreativityTool(cache_size=0).get_creative_suggestions({TOPIC!r}, count=10)))"
+    )
+    outputs = set()
+    for hash_seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+        completed = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        outputs.add(completed.stdout)
+    assert len(outputs) == 1
+    assert json.loads(outputs.pop()) == CreativityTool(cache_size=0).get_creative_suggestions(TOPIC, count=10)
+
+
+def test_memo_returns_copies():
+    tool = CreativityTool(cache_size=8)
+    first = tool.get_creative_suggestions(TOPIC, count=10)
+    first["variations"].clear()
+
+    second = tool.get_creative_suggestions(TOPIC, count=10)
+    assert second["variations"]
+    assert tool.cache_stats()["hits"] == 1
+    assert second == CreativityTool(cache_size=0).get_creative_suggestions(TOPIC, count=10)
+
+
+def test_batch_matches_per_topic_calls():
+    single = CreativityTool(cache_size=0)
+    expected = [single.get_creative_suggestions(topic, count=10, seed=3) for topic in TOPICS]
+    assert CreativityTool(cache_size=0).get_creative_suggestions_many(TOPICS, count=10, seed=3) == expected
+
+
+def test_vectorized_affixes_match_pure_python(monkeypatch):
+    if creativity_module.np is None:
+        pytest.skip("NumPy is not installed")
+    seeds = [0, 1, 2 ** 64 - 1, 12345678901234567890]
+    expected = [select_affixes(seed, 16, 16) for seed in seeds]
+    assert [tuple(map(_plain, picks)) for picks in select_affixes_many(seeds, 16, 16)] == [
+        tuple(map(_plain, picks)) for picks in expected
+    ]
+
+    vectorized = CreativityTool(cache_size=0).get_creative_suggestions_many(TOPICS, count=10)
+    monkeypatch.setattr(creativity_module, "np", None)
+    assert CreativityTool(cache_size=0).get_creative_suggestions_many(TOPICS, count=10) == vectorized
+
+
+def _plain(value):
+    return list(value) if isinstance(value, (list, tuple)) else int(value)
@@ -0,0 +1,53 @@
+"""
+Tests for pooled crews in CrewManager
+"""
+import pytest
+
+pytest.importorskip("crewai")
+
+from benchmarks.fakes import FakeLLM
+from crew.crew_manager import CrewManager
+
+TASK = 'Suggest keywords for "organic cold brew coffee"'
+
+
+@pytest.fixture
+def manager():
+    manager = CrewManager(max_concurrency=1)
+    manager.llm = FakeLLM()
+    yield manager
+    manager.shutdown(wait=False)
+
+
+def run(manager, events=None):
+    on_event = (lambda event, data: events.append(event)) if events is not None else None
+    answer, _ = manager._run_crew("high", TASK, use_search=True, on_event=on_event)
+    return answer
+
+
+def test_streamed_runs_on_one_pooled_crew_keep_their_own_events(manager):
+    first, second = [], []
+    run(manager, first)
+    first_steps = first.count("step")
+    assert first_steps > 0
+
+    run(manager, second)
+    assert manager.crew_pool.stats()["reused"] == 1
+    assert second.count("step") == first_steps
+    # The first request's callback must not fire for later runs
+    assert first.count("step") == first_steps
+
+    run(manager)
+    assert manager.crew_pool.stats()["reused"] == 2
+    assert first.count("step") == first_steps
+    assert second.count("step") == first_steps
+
+
+def test_pooled_crew_agents_are_reset_after_a_streamed_run(manager):
+    run(manager, [])
+    with manager.crew_pool.acquire(True, "high") as crew:
+        for agent in crew.agents:
+            assert agent.step_callback is None
+            assert getattr(agent.llm, "stream", None) is not True
+        assert crew.step_callback is None
+        assert not crew.stream
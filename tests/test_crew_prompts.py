@@ -0,0 +1,52 @@
+"""
+Tests for the creativity inspiration in keyword prompts
+"""
+import re
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from benchmarks.fakes import FakeLLM
+from crew.crew_manager import CrewManager
+from tools.creativity_tool import normalization_key
+
+TOPIC = "cloud storage"
+
+
+@pytest.fixture
+def manager():
+    manager = CrewManager(max_concurrency=1)
+    manager.llm = FakeLLM()
+    yield manager
+    manager.shutdown(wait=False)
+
+
+def loose_key(name):
+    return normalization_key(name, case_insensitive=True, separator_insensitive=True)
+
+
+def inspiration_names(task_description):
+    return [
+        name.strip()
+        for line in re.findall(r"^- [A-Za-z ]+: (.*)$", task_description, re.MULTILINE)
+        for name in line.split(",") if name.strip()
+    ]
+
+
+def test_inspiration_has_no_case_or_separator_duplicates(manager):
+    suggestions = manager.inspiration_suggestions(TOPIC)
+    names = [name for items in suggestions.values() for name in items]
+    assert len({loose_key(name) for name in names}) == len(names)
+
+    prompt_names = inspiration_names(manager.build_task_description(TOPIC, suggestions))
+    assert prompt_names
+    assert len({loose_key(name) for name in prompt_names}) == len(prompt_names)
+
+
+def test_keyword_results_use_deduplicated_inspiration(manager):
+    result = manager.generate_keywords(TOPIC, use_search=False, fast_path=True)
+    names = [name for items in result["creative_suggestions"].values() for name in items]
+    keys = [loose_key(name) for name in names]
+    assert len(set(keys)) == len(keys)
+    assert keys.count("cloudstorage") <= 1 and keys.count("cloud") <= 1
@@ -0,0 +1,72 @@
+"""
+Tests for the token usage reported on fresh, cached, coalesced and packed keyword results
+"""
+import asyncio
+
+import pytest
+
+from crew.result_cache import KeywordResultCache
+from tools.cache import InMemoryCache
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 11, "task_tokens": 40, "shared_by": 1}
+
+
+def result(usage=USAGE):
+    return {"success": True, "keywords": "Brewly", "usage": dict(usage)}
+
+
+def test_cache_hit_reports_no_spent_tokens():
+    cache = KeywordResultCache(InMemoryCache())
+    cache.backend.set("key", result())
+
+    usage = cache.get("key")["usage"]
+    assert usage["cached"] is True
+    assert (usage["prompt_tokens"], usage["completion_tokens"]) == (0, 0)
+    assert usage["run"] == {"prompt_tokens": 100, "completion_tokens": 11}
+    assert usage["task_tokens"] == 40
+    # The stored entry is untouched
+    assert cache.backend.get("key")["usage"] == USAGE
+
+
+def test_only_the_computing_caller_reports_tokens():
+    cache = KeywordResultCache(InMemoryCache())
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return result()
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert cache.stats()["coalesced"] == 2
+    assert results[0]["usage"] == USAGE
+    for shared in results[1:]:
+        assert shared["usage"]["cached"] is True
+        assert shared["usage"]["prompt_tokens"] == 0
+        assert shared["usage"]["run"] == {"prompt_tokens": 100, "completion_tokens": 11}
+
+    # A later hit is reused too
+    assert asyncio.run(cache.get_or_compute("key", compute))["usage"]["cached"] is True
+
+
+def test_packed_topics_split_the_run_tokens(monkeypatch):
+    pytest.importorskip("crewai")
+    from crew.crew_manager import CrewManager
+
+    manager = CrewManager(max_concurrency=1)
+    answer = "### Topic 1\nBrewly\n### Topic 2\nBrushy\n### Topic 3\nSoapify"
+    monkeypatch.setattr(
+        manager, "_run_direct",
+        lambda *args, **kwargs: (answer, {"prompt_tokens": 100, "completion_tokens": 11})
+    )
+    try:
+        results = manager.generate_keywords_packed(["coffee", "toothbrush", "soap"], fast_path=True)
+    finally:
+        manager.shutdown(wait=False)
+
+    usages = [item["usage"] for item in results]
+    assert [usage["prompt_tokens"] for usage in usages] == [34, 33, 33]
+    assert [usage["completion_tokens"] for usage in usages] == [4, 4, 3]
+    assert all(usage["shared_by"] == 3 for usage in usages)
+    assert all(usage["run"] == {"prompt_tokens": 100, "completion_tokens": 11} for usage in usages)
@@ -0,0 +1,96 @@
+"""
+Tests for compiling and memory-mapping the lexicon index
+"""
+import os
+
+import pytest
+
+from tools.lexicon import DEFAULT_SOURCE, LexiconEntry, MmapLexicon, compile_lexicon, load_lexicon, read_source
+
+SOURCE = (
+    "# word\tsynonyms\trelated\troot\n"
+    "coffee\tbrew, java\tcafe,roast\tcoffee\n"
+    "\n"
+    "Runner\tsprinter\trace\trun\n"
+    "café\tbistro\tcoffee\t\n"
+    "zen\t\t\t\n"
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "lexicon.tsv"
+    path.write_text(SOURCE, encoding="utf-8")
+    return str(path)
+
+
+def test_round_trip_returns_every_source_entry(source, tmp_path):
+    index = str(tmp_path / "out" / "lexicon.idx")
+    entries = read_source(source)
+
+    assert compile_lexicon(source, index) == len(entries) == 4
+    lexicon = MmapLexicon(index)
+    assert len(lexicon) == 4
+    for entry in entries:
+        assert lexicon.lookup(entry.word) == entry
+    assert lexicon.lookup("café") == LexiconEntry("café", ("bistro",), ("coffee",), "café")
+    assert lexicon.lookup("zen") == LexiconEntry("zen", (), (), "zen")
+
+
+def test_default_source_round_trips(tmp_path):
+    index = str(tmp_path / "lexicon.idx")
+    compile_lexicon(DEFAULT_SOURCE, index)
+    lexicon = MmapLexicon(index)
+    entries = read_source(DEFAULT_SOURCE)
+    assert len(lexicon) == len(entries)
+    assert all(lexicon.lookup(entry.word) == entry for entry in entries)
+
+
+def test_lookup_falls_back_to_stems(source, tmp_path):
+    index = str(tmp_path / "lexicon.idx")
+    compile_lexicon(source, index)
+    lexicon = MmapLexicon(index)
+
+    assert lexicon.lookup(" RUNNERS ").word == "runner"
+    assert lexicon.lookup("coffees").word == "coffee"
+    assert lexicon.lookup("tea") is None
+    assert lexicon.expand("coffee") == ["brew", "java", "cafe", "roast"]
+    assert lexicon.root("runner") == "run"
+    assert lexicon.root("Tea") == "tea"
+
+
+def test_load_recompiles_a_stale_index(source, tmp_path):
+    index = str(tmp_path / "lexicon.idx")
+    assert len(load_lexicon(source, index)) == 4
+
+    # An mtime older than the index, as after a git checkout
+    stat = os.stat(source)
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("tea\tchai\t\t\n")
+    os.utime(source, (stat.st_atime, stat.st_mtime - 60))
+    assert load_lexicon(source, index).lookup("tea").synonyms == ("chai",)
+
+    # Unchanged source: the index is mapped without recompiling
+    mtime = os.path.getmtime(index)
+    assert len(load_lexicon(source, index)) == 5
+    assert os.path.getmtime(index) == mtime
+
+
+def test_load_recompiles_an_index_in_an_older_format(source, tmp_path):
+    index = tmp_path / "lexicon.idx"
+    index.write_bytes(b"LEX1" + bytes(4))
+    assert len(load_lexicon(source, str(index))) == 4
+
+
+def test_bundled_roots_are_true_roots():
+    lexicon_entries = {entry.word: entry for entry in read_source(DEFAULT_SOURCE)}
+    for word in ("organic", "digital", "mountain", "adventure", "community", "health", "wellness", "solar"):
+        assert lexicon_entries[word].root == word
+    assert lexicon_entries["solution"].root == "solve"
+
+
+def test_rejects_files_that_are_not_an_index(tmp_path):
+    path = tmp_path / "lexicon.idx"
+    path.write_bytes(b"JUNK" + bytes(16))
+    with pytest.raises(ValueError):
+        MmapLexicon(str(path))
@@ -0,0 +1,256 @@
+"""
+Tests for MemoryStore backends: pagination, search and SQLite write visibility
+"""
+import threading
+import time
+
+import pytest
+
+from tools.memory_backends import InMemoryBackend, MemoryBackend, SQLiteMemoryBackend
+from tools.memory_tool import MemoryStore
+
+TOPICS = [
+    "eco friendly water bottle",
+    "organic cold brew coffee",
+    "eco friendly coffee cups",
+    "bamboo toothbrush for kids",
+    "cloud storage for remote teams"
+]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        backend = InMemoryBackend()
+    else:
+        backend = SQLiteMemoryBackend(str(tmp_path / "memory.sqlite3"), flush_interval=0.01)
+    store = MemoryStore(backend=backend)
+    yield store
+    backend.close()
+
+
+def fill(store, entries=25):
+    for index in range(entries):
+        store.save(f"session-{index % 2}", {
+            "topic": TOPICS[index % len(TOPICS)],
+            "creativity_level": "high" if index % 3 else "low",
+            "result": f"- Name{index}"
+        })
+
+
+def results(entries):
+    return [entry["data"]["result"] for entry in entries]
+
+
+def test_pages_follow_cursor_to_the_full_history(store):
+    fill(store)
+    expected = results(store.retrieve("session-0"))
+    assert len(expected) == 13
+
+    seen, cursor = [], None
+    while True:
+        page = store.retrieve_page("session-0", cursor=cursor, limit=4)
+        assert page["total"] == 13
+        seen += results(page["entries"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+    assert seen == expected
+    assert results(store.iter_entries("session-0", batch_size=5)) == expected
+
+
+def test_page_offset_and_limit(store):
+    fill(store)
+    page = store.retrieve_page("session-1", offset=10, limit=5)
+    assert results(page["entries"]) == results(store.retrieve("session-1"))[10:]
+    assert not page["has_more"]
+
+
+def test_search_filters(store):
+    fill(store)
+    matches = store.search("cold brew", limit=50)
+    assert matches and all(match["data"]["topic"] == "organic cold brew coffee" for match in matches)
+
+    matches = store.search("eco friendly", creativity_level="low", key="session-0", limit=50)
+    assert matches
+    for match in matches:
+        assert match["key"] == "session-0"
+        assert match["data"]["creativity_level"] == "low"
+        assert "eco friendly" in match["data"]["topic"]
+    assert store.search("zeppelin") == []
+
+
+def test_search_matches_the_same_entries_on_both_backends(tmp_path):
+    stores = [
+        MemoryStore(backend=InMemoryBackend()),
+        MemoryStore(backend=SQLiteMemoryBackend(str(tmp_path / "parity.sqlite3"), flush_interval=0.01))
+    ]
+    for store in stores:
+        fill(store, entries=40)
+    for query, level, key in [
+        ("eco friendly", None, None),
+        ("coffee", "high", None),
+        ("remote teams", None, "session-1"),
+        ("toothbrush kids", "low", "session-0")
+    ]:
+        found = [
+            sorted(results(store.search(query, creativity_level=level, key=key, limit=100)))
+            for store in stores
+        ]
+        assert found[0] == found[1], query
+        # Entries matching every query word rank first on both
+        best = [store.search(query, creativity_level=level, key=key, limit=1)[0]["data"]["topic"] for store in stores]
+        assert best[0] == best[1]
+    stores[1].backend.close()
+
+
+def test_sqlite_reads_see_earlier_saves_while_other_threads_keep_writing(tmp_path):
+    backend = SQLiteMemoryBackend(str(tmp_path / "busy.sqlite3"), flush_interval=0.01)
+    store = MemoryStore(backend=backend)
+    stop = threading.Event()
+
+    def keep_saving():
+        while not stop.wait(0.001):
+            store.save("other", {"topic": "background write", "creativity_level": "high", "result": ""})
+
+    writer = threading.Thread(target=keep_saving)
+    writer.start()
+    try:
+        for index in range(20):
+            store.save("mine", {"topic": "own write", "creativity_level": "high", "result": str(index)})
+            assert len(store.retrieve("mine")) == index + 1
+        start = time.perf_counter()
+        store.stats()
+        store.flush()
+        assert time.perf_counter() - start < 5
+    finally:
+        stop.set()
+        writer.join()
+        backend.close()
+
+
+def test_sqlite_reads_see_saves_made_on_another_thread(tmp_path):
+    # Routes save on the event loop thread and read in the threadpool
+    backend = SQLiteMemoryBackend(str(tmp_path / "handoff.sqlite3"), flush_interval=0.2)
+    store = MemoryStore(backend=backend)
+    try:
+        for index in range(3):
+            saver = threading.Thread(
+                target=store.save,
+                args=("handoff", {"topic": "saved elsewhere", "creativity_level": "high", "result": str(index)})
+            )
+            saver.start()
+            saver.join()
+            results = []
+            reader = threading.Thread(target=lambda: results.append(len(store.retrieve("handoff"))))
+            reader.start()
+            reader.join()
+            assert results == [index + 1]
+        assert store.search("saved elsewhere", key="handoff", limit=10)
+    finally:
+        backend.close()
+
+
+def test_since_sees_every_entry_saved_concurrently(store):
+    from datetime import datetime
+
+    def save_many(worker):
+        for index in range(50):
+            store.save("busy", {"topic": f"worker {worker} entry {index}", "creativity_level": "high", "result": ""})
+
+    threads = [threading.Thread(target=save_many, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entries = store.retrieve("busy")
+    timestamps = [entry["timestamp"] for entry in entries]
+    assert len(entries) == 400
+    assert timestamps == sorted(timestamps)
+    for position in (0, 123, 399):
+        since = datetime.fromisoformat(timestamps[position])
+        expected = [timestamp for timestamp in timestamps if timestamp >= timestamps[position]]
+        page = store.retrieve_page("busy", since=since, limit=1000)
+        assert [entry["timestamp"] for entry in page["entries"]] == expected
+        assert page["total"] == len(expected)
+
+
+def test_in_memory_limits_evict_least_recently_used_keys():
+    backend = InMemoryBackend(max_entries_per_key=3, max_total_entries=5)
+    store = MemoryStore(backend=backend)
+    for index in range(4):
+        store.save("a", {"topic": f"a {index}", "creativity_level": "high", "result": ""})
+    assert [entry["data"]["topic"] for entry in store.retrieve("a")] == ["a 1", "a 2", "a 3"]
+
+    store.save("b", {"topic": "b 0", "creativity_level": "high", "result": ""})
+    store.retrieve("a")
+    store.save("c", {"topic": "c 0", "creativity_level": "high", "result": ""})
+    store.save("c", {"topic": "c 1", "creativity_level": "high", "result": ""})
+
+    # Over budget: b was used least recently, so it goes first
+    assert sorted(store.get_all_keys()) == ["a", "c"]
+    stats = store.stats()
+    assert (stats["entries"], stats["evicted_keys"], stats["evicted_entries"]) == (5, 1, 1)
+    assert store.search("b") == []
+
+
+def test_in_memory_entries_expire_after_ttl():
+    store = MemoryStore(backend=InMemoryBackend(ttl_seconds=0.05))
+    store.save("old", {"topic": "expiring", "creativity_level": "high", "result": ""})
+    time.sleep(0.1)
+    store.save("new", {"topic": "fresh", "creativity_level": "high", "result": ""})
+
+    assert store.retrieve("old") == []
+    assert store.search("expiring") == []
+    stats = store.stats()
+    assert stats["keys"] == 1 and stats["expired_entries"] == 1
+
+
+def test_incomplete_backend_fails_at_instantiation():
+    class SaveOnly(MemoryBackend):
+        def save(self, key, entry):
+            pass
+
+    with pytest.raises(TypeError):
+        SaveOnly()
+
+
+def test_memory_route_returns_everything_unless_paging_is_asked_for():
+    # fastapi.testclient needs httpx (requirements-dev.txt)
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from main import app
+    from tools import memory_store
+
+    memory_store.clear("route-test")
+    for index in range(150):
+        memory_store.save("route-test", {"topic": f"topic {index}", "creativity_level": "high", "result": ""})
+    client = TestClient(app)
+
+    full = client.get("/api/memory/route-test").json()
+    assert set(full) == {"success", "session_id", "entries"}
+    assert len(full["entries"]) == 150
+
+    page = client.get("/api/memory/route-test", params={"limit": 20}).json()
+    assert len(page["entries"]) == 20 and page["has_more"] and page["total"] == 150
+    memory_store.clear("route-test")
+
+
+def test_index_search_is_bounded_for_common_words_but_keeps_filtered_matches():
+    from tools.memory_index import MemoryIndex
+
+    index = MemoryIndex(scan_limit=50)
+    for entry_id in range(1000):
+        key = "rare-session" if entry_id < 5 else f"session-{entry_id % 10}"
+        index.add(key, entry_id, {"data": {"topic": f"eco product number{entry_id}", "creativity_level": "high"}})
+
+    # A word in every entry only walks the newest postings
+    assert [match["id"] for match in index.search("product", limit=3)] == [999, 998, 997]
+    # Filters are applied before the walk, so old entries of a small session are still found
+    assert sorted(match["id"] for match in index.search("product", key="rare-session", limit=10)) == [0, 1, 2, 3, 4]
+    # Rare words are matched exactly, common words only add to their scores
+    assert index.search("eco number7 product", limit=1)[0]["id"] == 7
+    # Stopwords don't match anything on their own account
+    assert index.search("the for product", limit=1)[0]["id"] == 999
@@ -0,0 +1,40 @@
+"""
+Tests for the in-process Prometheus metrics
+"""
+import pytest
+
+from monitoring.metrics import Metric, MetricsRegistry
+
+
+def test_metric_without_samples_fails_at_instantiation():
+    class Untyped(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Untyped(MetricsRegistry(enabled=True), "untyped", "no samples")
+
+
+def test_render_counters_histograms_and_stats():
+    registry = MetricsRegistry(enabled=True)
+    requests = registry.counter("requests_total", "Requests", ["route"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency.observe(0.05)
+    latency.observe(5)
+    registry.register_stats("cache", lambda: {"hits": 4, "entries": 2, "enabled": True, "nested": {}})
+
+    text = registry.render()
+    assert 'requests_total{route="/a"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert "namegenie_cache_hits_total 4" in text
+    assert "namegenie_cache_entries 2" in text
+    assert "enabled" not in text and "nested" not in text
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.counter("requests_total", "Requests").inc()
+    assert not any(line.startswith("requests_total") for line in registry.render().splitlines())
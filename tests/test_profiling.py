@@ -0,0 +1,70 @@
+"""
+Tests for opt-in request profiling
+"""
+import pytest
+
+# fastapi.testclient needs httpx (requirements-dev.txt)
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from monitoring.profiling import Profiler, ProfilingMiddleware, RequestProfile
+
+
+@pytest.fixture
+def client(tmp_path):
+    profiler = Profiler(enabled=True, directory=str(tmp_path), keep=2)
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/work")
+    async def work():
+        return {"total": sum(range(1000))}
+
+    return TestClient(app), profiler
+
+
+def test_request_profile_is_abstract():
+    with pytest.raises(TypeError):
+        RequestProfile("id")
+
+
+def test_reused_request_id_keeps_both_profiles(client):
+    client, profiler = client
+    urls = [
+        client.get("/work", headers={"X-Profile": "1", "X-Request-ID": "same-id"}).headers["x-profile"]
+        for _ in range(2)
+    ]
+
+    assert urls[0] == "/debug/profiles/same-id"
+    assert urls[1] != urls[0] and urls[1].startswith("/debug/profiles/same-id-")
+    ids = [url.rsplit("/", 1)[1] for url in urls]
+    assert all(profiler.find(request_id) for request_id in ids)
+    assert [profile["request_id"] for profile in profiler.saved()] == list(reversed(ids))
+
+
+def test_keep_drops_oldest_profiles(client):
+    client, profiler = client
+    for _ in range(3):
+        client.get("/work", headers={"X-Profile": "1", "X-Request-ID": "same-id"})
+
+    saved = profiler.saved()
+    assert len(saved) == 2
+    assert all(profiler.find(profile["request_id"]) for profile in saved)
+    assert profiler.find("same-id") is None
+
+
+def test_failed_start_releases_the_profiler(tmp_path, monkeypatch):
+    profiler = Profiler(enabled=True, directory=str(tmp_path))
+
+    def fail(self):
+        raise ValueError("Another profiling tool is already active")
+    monkeypatch.setattr("monitoring.profiling.CProfileRequestProfile.start", fail)
+    with pytest.raises(ValueError):
+        profiler.try_begin("first", "pstats")
+    monkeypatch.undo()
+
+    profile = profiler.try_begin("second", "pstats")
+    assert profile is not None
+    profiler.finish(profile)
@@ -0,0 +1,138 @@
+"""
+Tests for the keyword result cache: singleflight, TTL and LRU bounds
+"""
+import asyncio
+import time
+
+import pytest
+
+from crew.result_cache import KeywordResultCache
+from tools.cache import CacheBackend, create_cache_backend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def make(ttl_seconds=3600, max_entries=1024):
+        backend = create_cache_backend(
+            request.param,
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+            path=str(tmp_path / "cache.sqlite3")
+        )
+        return KeywordResultCache(backend)
+    return make
+
+
+class Compute:
+    """Counts calls and returns a result after a short await"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.result = result if result is not None else {"success": True, "keywords": "Brewly"}
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def gather(cache, key, compute, callers):
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_compute(key, compute) for _ in range(callers)),
+            return_exceptions=True
+        )
+    return asyncio.run(main())
+
+
+def test_concurrent_callers_share_one_computation(make_cache):
+    cache = make_cache()
+    compute = Compute()
+
+    results = gather(cache, "key", compute, 5)
+
+    assert compute.calls == 1
+    assert all(result["keywords"] == "Brewly" for result in results)
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+    # Stored, so the next caller is a hit
+    assert gather(cache, "key", compute, 1)[0]["keywords"] == "Brewly"
+    assert compute.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_failures_are_shared_but_not_cached(make_cache):
+    cache = make_cache()
+    failing = Compute(error=RuntimeError("LLM down"))
+    results = gather(cache, "key", failing, 3)
+    assert failing.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    unsuccessful = Compute(result={"success": False, "error": "bad topic"})
+    assert gather(cache, "key", unsuccessful, 1)[0]["success"] is False
+    assert len(cache.backend) == 0
+
+    recovered = Compute()
+    assert gather(cache, "key", recovered, 1)[0]["success"] is True
+    assert recovered.calls == 1
+
+
+def test_cancelled_caller_does_not_cancel_shared_work(make_cache):
+    cache = make_cache()
+    compute = Compute()
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        second = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main())["keywords"] == "Brewly"
+    assert compute.calls == 1
+    assert len(cache.backend) == 1
+
+
+def test_entries_expire_after_ttl(make_cache):
+    cache = make_cache(ttl_seconds=0.05)
+    compute = Compute()
+
+    gather(cache, "key", compute, 1)
+    assert cache.get("key") is not None
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+    gather(cache, "key", compute, 1)
+    assert compute.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted(make_cache):
+    cache = make_cache(max_entries=2)
+    for key in ("a", "b"):
+        cache.backend.set(key, {"success": True, "keywords": key})
+        time.sleep(0.01)
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.backend.set("c", {"success": True, "keywords": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_keys_normalize_topic_and_string_parameters():
+    make_key = KeywordResultCache.make_key
+    assert make_key("  Organic   Cold Brew ", creativity_level="High") == make_key("organic cold brew", creativity_level="high")
+    assert make_key("cold brew", use_search=True) != make_key("cold brew", use_search=False)
+
+
+def test_incomplete_backend_fails_at_instantiation():
+    class GetOnly(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly()
@@ -0,0 +1,95 @@
+"""
+Tests for building and mapping the taken-name Bloom filter
+"""
+import sys
+
+import pytest
+
+from tools.creativity_tool import CreativityTool
+from tools.taken_names import TakenNameFilter, build_filter, extract_candidates, main, normalize_name
+
+taken_names = sys.modules["tools.taken_names"]
+
+
+@pytest.fixture
+def bloom(tmp_path):
+    names = [f"brand{i}" for i in range(5000)] + ["Cloud-Storage", "https://www.brewly.io/"]
+    path = str(tmp_path / "index" / "taken.bloom")
+    assert build_filter(names + ["", "--"], path, expected=len(names), fp_rate=0.01) == len(names)
+    return TakenNameFilter(path), names
+
+
+def test_round_trip_has_no_false_negatives(bloom):
+    taken, names = bloom
+    assert all(name in taken for name in names)
+    assert taken.count == len(names)
+
+
+def test_false_positive_rate_is_near_target(bloom):
+    taken, _ = bloom
+    probes = [f"fresh{i}" for i in range(20000)]
+    rate = sum(name in taken for name in probes) / len(probes)
+    assert rate < 0.02
+    assert taken.stats()["false_positive_rate"] == pytest.approx(0.01, rel=0.5)
+
+
+def test_names_match_ignoring_case_separators_and_domains(bloom):
+    taken, _ = bloom
+    assert normalize_name("https://www.CloudStorage.com") == "cloudstorage"
+    assert "cloud_storage" in taken and "CLOUDSTORAGE.net" in taken
+    assert "Brewly" in taken
+    assert "" not in taken and "--" not in taken
+    assert taken.filter(["Brewly", "cloud storage"]) == []
+    assert taken.taken(["Brewly", "brewly", "Brewly"]) == ["Brewly", "brewly"]
+
+
+def test_non_ascii_names_are_kept_and_stay_distinct(tmp_path):
+    assert normalize_name("Café") == normalize_name("CAFÉ") == normalize_name("Ｃａｆé")
+    assert normalize_name("Café") not in ("caf", "cafe")
+    assert normalize_name("三菱 商事") == "三菱商事"
+    assert normalize_name("Straße") == normalize_name("STRASSE")
+
+    path = str(tmp_path / "taken.bloom")
+    assert build_filter(["Café", "Сбербанк", "三菱商事", "https://www.müller.de"], path, expected=4) == 4
+    taken = TakenNameFilter(path)
+    assert all(name in taken for name in ("café", "СБЕРБАНК", "三菱-商事", "Müller"))
+    assert "Caf" not in taken and "Cafe" not in taken and "Muller" not in taken
+
+
+def test_rejects_files_that_are_not_a_filter(tmp_path):
+    path = tmp_path / "taken.bloom"
+    path.write_bytes(b"JUNK" + bytes(32))
+    with pytest.raises(ValueError):
+        TakenNameFilter(str(path))
+
+
+def test_cli_builds_from_a_names_file(tmp_path, capsys):
+    names = tmp_path / "names.txt"
+    names.write_text("# existing brands\nBrewly,coffee\n\nsteepwise.com\n", encoding="utf-8")
+    index = tmp_path / "taken.bloom"
+
+    main(["build", str(names), str(index)])
+
+    taken = TakenNameFilter(str(index))
+    assert taken.count == 2
+    assert "brewly" in taken and "Steepwise" in taken
+    assert "Added 2 names" in capsys.readouterr().out
+
+
+def test_extract_candidates_reads_list_items():
+    text = "Ideas:\n- CloudNest, SkyVault: storage brands\n2. **Brewly** - coffee\nnot a list item\n- a name that is far too long"
+    assert extract_candidates(text) == ["CloudNest", "SkyVault", "Brewly"]
+
+
+def test_creativity_suggestions_drop_taken_names(bloom, monkeypatch):
+    taken, _ = bloom
+    topic = "cloud storage"
+    plain = CreativityTool(cache_size=0).get_creative_suggestions(topic, count=10)
+    assert "CloudStorage" in plain["combinations"]
+
+    monkeypatch.setattr(taken_names, "_filter", taken)
+    monkeypatch.setattr(taken_names, "_filter_loaded", True)
+    filtered = CreativityTool(cache_size=0).get_creative_suggestions(topic, count=10)
+    names = [name for items in filtered.values() for name in items]
+    assert names and not taken.taken(names)
+    assert "CloudStorage" not in filtered["combinations"]
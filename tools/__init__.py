@@ -1,10 +1,14 @@
-from .web_search_tool import web_search_tool, get_web_search_tool
+import importlib
+
 from .memory_tool import memory_tool, memory_store, MemoryTool, MemoryStore
 from .creativity_tool import creativity_tool, CreativityTool
+from .search_cache import search_cache, SearchCache
 
 __all__ = [
     'web_search_tool',
     'get_web_search_tool',
+    'search_cache',
+    'SearchCache',
     'memory_tool',
     'memory_store',
     'MemoryTool',
@@ -12,3 +16,14 @@ __all__ = [
     'creativity_tool',
     'CreativityTool'
 ]
+
+
+def __getattr__(name):
+    # The search tool imports crewai and crewai_tools, so load it on first use
+    if name in ('web_search_tool', 'get_web_search_tool'):
+        module = importlib.import_module('.web_search_tool', __name__)
+        # Importing the submodule binds it as tools.web_search_tool; rebind the tool instance
+        globals()['web_search_tool'] = module.web_search_tool
+        globals()['get_web_search_tool'] = module.get_web_search_tool
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
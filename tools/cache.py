@@ -0,0 +1,188 @@
+"""
+Cache backends with TTL expiry and LRU size bounds
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheBackend(ABC):
+    """Interface for key/value caches used by the API and tools"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if needed"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a single entry"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries, possibly including expired ones not yet purged"""
+
+
+class InMemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    SQLite-backed LRU cache with per-entry TTL
+
+    Values must be JSON serializable. The cache file survives restarts and
+    can be shared by several workers on the same host.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 3600, max_entries: int = 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pid = None
+        self._connection = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Open the connection on first use in each process
+
+        Connections must not cross fork(), so a preloaded parent and its
+        workers each open their own.
+        """
+        if self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed_at)")
+            self._connection = conn
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def create_cache_backend(
+    backend: str,
+    ttl_seconds: float = 3600,
+    max_entries: int = 1024,
+    path: str = None
+) -> Optional[CacheBackend]:
+    """
+    Create a cache backend by name
+
+    Args:
+        backend: "memory", "sqlite" or "none"
+        ttl_seconds: Time to live for each entry
+        max_entries: Maximum number of entries before LRU eviction
+        path: SQLite file path (sqlite backend only)
+
+    Returns:
+        CacheBackend instance, or None if caching is disabled
+    """
+    backend = (backend or "none").lower()
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return InMemoryCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("SQLite cache backend requires a path")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return SQLiteCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+    raise ValueError(f"Unknown cache backend: {backend}")
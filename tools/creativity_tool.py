@@ -1,14 +1,173 @@
 """
 Creativity tool for generating creative word variations and suggestions
 """
-from typing import List, Dict, Any
-import random
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+from itertools import islice
+from tools.cache import InMemoryCache
+from tools.lexicon import Lexicon, get_lexicon
+from tools.name_scoring import get_name_scorer
+from tools.taken_names import get_taken_filter
+import functools
+import hashlib
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:  # optional; batch affix selection falls back to pure Python
+    np = None
+
+SEPARATORS = re.compile(r"[\s_\-.]+")
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+PREFIX_PICKS = 5
+SUFFIX_PICKS = 5
+MIXES = 3
+
+
+def derive_seed(*parts: Any) -> int:
+    """
+    Derive a stable 64-bit seed from the given parts
+    
+    Unlike hash(), the result is the same in every process and on every run.
+    """
+    payload = "\x1f".join(str(part) for part in parts)
+    return int.from_bytes(hashlib.sha256(payload.encode("utf-8")).digest()[:8], "big")
+
+
+def _mix64(value: int) -> int:
+    """splitmix64 finalizer: scramble a 64-bit integer"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+
+def _draw(seed: int, stream: int, index: int) -> int:
+    """The index-th pseudo-random 64-bit value of a stream for a seed"""
+    return _mix64((seed + (stream * 64 + index + 1) * GOLDEN_GAMMA) & MASK64)
+
+
+def select_affixes(seed: int, prefixes: int, suffixes: int) -> tuple:
+    """
+    Pick prefix and suffix positions for one word seed
+    
+    Every pick is a pure function of the seed (counter-based splitmix64), so
+    select_affixes_many() can compute the same picks for many seeds at once.
+    
+    Returns:
+        (sampled prefix positions, sampled suffix positions, prefix positions
+        for mixes, suffix positions for mixes, suffix position for the root)
+    """
+    prefix_keys = [_draw(seed, 0, i) for i in range(prefixes)]
+    suffix_keys = [_draw(seed, 1, i) for i in range(suffixes)]
+    return (
+        sorted(range(prefixes), key=prefix_keys.__getitem__)[:PREFIX_PICKS],
+        sorted(range(suffixes), key=suffix_keys.__getitem__)[:SUFFIX_PICKS],
+        [_draw(seed, 2, i) % prefixes for i in range(MIXES)],
+        [_draw(seed, 3, i) % suffixes for i in range(MIXES)],
+        _draw(seed, 4, 0) % suffixes
+    )
+
+
+def select_affixes_many(seeds: List[int], prefixes: int, suffixes: int) -> List[tuple]:
+    """select_affixes() for many seeds, vectorized with NumPy when it is installed"""
+    if np is None or not seeds:
+        return [select_affixes(seed, prefixes, suffixes) for seed in seeds]
+    
+    column = np.array(seeds, dtype=np.uint64)[:, None]
+    
+    def draws(stream: int, width: int):
+        # uint64 arithmetic wraps modulo 2**64, matching the masked Python version
+        value = column + (np.arange(width, dtype=np.uint64) + np.uint64(stream * 64 + 1)) * np.uint64(GOLDEN_GAMMA)
+        value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return value ^ (value >> np.uint64(31))
+    
+    return list(zip(
+        np.argsort(draws(0, prefixes), axis=1, kind="stable")[:, :PREFIX_PICKS].tolist(),
+        np.argsort(draws(1, suffixes), axis=1, kind="stable")[:, :SUFFIX_PICKS].tolist(),
+        (draws(2, MIXES) % np.uint64(prefixes)).tolist(),
+        (draws(3, MIXES) % np.uint64(suffixes)).tolist(),
+        (draws(4, 1)[:, 0] % np.uint64(suffixes)).tolist()
+    ))
+
+
+def normalization_key(name: str, case_insensitive: bool = False, separator_insensitive: bool = False) -> str:
+    """
+    Key under which two suggestions count as the same name
+    
+    With both options "CloudStorage", "cloud_storage" and "cloud-storage"
+    share the key "cloudstorage"; with neither, only identical strings match.
+    """
+    if separator_insensitive:
+        name = SEPARATORS.sub("", name)
+    if case_insensitive:
+        name = name.casefold()
+    return name
+
+
+def unique(
+    candidates: Iterable[str],
+    key: Callable[[str], str] = None,
+    seen: Set[str] = None
+) -> Iterator[str]:
+    """
+    Yield candidates in order, skipping ones already seen
+    
+    Args:
+        candidates: Candidate stream
+        key: Maps a candidate to the value compared for uniqueness
+        seen: Keys to treat as already seen; updated in place, so several
+            streams can share one dedup structure
+    """
+    seen = set() if seen is None else seen
+    for candidate in candidates:
+        marker = key(candidate) if key is not None else candidate
+        if marker not in seen:
+            seen.add(marker)
+            yield candidate
+
+
+def take_unique(
+    candidates: Iterable[str],
+    count: int,
+    key: Callable[[str], str] = None,
+    seen: Set[str] = None
+) -> List[str]:
+    """Take the first count unique candidates, consuming no more of the stream than needed"""
+    return list(islice(unique(candidates, key=key, seen=seen), max(count, 0)))
 
 
 class CreativityTool:
-    """Tool for creative word generation and variations"""
+    """
+    Tool for creative word generation and variations
+    
+    Output is reproducible: affix choices are a pure function of a seed
+    derived from the word and an optional seed, and candidates keep their
+    generation order. get_creative_suggestions() results are memoized in an LRU cache
+    keyed by (topic, count, seed) and the uniqueness options.
+    
+    Combinations and blends are produced by lazy generators and consumed only
+    until enough unique candidates are found, so long topics don't pay for
+    every pair.
     
-    def __init__(self):
+    get_creative_suggestions_many() handles a list of topics together: words
+    are tokenized once, affix choices for all distinct words are drawn in one
+    vectorized step, and per-word variations and styles are shared between
+    topics. It returns exactly what per-topic calls would.
+    
+    A Lexicon of synonyms, related terms and roots expands topics beyond
+    their literal words; it is mapped on first use. When a taken-name filter
+    is configured, names that already exist are dropped before results are
+    returned or cached.
+    """
+    
+    def __init__(self, cache_size: int = 1024, lexicon: Lexicon = None):
+        self._lexicon = lexicon
+        self.cache = InMemoryCache(ttl_seconds=float("inf"), max_entries=cache_size) if cache_size > 0 else None
+        self.hits = 0
+        self.misses = 0
+        
         # Word transformation patterns
         self.prefixes = [
             'ultra', 'mega', 'super', 'hyper', 'neo', 'pro', 'meta', 'elite',
@@ -27,42 +186,73 @@ class CreativityTool:
             'professional': ['expert', 'specialist', 'consulting', 'solutions', 'enterprise'],
             'innovative': ['next-gen', 'cutting-edge', 'revolutionary', 'advanced', 'future']
         }
+        
+        # Capitalized forms, precomputed once instead of per word
+        self._prefix_titles = [prefix.capitalize() for prefix in self.prefixes]
+        self._suffix_titles = [suffix.capitalize() for suffix in self.suffixes]
+        self._style_tables = {
+            style: [(word, word.capitalize()) for word in words]
+            for style, words in self.word_styles.items()
+        }
     
-    def generate_variations(self, base_word: str, count: int = 10) -> List[str]:
+    @property
+    def lexicon(self) -> Lexicon:
+        if self._lexicon is None:
+            self._lexicon = get_lexicon()
+        return self._lexicon
+    
+    def generate_variations(self, base_word: str, count: int = 10, seed: Optional[int] = None) -> List[str]:
         """
         Generate creative variations of a base word
         
         Args:
             base_word: The base word to create variations from
             count: Number of variations to generate
+            seed: Optional seed; the same word and seed give the same variations
         
         Returns:
             List of word variations
         """
-        variations = set()
+        selection = select_affixes(derive_seed(base_word, seed), len(self.prefixes), len(self.suffixes))
+        return self._variations_from(base_word, selection)[:count]
+    
+    def _variations_from(self, base_word: str, selection: tuple) -> List[str]:
+        """Build all variations of a word from its affix selection"""
+        prefix_picks, suffix_picks, mix_prefixes, mix_suffixes, root_suffix = selection
+        # dict keeps insertion order, so truncation is stable
+        variations = {}
         base_lower = base_word.lower()
+        base_title = base_word.capitalize()
         
         # Add original
-        variations.add(base_word)
-        variations.add(base_word.capitalize())
+        variations[base_word] = None
+        variations[base_title] = None
+        
+        # Add synonyms from the lexicon
+        entry = self.lexicon.lookup(base_word)
+        for synonym in entry.synonyms[:2] if entry is not None else ():
+            variations[synonym.capitalize()] = None
         
         # Add prefix variations
-        for prefix in random.sample(self.prefixes, min(5, len(self.prefixes))):
-            variations.add(f"{prefix}{base_lower}")
-            variations.add(f"{prefix.capitalize()}{base_word.capitalize()}")
+        for i in prefix_picks:
+            variations[f"{self.prefixes[i]}{base_lower}"] = None
+            variations[f"{self._prefix_titles[i]}{base_title}"] = None
         
         # Add suffix variations
-        for suffix in random.sample(self.suffixes, min(5, len(self.suffixes))):
-            variations.add(f"{base_lower}{suffix}")
-            variations.add(f"{base_word.capitalize()}{suffix.capitalize()}")
+        for i in suffix_picks:
+            variations[f"{base_lower}{self.suffixes[i]}"] = None
+            variations[f"{base_title}{self._suffix_titles[i]}"] = None
         
         # Mix prefix and suffix
-        for _ in range(3):
-            prefix = random.choice(self.prefixes)
-            suffix = random.choice(self.suffixes)
-            variations.add(f"{prefix}{base_lower}{suffix}")
+        for i, j in zip(mix_prefixes, mix_suffixes):
+            variations[f"{self.prefixes[i]}{base_lower}{self.suffixes[j]}"] = None
+        
+        # Suffix the morphological root, e.g. "solution" -> "solveify"
+        root = entry.root if entry is not None else base_lower
+        if root != base_lower:
+            variations[f"{root}{self.suffixes[root_suffix]}"] = None
         
-        return list(variations)[:count]
+        return list(variations)
     
     def suggest_by_style(self, base_word: str, style: str = 'modern') -> List[str]:
         """
@@ -76,11 +266,12 @@ class CreativityTool:
             List of styled suggestions
         """
         suggestions = []
-        style_words = self.word_styles.get(style.lower(), self.word_styles['modern'])
+        style_words = self._style_tables.get(style.lower(), self._style_tables['modern'])
+        base_title = base_word.capitalize()
         
-        for word in style_words:
-            suggestions.append(f"{word.capitalize()}{base_word.capitalize()}")
-            suggestions.append(f"{base_word.capitalize()}{word.capitalize()}")
+        for word, word_title in style_words:
+            suggestions.append(f"{word_title}{base_title}")
+            suggestions.append(f"{base_title}{word_title}")
             suggestions.append(f"{word}{base_word}".title())
         
         return suggestions
@@ -99,23 +290,35 @@ class CreativityTool:
         if len(words) < 2:
             return words
         
-        combinations = set()
+        # Ordered dedup keeps the result stable between calls
+        return take_unique(self.iter_combinations(words), max_combinations)
+    
+    def iter_combinations(self, words: List[str]) -> Iterator[str]:
+        """
+        Lazily yield combinations of words
         
+        Pairs come first, then consecutive triples, then each word paired
+        with lexicon terms related to the other words.
+        """
         # Direct combinations
         for i, word1 in enumerate(words):
-            for word2 in words[i+1:]:
-                combinations.add(f"{word1.capitalize()}{word2.capitalize()}")
-                combinations.add(f"{word1}{word2}".title())
-                combinations.add(f"{word1}_{word2}")
-                combinations.add(f"{word1}-{word2}")
+            for word2 in islice(words, i + 1, None):
+                yield f"{word1.capitalize()}{word2.capitalize()}"
+                yield f"{word1}{word2}".title()
+                yield f"{word1}_{word2}"
+                yield f"{word1}-{word2}"
         
         # Triple combinations
-        if len(words) >= 3:
-            for i in range(len(words) - 2):
-                combo = f"{words[i].capitalize()}{words[i+1].capitalize()}{words[i+2].capitalize()}"
-                combinations.add(combo)
-        
-        return list(combinations)[:max_combinations]
+        for i in range(len(words) - 2):
+            yield f"{words[i].capitalize()}{words[i+1].capitalize()}{words[i+2].capitalize()}"
+        
+        # Expanded combinations
+        for i, word in enumerate(words):
+            for term in self.lexicon.expand(word, 3):
+                for j, other in enumerate(words):
+                    if j != i:
+                        yield f"{other.capitalize()}{term.capitalize()}"
+                        yield f"{term.capitalize()}{other.capitalize()}"
     
     def acronym_generator(self, phrase: str) -> Dict[str, Any]:
         """
@@ -152,48 +355,219 @@ class CreativityTool:
             ]
         }
     
-    def blend_words(self, word1: str, word2: str) -> List[str]:
+    def blend_words(self, word1: str, word2: str, count: int = 10) -> List[str]:
         """
         Create portmanteau/blended words from two words
         
         Args:
             word1: First word
             word2: Second word
+            count: Maximum number of blends
         
         Returns:
             List of blended words
         """
-        blends = []
+        # Remove duplicates in order and stop at a limited set
+        return take_unique(self.iter_blends(word1, word2), count)
+    
+    def iter_blends(self, word1: str, word2: str, expand: bool = True) -> Iterator[str]:
+        """
+        Lazily yield blends of two words
+        
+        Blends of the words themselves come first, then (with expand) blends
+        with lexicon terms related to either word.
+        """
         w1_lower = word1.lower()
         w2_lower = word2.lower()
         
         # Take start of first word and end of second
         for i in range(2, len(w1_lower)):
             for j in range(1, len(w2_lower) - 1):
-                blend = w1_lower[:i] + w2_lower[j:]
-                blends.append(blend.capitalize())
+                yield (w1_lower[:i] + w2_lower[j:]).capitalize()
         
         # Take start of second word and end of first
         for i in range(2, len(w2_lower)):
             for j in range(1, len(w1_lower) - 1):
-                blend = w2_lower[:i] + w1_lower[j:]
-                blends.append(blend.capitalize())
+                yield (w2_lower[:i] + w1_lower[j:]).capitalize()
         
-        # Remove duplicates and return limited set
-        return list(set(blends))[:10]
+        if not expand:
+            return
+        
+        # Expanded blends
+        for term in self.lexicon.expand(word2, 3):
+            yield from self.iter_blends(word1, term, expand=False)
+        for term in self.lexicon.expand(word1, 3):
+            yield from self.iter_blends(term, word2, expand=False)
     
-    def get_creative_suggestions(self, topic: str, count: int = 20) -> Dict[str, List[str]]:
+    def get_creative_suggestions(
+        self,
+        topic: str,
+        count: int = 20,
+        seed: Optional[int] = None,
+        case_insensitive: bool = False,
+        separator_insensitive: bool = False
+    ) -> Dict[str, List[str]]:
         """
         Get comprehensive creative suggestions for a topic
         
+        Each name appears at most once across all categories, in the first
+        category that produces it; categories backfill from their generators
+        instead of carrying duplicates. Results are reproducible for the same
+        arguments and are served from the LRU cache when available.
+        
         Args:
             topic: The topic or description
             count: Number of suggestions per category
+            seed: Optional seed to get a different reproducible set
+            case_insensitive: Treat names differing only in case as duplicates
+            separator_insensitive: Treat names differing only in spaces, "_",
+                "-" or "." as duplicates
         
         Returns:
             Dictionary with categorized suggestions
         """
-        words = topic.split()
+        options = (case_insensitive, separator_insensitive)
+        if self.cache is None:
+            return self._build_suggestions(topic, count, seed, *options)
+        
+        key = self._cache_key(topic, count, seed, *options)
+        suggestions = self.cache.get(key)
+        if suggestions is None:
+            self.misses += 1
+            suggestions = self._build_suggestions(topic, count, seed, *options)
+            self.cache.set(key, suggestions)
+        else:
+            self.hits += 1
+        # Callers get their own lists, so the cached result can't be mutated
+        return {category: list(items) for category, items in suggestions.items()}
+    
+    def get_creative_suggestions_many(
+        self,
+        topics: List[str],
+        count: int = 20,
+        seed: Optional[int] = None,
+        case_insensitive: bool = False,
+        separator_insensitive: bool = False
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Get creative suggestions for many topics at once
+        
+        Takes the same options as get_creative_suggestions and returns the
+        same results, one per topic in input order, but shares tokenization,
+        affix selection and per-word work across the whole batch.
+        
+        Args:
+            topics: Topics or descriptions
+            count: Number of suggestions per category
+            seed: Optional seed to get a different reproducible set
+            case_insensitive: Treat names differing only in case as duplicates
+            separator_insensitive: Treat names differing only in separators as duplicates
+        
+        Returns:
+            List of categorized suggestion dictionaries
+        """
+        options = (case_insensitive, separator_insensitive)
+        # Shared tokenization; repeated topics are computed once
+        tokenized = {topic: topic.split() for topic in dict.fromkeys(topics)}
+        results: Dict[str, Dict[str, List[str]]] = {}
+        
+        pending = []
+        for topic in tokenized:
+            cached = self.cache.get(self._cache_key(topic, count, seed, *options)) if self.cache is not None else None
+            if cached is not None:
+                self.hits += 1
+                results[topic] = cached
+            else:
+                pending.append(topic)
+        
+        # Draw affix choices for every distinct word in one step
+        words = list(dict.fromkeys(word for topic in pending for word in tokenized[topic]))
+        selections = dict(zip(words, select_affixes_many(
+            [derive_seed(word, seed) for word in words],
+            len(self.prefixes),
+            len(self.suffixes)
+        )))
+        
+        @functools.lru_cache(maxsize=None)
+        def variations_for(word: str) -> List[str]:
+            return self._variations_from(word, selections[word])
+        
+        @functools.lru_cache(maxsize=None)
+        def styled_for(word: str, style: str) -> List[str]:
+            return self.suggest_by_style(word, style)
+        
+        for topic in pending:
+            suggestions = self._build_suggestions(
+                topic, count, seed, *options,
+                words=tokenized[topic],
+                variations_for=variations_for,
+                styled_for=styled_for
+            )
+            if self.cache is not None:
+                self.misses += 1
+                self.cache.set(self._cache_key(topic, count, seed, *options), suggestions)
+            results[topic] = suggestions
+        
+        return [
+            {category: list(items) for category, items in results[topic].items()}
+            for topic in topics
+        ]
+    
+    @staticmethod
+    def _cache_key(topic: str, count: int, seed: Optional[int], case_insensitive: bool, separator_insensitive: bool) -> str:
+        return f"{count}\x1f{seed}\x1f{case_insensitive:d}{separator_insensitive:d}\x1f{topic}"
+    
+    def rank_suggestions(self, suggestions: Dict[str, List[str]], top_k: int = 5) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Rank each category's suggestions by name quality
+        
+        Args:
+            suggestions: Categorized suggestions from get_creative_suggestions
+            top_k: Number of best candidates to keep per category
+        
+        Returns:
+            Dictionary of (suggestion, score) lists, best first
+        """
+        scorer = get_name_scorer()
+        return {
+            category: scorer.top_k(items, top_k)
+            for category, items in suggestions.items()
+        }
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get memoization hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.cache is not None,
+            "entries": len(self.cache) if self.cache is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+    
+    def _build_suggestions(
+        self,
+        topic: str,
+        count: int,
+        seed: Optional[int],
+        case_insensitive: bool = False,
+        separator_insensitive: bool = False,
+        words: List[str] = None,
+        variations_for: Callable[[str], List[str]] = None,
+        styled_for: Callable[[str, str], List[str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Compute suggestions for a topic without the cache
+        
+        The batch path passes pre-split words and memoized per-word
+        variation and style builders; by default they are computed here.
+        """
+        if words is None:
+            words = topic.split()
+        if variations_for is None:
+            variations_for = functools.partial(self.generate_variations, count=len(self.prefixes) + len(self.suffixes), seed=seed)
+        if styled_for is None:
+            styled_for = self.suggest_by_style
         
         suggestions = {
             "variations": [],
@@ -203,39 +577,57 @@ class CreativityTool:
             "blends": []
         }
         
-        # Generate variations for each word
-        for word in words:
-            suggestions["variations"].extend(self.generate_variations(word, count // len(words) if words else count))
+        # One dedup structure shared by all categories; taken names never enter it
+        seen: Set[str] = set()
+        key = functools.partial(
+            normalization_key,
+            case_insensitive=case_insensitive,
+            separator_insensitive=separator_insensitive
+        )
+        taken_filter = get_taken_filter()
+        
+        def pick(candidates: Iterable[str], limit: int) -> List[str]:
+            if taken_filter is not None:
+                candidates = (candidate for candidate in candidates if candidate not in taken_filter)
+            return take_unique(candidates, limit, key=key, seen=seen)
+        
+        # Generate variations for each word, until enough are collected
+        per_word = count // len(words) if words else count
+        if per_word:
+            for word in words:
+                if len(suggestions["variations"]) >= count:
+                    break
+                suggestions["variations"].extend(pick(variations_for(word), per_word))
         
         # Combinations
         if len(words) > 1:
-            suggestions["combinations"] = self.combine_words(words, count)
+            suggestions["combinations"] = pick(self.iter_combinations(words), count)
         
         # Styled suggestions
         for style in ['modern', 'professional', 'innovative']:
             for word in words[:2]:  # Use first two words
-                suggestions["styled"].extend(self.suggest_by_style(word, style)[:3])
+                suggestions["styled"].extend(pick(styled_for(word, style), 3))
         
         # Acronyms if phrase
         if len(words) > 1:
             acronym_result = self.acronym_generator(topic)
             if "error" not in acronym_result:
-                suggestions["acronyms"] = [
+                suggestions["acronyms"] = pick([
                     acronym_result["simple"],
                     acronym_result["two_letter"],
                     acronym_result["consonants"]
-                ] + acronym_result["variations"]
+                ] + acronym_result["variations"], count)
         
         # Blends for two main words
         if len(words) >= 2:
-            suggestions["blends"] = self.blend_words(words[0], words[1])
+            suggestions["blends"] = pick(self.iter_blends(words[0], words[1]), min(count, 10))
         
         # Limit results
-        for key in suggestions:
-            suggestions[key] = suggestions[key][:count]
+        for category in suggestions:
+            suggestions[category] = suggestions[category][:count]
         
         return suggestions
 
 
 # Pre-configured creativity tool instance
-creativity_tool = CreativityTool()
+creativity_tool = CreativityTool(cache_size=int(os.getenv("CREATIVITY_CACHE_SIZE", 1024)))
@@ -0,0 +1,242 @@
+"""
+Lexicon of synonyms, related terms and roots backed by a memory-mapped index
+
+The source is a tab-separated file (tools/data/lexicon.tsv) with one word
+per line: word, comma-separated synonyms, comma-separated related terms and
+its morphological root (empty when the word is its own root). It is compiled
+into a binary index holding a sorted array of fixed-size records plus a
+string blob, and the index header records a digest of the source it was
+built from. Lookups binary-search the
+records directly in the mmap, so loading only maps the file and every worker
+on a host shares the same page-cache pages.
+
+Build the index offline with:
+    python -m tools.lexicon build [source.tsv] [index path]
+"""
+from typing import List, NamedTuple, Optional, Tuple
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(__file__), "data", "lexicon.tsv")
+DEFAULT_INDEX_PATH = ".cache/lexicon.idx"
+
+MAGIC = b"LEX2"
+# magic, record count, source digest
+HEADER = struct.Struct("<4sI16s")
+# entry offset in the blob, key length, entry length
+RECORD = struct.Struct("<IHI")
+# Suffixes tried, in order, when a word isn't in the lexicon
+SUFFIXES = (("ies", "y"), ("ing", ""), ("ers", ""), ("er", ""), ("ed", ""), ("es", ""), ("ly", ""), ("s", ""))
+
+
+class LexiconEntry(NamedTuple):
+    """Synonyms, related terms and morphological root of a word"""
+    word: str
+    synonyms: Tuple[str, ...]
+    related: Tuple[str, ...]
+    root: str
+
+
+def _split(field: str) -> Tuple[str, ...]:
+    return tuple(term.strip().lower() for term in field.split(",") if term.strip())
+
+
+def read_source(path: str) -> List[LexiconEntry]:
+    """Parse a lexicon TSV, skipping blank and comment lines"""
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t") + ["", "", ""]
+            word = fields[0].strip().lower()
+            entries[word] = LexiconEntry(word, _split(fields[1]), _split(fields[2]), fields[3].strip().lower() or word)
+    return list(entries.values())
+
+
+def source_digest(path: str) -> bytes:
+    """Digest of a lexicon TSV's contents, stored in the index to detect a stale build"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def compile_lexicon(source: str, path: str) -> int:
+    """
+    Compile a lexicon TSV into a binary index
+
+    The file is written to a temporary name and moved into place, so workers
+    never map a half-written index.
+
+    Args:
+        source: Lexicon TSV path
+        path: Output index path
+
+    Returns:
+        Number of entries written
+    """
+    entries = sorted(read_source(source), key=lambda entry: entry.word.encode("utf-8"))
+    records = bytearray()
+    blob = bytearray()
+    for entry in entries:
+        key = entry.word.encode("utf-8")
+        payload = "\t".join((",".join(entry.synonyms), ",".join(entry.related), entry.root)).encode("utf-8")
+        records += RECORD.pack(len(blob), len(key), len(key) + len(payload))
+        blob += key + payload
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries), source_digest(source)))
+        f.write(records)
+        f.write(blob)
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+class Lexicon:
+    """Interface for word expansion sources; the base class knows no words"""
+
+    def lookup(self, word: str) -> Optional[LexiconEntry]:
+        """Return the entry for a word or its stem, or None"""
+        return None
+
+    def expand(self, word: str, limit: int = 5) -> List[str]:
+        """Synonyms, then related terms of a word, without the word itself"""
+        entry = self.lookup(word)
+        if entry is None:
+            return []
+        word = word.lower()
+        terms = [term for term in dict.fromkeys(entry.synonyms + entry.related) if term != word]
+        return terms[:limit]
+
+    def root(self, word: str) -> str:
+        """Morphological root of a word, or the word itself if unknown"""
+        entry = self.lookup(word)
+        return entry.root if entry is not None else word.lower()
+
+    def __len__(self) -> int:
+        return 0
+
+
+class MmapLexicon(Lexicon):
+    """Read-only lexicon that binary-searches a compiled index in place"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"Not a lexicon index: {path}")
+        magic, self._count, self.source_digest = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a lexicon index: {path}")
+        self._blob = HEADER.size + self._count * RECORD.size
+
+    def _record(self, position: int) -> Tuple[int, int, int]:
+        offset, key_length, length = RECORD.unpack_from(self._map, HEADER.size + position * RECORD.size)
+        return self._blob + offset, key_length, length
+
+    def _find(self, key: bytes) -> Optional[LexiconEntry]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start, key_length, length = self._record(middle)
+            current = self._map[start:start + key_length]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                synonyms, related, root = self._map[start + key_length:start + length].decode("utf-8").split("\t")
+                return LexiconEntry(key.decode("utf-8"), _split(synonyms), _split(related), root)
+        return None
+
+    def lookup(self, word: str) -> Optional[LexiconEntry]:
+        word = word.strip().lower()
+        entry = self._find(word.encode("utf-8"))
+        if entry is not None:
+            return entry
+        for suffix, replacement in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                entry = self._find((word[:-len(suffix)] + replacement).encode("utf-8"))
+                if entry is not None:
+                    return entry
+        return None
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def load_lexicon(source: str = DEFAULT_SOURCE, path: str = DEFAULT_INDEX_PATH) -> Lexicon:
+    """
+    Map a compiled lexicon index, compiling it first if missing or stale
+
+    The index is stale when the source's digest differs from the one stored
+    in it, or it was written in an older format. Comparing contents rather
+    than mtimes also catches edits within the filesystem's timestamp
+    granularity and sources checked out with an older mtime. Without the
+    source, an existing index is used as is.
+
+    Args:
+        source: Lexicon TSV the index is built from
+        path: Compiled index path
+
+    Returns:
+        MmapLexicon over the index
+    """
+    if os.path.exists(source):
+        try:
+            lexicon = MmapLexicon(path)
+            if lexicon.source_digest == source_digest(source):
+                return lexicon
+        except (OSError, ValueError):
+            pass
+        compile_lexicon(source, path)
+    return MmapLexicon(path)
+
+
+_lexicon: Optional[Lexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon() -> Lexicon:
+    """
+    Get the shared lexicon, mapping it on first use
+
+    LEXICON_SOURCE: Lexicon TSV (default: tools/data/lexicon.tsv; "none" disables expansion)
+    LEXICON_INDEX_PATH: Compiled index path (default: .cache/lexicon.idx)
+    """
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                source = os.getenv("LEXICON_SOURCE", DEFAULT_SOURCE)
+                if source.lower() == "none":
+                    _lexicon = Lexicon()
+                else:
+                    _lexicon = load_lexicon(source, os.getenv("LEXICON_INDEX_PATH", DEFAULT_INDEX_PATH))
+    return _lexicon
+
+
+def main(argv: List[str]) -> None:
+    if not argv or argv[0] != "build":
+        print("Usage: python -m tools.lexicon build [source.tsv] [index path]")
+        sys.exit(2)
+    source = argv[1] if len(argv) > 1 else os.getenv("LEXICON_SOURCE", DEFAULT_SOURCE)
+    path = argv[2] if len(argv) > 2 else os.getenv("LEXICON_INDEX_PATH", DEFAULT_INDEX_PATH)
+    count = compile_lexicon(source, path)
+    print(f"Compiled {count} entries from {source} into {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
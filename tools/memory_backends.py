@@ -0,0 +1,728 @@
+"""
+Storage backends for the MemoryStore
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict, deque
+import atexit
+import bisect
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from tools.memory_index import MemoryIndex, query_tokens
+
+
+class MemoryBackend(ABC):
+    """
+    Interface for MemoryStore storage
+
+    Entries are dictionaries with 'timestamp' and 'data' keys, stored in
+    insertion order per key.
+    """
+    
+    @abstractmethod
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Append an entry to a key, stamping its 'timestamp'
+        
+        The timestamp is taken at the point the entry gets its place in the
+        key's order, so timestamps never decrease within a key even when
+        threads save concurrently, and since-filters can rely on it.
+        """
+    
+    @abstractmethod
+    def retrieve(self, key: str) -> List[Dict[str, Any]]:
+        """Return all entries for a key, oldest first"""
+    
+    @abstractmethod
+    def retrieve_latest(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent entry for a key"""
+    
+    @abstractmethod
+    def clear(self, key: str = None) -> None:
+        """Remove a key, or everything if key is None"""
+    
+    @abstractmethod
+    def get_all_keys(self) -> List[str]:
+        """Return all keys"""
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return footprint, limits and eviction counters"""
+    
+    @abstractmethod
+    def retrieve_page(
+        self,
+        key: str,
+        after_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 100,
+        since: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], bool, int]:
+        """
+        Return one page of entries for a key, oldest first
+        
+        Args:
+            key: Key to read
+            after_id: Only entries with a larger id (cursor from a previous page)
+            offset: Entries to skip after applying after_id and since
+            limit: Maximum entries to return
+            since: Only entries saved at or after this time
+        
+        Returns:
+            (entries with their "id" added, whether more entries follow,
+            number of entries matching since)
+        """
+    
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        creativity_level: Optional[str] = None,
+        key: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank entries whose topic matches the query
+        
+        Args:
+            query: Free text matched against the "topic" of entry data
+            creativity_level: Only entries saved with this creativity level
+            key: Only entries stored under this key
+            limit: Maximum number of matches
+        
+        Returns:
+            Entries with "key", "id" and "score" added, best match first
+        """
+    
+    @abstractmethod
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return a copy of all keys and their entries"""
+    
+    def flush(self) -> None:
+        """Wait for buffered writes to be persisted"""
+    
+    def close(self) -> None:
+        """Flush and release resources"""
+
+
+def _stamped(entry: Dict[str, Any], moment: datetime = None) -> Dict[str, Any]:
+    """Entry with 'timestamp' set to moment (default: now), first in key order"""
+    return {'timestamp': (moment or datetime.now()).isoformat(), **entry}
+
+
+class InMemoryBackend(MemoryBackend):
+    """
+    Process-local storage with bounded growth
+    
+    Each key holds a ring buffer of at most max_entries_per_key entries.
+    When the global entry or byte budget is exceeded, whole keys are evicted
+    in least-recently-used order; if only the key being written is left, its
+    oldest entries are dropped instead. Entries older than ttl_seconds expire.
+    A limit of None disables that bound.
+    
+    One lock guards all keys. Every operation holding it is a few dictionary
+    and deque steps, so under the GIL splitting it into per-key shards
+    measured no faster (see benchmarks/bench_memory_concurrency.py). Reads
+    return snapshots, so callers never see later appends or evictions. A
+    MemoryIndex follows every save and eviction to serve search().
+    """
+    
+    def __init__(
+        self,
+        max_entries_per_key: Optional[int] = None,
+        max_total_entries: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.max_entries_per_key = max_entries_per_key
+        self.max_total_entries = max_total_entries
+        self.max_total_bytes = max_total_bytes
+        self.ttl_seconds = ttl_seconds
+        self.index = MemoryIndex()
+        self._lock = threading.Lock()
+        # key -> deque of (entry, size in bytes, monotonic creation time, id), LRU order
+        self._keys: "OrderedDict[str, deque]" = OrderedDict()
+        self._entries = 0
+        self._bytes = 0
+        self._ids = itertools.count(1)
+        self.evicted_entries = 0
+        self.evicted_keys = 0
+        self.expired_entries = 0
+    
+    def _drop_oldest(self, key: str) -> None:
+        _, size, _, entry_id = self._keys[key].popleft()
+        self._entries -= 1
+        self._bytes -= size
+        self.index.remove(entry_id)
+    
+    def _drop_key(self, key: str) -> None:
+        entries = self._keys.pop(key)
+        self._entries -= len(entries)
+        self._bytes -= sum(size for _, size, _, _ in entries)
+        for _, _, _, entry_id in entries:
+            self.index.remove(entry_id)
+    
+    def _expire(self, key: str) -> None:
+        """Drop expired entries of a key (lock held)"""
+        if self.ttl_seconds is None or key not in self._keys:
+            return
+        entries = self._keys[key]
+        deadline = time.monotonic() - self.ttl_seconds
+        while entries and entries[0][2] < deadline:
+            self._drop_oldest(key)
+            self.expired_entries += 1
+        if not entries:
+            self._drop_key(key)
+    
+    def _over_budget(self) -> bool:
+        return (
+            (self.max_total_entries is not None and self._entries > self.max_total_entries)
+            or (self.max_total_bytes is not None and self._bytes > self.max_total_bytes)
+        )
+    
+    def _enforce_budget(self, current_key: str) -> None:
+        """Evict least recently used keys, then the current key's oldest entries (lock held)"""
+        while self._over_budget():
+            victim = next((key for key in self._keys if key != current_key), None)
+            if victim is not None:
+                self._drop_key(victim)
+                self.evicted_keys += 1
+                continue
+            entries = self._keys.get(current_key)
+            if not entries or len(entries) <= 1:
+                return
+            self._drop_oldest(current_key)
+            self.evicted_entries += 1
+    
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            # Stamped under the lock, so timestamps follow the append order retrieve_page bisects
+            entry = _stamped(entry)
+            size = len(json.dumps(entry, default=str))
+            self._expire(key)
+            entries = self._keys.get(key)
+            if entries is None:
+                entries = self._keys[key] = deque()
+            self._keys.move_to_end(key)
+            
+            if self.max_entries_per_key is not None and len(entries) >= self.max_entries_per_key:
+                self._drop_oldest(key)
+                self.evicted_entries += 1
+            
+            entry_id, created = next(self._ids), time.monotonic()
+            entries.append((entry, size, created, entry_id))
+            self.index.add(key, entry_id, entry, created)
+            self._entries += 1
+            self._bytes += size
+            self._enforce_budget(key)
+    
+    def retrieve(self, key: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._expire(key)
+            entries = self._keys.get(key)
+            if entries is None:
+                return []
+            self._keys.move_to_end(key)
+            return [entry for entry, _, _, _ in entries]
+    
+    def retrieve_latest(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._expire(key)
+            entries = self._keys.get(key)
+            return entries[-1][0] if entries else None
+    
+    def retrieve_page(
+        self,
+        key: str,
+        after_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 100,
+        since: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], bool, int]:
+        with self._lock:
+            self._expire(key)
+            entries = self._keys.get(key)
+            if entries is None:
+                return [], False, 0
+            self._keys.move_to_end(key)
+            # Entries are in id and timestamp order, so both filters are a bisect
+            first = 0
+            if since is not None:
+                first = bisect.bisect_left(entries, since.isoformat(), key=lambda item: item[0]['timestamp'])
+            total = len(entries) - first
+            if after_id is not None:
+                first = max(first, bisect.bisect_right(entries, after_id, key=lambda item: item[3]))
+            first += offset
+            last = min(first + limit, len(entries))
+            page = [{'id': entries[i][3], **entries[i][0]} for i in range(first, last)]
+            return page, last < len(entries), total
+    
+    def clear(self, key: str = None) -> None:
+        with self._lock:
+            if key:
+                if key in self._keys:
+                    self._drop_key(key)
+                return
+            self._keys.clear()
+            self._entries = 0
+            self._bytes = 0
+            self.index.clear()
+    
+    def search(
+        self,
+        query: str,
+        creativity_level: Optional[str] = None,
+        key: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        created_after = None
+        if self.ttl_seconds is not None:
+            created_after = time.monotonic() - self.ttl_seconds
+        return self.index.search(
+            query,
+            creativity_level=creativity_level,
+            key=key,
+            limit=limit,
+            created_after=created_after
+        )
+    
+    def purge_expired(self) -> int:
+        """Drop expired entries across all keys, returning how many were removed"""
+        with self._lock:
+            before = self.expired_entries
+            for key in list(self._keys):
+                self._expire(key)
+            return self.expired_entries - before
+    
+    def get_all_keys(self) -> List[str]:
+        with self._lock:
+            return list(self._keys)
+    
+    def stats(self) -> Dict[str, Any]:
+        self.purge_expired()
+        with self._lock:
+            sizes = {key: len(entries) for key, entries in self._keys.items()}
+            entries, size = self._entries, self._bytes
+        largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:10]
+        return {
+            "backend": "memory",
+            "keys": len(sizes),
+            "entries": entries,
+            "indexed_entries": len(self.index),
+            "bytes": size,
+            "largest_keys": dict(largest),
+            "limits": {
+                "max_entries_per_key": self.max_entries_per_key,
+                "max_total_entries": self.max_total_entries,
+                "max_total_bytes": self.max_total_bytes,
+                "ttl_seconds": self.ttl_seconds
+            },
+            "evicted_entries": self.evicted_entries,
+            "evicted_keys": self.evicted_keys,
+            "expired_entries": self.expired_entries
+        }
+    
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            return {key: [entry for entry, _, _, _ in entries] for key, entries in self._keys.items()}
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    Durable storage in a SQLite database in WAL mode
+    
+    All workers on a host share one database file, so every worker sees the
+    same history and it survives restarts. save() only enqueues the entry; a
+    background thread writes queued entries in batched transactions and
+    applies the same per-key, global and TTL limits as InMemoryBackend.
+    Reads first wait for the saves queued before they started to commit, so
+    a read sees every earlier save, including one made on another thread
+    (routes save on the event loop and read in the threadpool); saves queued
+    after the read began don't extend the wait, and stats() doesn't wait. Entry topics are indexed in an FTS5 table kept in sync by
+    triggers, so search() sees every worker's history.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries_per_key: Optional[int] = None,
+        max_total_entries: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.05
+    ):
+        self.path = path
+        self.max_entries_per_key = max_entries_per_key
+        self.max_total_entries = max_total_entries
+        self.max_total_bytes = max_total_bytes
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.evicted_entries = 0
+        self.evicted_keys = 0
+        self.expired_entries = 0
+        self.write_errors = 0
+        self.last_write_error = None
+        self._local = threading.local()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._queue: queue.Queue = None
+        self._writer: threading.Thread = None
+        # Saves are numbered; the writer advances _committed past each batch
+        self._enqueued = 0
+        self._committed = 0
+        self._committed_cond = threading.Condition()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            backfill = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'memory_search'"
+            ).fetchone() is None
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS memory_entries ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, "
+                "entry TEXT NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS memory_entries_key ON memory_entries(key, id);"
+                "CREATE INDEX IF NOT EXISTS memory_entries_created ON memory_entries(created_at);"
+                "CREATE TABLE IF NOT EXISTS memory_keys ("
+                "key TEXT PRIMARY KEY, accessed_at REAL NOT NULL);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS memory_search USING fts5("
+                "topic, creativity_level UNINDEXED);"
+                "CREATE TRIGGER IF NOT EXISTS memory_search_insert AFTER INSERT ON memory_entries "
+                "WHEN json_extract(new.entry, '$.data.topic') IS NOT NULL BEGIN "
+                "INSERT INTO memory_search (rowid, topic, creativity_level) VALUES ("
+                "new.id, json_extract(new.entry, '$.data.topic'), "
+                "json_extract(new.entry, '$.data.creativity_level')); END;"
+                "CREATE TRIGGER IF NOT EXISTS memory_search_delete AFTER DELETE ON memory_entries BEGIN "
+                "DELETE FROM memory_search WHERE rowid = old.id; END;"
+            )
+            if backfill:
+                # Index history written before search existed
+                conn.execute(
+                    "INSERT INTO memory_search (rowid, topic, creativity_level) "
+                    "SELECT id, json_extract(entry, '$.data.topic'), "
+                    "json_extract(entry, '$.data.creativity_level') FROM memory_entries "
+                    "WHERE json_extract(entry, '$.data.topic') IS NOT NULL"
+                )
+        conn.close()
+        atexit.register(self.close)
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+    
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread, per-process read connection"""
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.conn
+    
+    def _ensure_writer(self) -> None:
+        """Start the writer thread in this process (again after a fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                with self._committed_cond:
+                    # Writes queued in a parent process don't exist here
+                    self._committed = self._enqueued
+                self._queue = queue.Queue()
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    name="memory-writer",
+                    daemon=True
+                )
+                self._writer.start()
+                self._pid = os.getpid()
+    
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            rows = [item for item in batch if item is not None]
+            try:
+                if rows:
+                    self._write_batch(conn, rows)
+            except Exception as e:
+                # Keep the writer alive; the batch is lost but later saves still land
+                self.write_errors += 1
+                self.last_write_error = str(e)
+            finally:
+                if rows:
+                    with self._committed_cond:
+                        # Failed batches count too, so waiters never hang on lost writes
+                        self._committed = max(self._committed, max(row[0] for row in rows))
+                        self._committed_cond.notify_all()
+                for _ in batch:
+                    pending.task_done()
+            if stop:
+                conn.close()
+                return
+    
+    def _write_batch(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        """Insert a batch of entries and enforce limits in one transaction"""
+        now = time.time()
+        keys = list(dict.fromkeys(row[1] for row in rows))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO memory_entries (key, entry, size, created_at) VALUES (?, ?, ?, ?)",
+                [row[1:] for row in rows]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO memory_keys (key, accessed_at) VALUES (?, ?)",
+                [(key, now) for key in keys]
+            )
+            
+            if self.ttl_seconds is not None:
+                self.expired_entries += conn.execute(
+                    "DELETE FROM memory_entries WHERE created_at < ?",
+                    (now - self.ttl_seconds,)
+                ).rowcount
+            
+            if self.max_entries_per_key is not None:
+                for key in keys:
+                    self.evicted_entries += conn.execute(
+                        "DELETE FROM memory_entries WHERE key = ? AND id <= ("
+                        "SELECT id FROM memory_entries WHERE key = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                        (key, key, self.max_entries_per_key)
+                    ).rowcount
+            
+            self._enforce_budget(conn, keys[-1])
+            conn.execute(
+                "DELETE FROM memory_keys WHERE key NOT IN (SELECT DISTINCT key FROM memory_entries)"
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _enforce_budget(self, conn: sqlite3.Connection, current_key: str) -> None:
+        """Evict least recently used keys, then the current key's oldest entries"""
+        if self.max_total_entries is None and self.max_total_bytes is None:
+            return
+        while True:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM memory_entries"
+            ).fetchone()
+            if not (
+                (self.max_total_entries is not None and entries > self.max_total_entries)
+                or (self.max_total_bytes is not None and size > self.max_total_bytes)
+            ):
+                return
+            row = conn.execute(
+                "SELECT key FROM memory_keys WHERE key != ? ORDER BY accessed_at LIMIT 1",
+                (current_key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM memory_entries WHERE key = ?", (row[0],))
+                conn.execute("DELETE FROM memory_keys WHERE key = ?", (row[0],))
+                self.evicted_keys += 1
+                continue
+            removed = conn.execute(
+                "DELETE FROM memory_entries WHERE id = ("
+                "SELECT id FROM memory_entries WHERE key = ? ORDER BY id LIMIT 1) "
+                "AND (SELECT COUNT(*) FROM memory_entries WHERE key = ?) > 1",
+                (current_key, current_key)
+            ).rowcount
+            if not removed:
+                return
+            self.evicted_entries += 1
+    
+    def save(self, key: str, entry: Dict[str, Any]) -> None:
+        self._ensure_writer()
+        with self._committed_cond:
+            # Stamped in queue order; created_at (the since filter) is the same instant
+            moment = datetime.now()
+            payload = json.dumps(_stamped(entry, moment), default=str)
+            self._enqueued += 1
+            sequence = self._enqueued
+            self._queue.put((sequence, key, payload, len(payload), moment.timestamp()))
+    
+    def _wait_committed(self, sequence: int) -> None:
+        with self._committed_cond:
+            self._committed_cond.wait_for(lambda: self._committed >= sequence)
+    
+    def flush(self) -> None:
+        """Wait for the saves queued so far by any thread; later saves don't extend the wait"""
+        if self._pid == os.getpid():
+            with self._committed_cond:
+                sequence = self._enqueued
+            self._wait_committed(sequence)
+    
+    def _live_clause(self) -> tuple:
+        """SQL condition and parameters excluding expired entries"""
+        if self.ttl_seconds is None:
+            return "", ()
+        return " AND created_at >= ?", (time.time() - self.ttl_seconds,)
+    
+    def retrieve(self, key: str) -> List[Dict[str, Any]]:
+        self.flush()
+        clause, params = self._live_clause()
+        rows = self._conn.execute(
+            f"SELECT entry FROM memory_entries WHERE key = ?{clause} ORDER BY id",
+            (key, *params)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def retrieve_latest(self, key: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        clause, params = self._live_clause()
+        row = self._conn.execute(
+            f"SELECT entry FROM memory_entries WHERE key = ?{clause} ORDER BY id DESC LIMIT 1",
+            (key, *params)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def retrieve_page(
+        self,
+        key: str,
+        after_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 100,
+        since: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], bool, int]:
+        self.flush()
+        clause, params = self._live_clause()
+        if since is not None:
+            clause += " AND created_at >= ?"
+            params += (since.timestamp(),)
+        total = self._conn.execute(
+            f"SELECT COUNT(*) FROM memory_entries WHERE key = ?{clause}",
+            (key, *params)
+        ).fetchone()[0]
+        if after_id is not None:
+            clause += " AND id > ?"
+            params += (after_id,)
+        # Fetch one extra row to know whether another page follows
+        rows = self._conn.execute(
+            f"SELECT id, entry FROM memory_entries WHERE key = ?{clause} ORDER BY id LIMIT ? OFFSET ?",
+            (key, *params, limit + 1, offset)
+        ).fetchall()
+        page = [{'id': row_id, **json.loads(entry)} for row_id, entry in rows[:limit]]
+        return page, len(rows) > limit, total
+    
+    def search(
+        self,
+        query: str,
+        creativity_level: Optional[str] = None,
+        key: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        self.flush()
+        clause, params = self._live_clause()
+        if creativity_level is not None:
+            clause += " AND memory_search.creativity_level = ?"
+            params += (creativity_level,)
+        if key is not None:
+            clause += " AND memory_entries.key = ?"
+            params += (key,)
+        match = " OR ".join(f'"{token}"' for token in tokens)
+        rows = self._conn.execute(
+            "SELECT memory_entries.id, memory_entries.key, memory_entries.entry, bm25(memory_search) "
+            "FROM memory_search JOIN memory_entries ON memory_entries.id = memory_search.rowid "
+            f"WHERE memory_search MATCH ?{clause} ORDER BY bm25(memory_search), memory_entries.id DESC LIMIT ?",
+            (match, *params, limit)
+        ).fetchall()
+        return [
+            {'key': row_key, 'id': row_id, 'score': round(-rank, 6), **json.loads(entry)}
+            for row_id, row_key, entry, rank in rows
+        ]
+    
+    def clear(self, key: str = None) -> None:
+        self.flush()
+        conn = self._conn
+        if key:
+            conn.execute("DELETE FROM memory_entries WHERE key = ?", (key,))
+            conn.execute("DELETE FROM memory_keys WHERE key = ?", (key,))
+        else:
+            conn.execute("DELETE FROM memory_entries")
+            conn.execute("DELETE FROM memory_keys")
+    
+    def get_all_keys(self) -> List[str]:
+        self.flush()
+        clause, params = self._live_clause()
+        rows = self._conn.execute(
+            f"SELECT DISTINCT key FROM memory_entries WHERE 1 = 1{clause}",
+            params
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn
+        clause, params = self._live_clause()
+        entries, size, keys = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(DISTINCT key) "
+            f"FROM memory_entries WHERE 1 = 1{clause}",
+            params
+        ).fetchone()
+        largest = conn.execute(
+            f"SELECT key, COUNT(*) AS n FROM memory_entries WHERE 1 = 1{clause} "
+            "GROUP BY key ORDER BY n DESC LIMIT 10",
+            params
+        ).fetchall()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "keys": keys,
+            "entries": entries,
+            "bytes": size,
+            "largest_keys": dict(largest),
+            "pending_writes": self._queue.qsize() if self._pid == os.getpid() else 0,
+            "limits": {
+                "max_entries_per_key": self.max_entries_per_key,
+                "max_total_entries": self.max_total_entries,
+                "max_total_bytes": self.max_total_bytes,
+                "ttl_seconds": self.ttl_seconds
+            },
+            "evicted_entries": self.evicted_entries,
+            "evicted_keys": self.evicted_keys,
+            "expired_entries": self.expired_entries,
+            "write_errors": self.write_errors,
+            "last_write_error": self.last_write_error
+        }
+    
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        self.flush()
+        clause, params = self._live_clause()
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for key, entry in self._conn.execute(
+            f"SELECT key, entry FROM memory_entries WHERE 1 = 1{clause} ORDER BY id",
+            params
+        ):
+            result.setdefault(key, []).append(json.loads(entry))
+        return result
+    
+    def close(self) -> None:
+        if self._pid == os.getpid() and self._writer.is_alive():
+            self._queue.put(None)
+            self._queue.join()
@@ -0,0 +1,191 @@
+"""
+Inverted index over stored generation history
+"""
+from typing import Dict, List, Any, Optional, Set
+import heapq
+import itertools
+import math
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens"""
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+def query_tokens(query: str) -> List[str]:
+    """Distinct query tokens without stopwords, unless the query is only stopwords"""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    return [token for token in tokens if token not in STOPWORDS] or tokens
+
+
+class MemoryIndex:
+    """
+    Incrementally maintained inverted index on entry topics and creativity level
+
+    Only entries whose data carries a "topic" string are indexed. Entries are
+    added and removed by id as the backend saves and evicts them, so a search
+    touches only the postings of the query tokens instead of every entry.
+    Matches are ranked by TF-IDF, normalized by topic length.
+
+    Work per search is bounded, because it runs under the index lock that
+    saves and evictions also take:
+      - stopwords are dropped from the query
+      - key and creativity level filters are applied before scoring; when a
+        filter matches fewer entries than a token's postings, the filtered
+        entries are looked up instead of walking the postings
+      - for a token in more than scan_limit entries, only the newest
+        scan_limit postings are walked, plus lookups for entries that rarer
+        query tokens already matched. Matches that only share very common
+        words therefore come from the most recent history.
+    """
+
+    def __init__(self, scan_limit: int = 2000):
+        self.scan_limit = scan_limit
+        # token -> {entry id: term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # creativity level -> entry ids
+        self._levels: Dict[str, Set[int]] = {}
+        # key -> entry ids
+        self._keys: Dict[str, Set[int]] = {}
+        # entry id -> (key, entry, tokens, level, monotonic creation time)
+        self._docs: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, entry_id: int, entry: Dict[str, Any], created: float = 0.0) -> None:
+        """Index an entry if it has a topic"""
+        data = entry.get('data')
+        if not isinstance(data, dict) or not isinstance(data.get('topic'), str):
+            return
+        tokens = tokenize(data['topic'])
+        level = data.get('creativity_level')
+        with self._lock:
+            self._docs[entry_id] = (key, entry, tokens, level, created)
+            for token in tokens:
+                postings = self._postings.setdefault(token, {})
+                postings[entry_id] = postings.get(entry_id, 0) + 1
+            if level is not None:
+                self._levels.setdefault(level, set()).add(entry_id)
+            self._keys.setdefault(key, set()).add(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """Drop an entry from the index; unknown ids are ignored"""
+        with self._lock:
+            doc = self._docs.pop(entry_id, None)
+            if doc is None:
+                return
+            key, _, tokens, level, _ = doc
+            for token in set(tokens):
+                postings = self._postings[token]
+                del postings[entry_id]
+                if not postings:
+                    del self._postings[token]
+            if level is not None:
+                ids = self._levels[level]
+                ids.discard(entry_id)
+                if not ids:
+                    del self._levels[level]
+            ids = self._keys[key]
+            ids.discard(entry_id)
+            if not ids:
+                del self._keys[key]
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._postings.clear()
+            self._levels.clear()
+            self._keys.clear()
+            self._docs.clear()
+
+    def search(
+        self,
+        query: str,
+        creativity_level: Optional[str] = None,
+        key: Optional[str] = None,
+        limit: int = 10,
+        created_after: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entries whose topic shares tokens with the query
+
+        Args:
+            query: Free text matched against entry topics
+            creativity_level: Only entries saved with this level
+            key: Only entries stored under this key
+            limit: Maximum number of matches
+            created_after: Skip entries created before this monotonic time
+
+        Returns:
+            Matches with key, id, score, timestamp and data, best first
+        """
+        tokens = query_tokens(query)
+        scores: Dict[int, float] = {}
+        with self._lock:
+            filters = []
+            if creativity_level is not None:
+                filters.append(self._levels.get(creativity_level, set()))
+            if key is not None:
+                filters.append(self._keys.get(key, set()))
+            filters.sort(key=len)
+            if filters and not filters[0]:
+                return []
+
+            docs = self._docs
+
+            def admitted(entry_id: int) -> bool:
+                return all(entry_id in ids for ids in filters) and (
+                    created_after is None or docs[entry_id][4] >= created_after
+                )
+
+            check = admitted if filters or created_after is not None else None
+            total = len(docs)
+            # Rarest tokens first, so common ones can be limited to known matches
+            for postings in sorted((self._postings[token] for token in tokens if token in self._postings), key=len):
+                idf = math.log(1 + total / len(postings))
+                if filters and len(filters[0]) <= min(len(postings), 10 * self.scan_limit):
+                    matches = [
+                        (entry_id, postings[entry_id]) for entry_id in filters[0]
+                        if entry_id in postings and admitted(entry_id)
+                    ]
+                elif len(postings) <= self.scan_limit:
+                    matches = [
+                        (entry_id, frequency) for entry_id, frequency in postings.items()
+                        if check is None or check(entry_id)
+                    ]
+                else:
+                    # Entries rarer tokens matched, topped up from the newest admitted postings
+                    matches = [(entry_id, postings[entry_id]) for entry_id in scores if entry_id in postings]
+                    if len(scores) < self.scan_limit:
+                        newest = (
+                            item for item in reversed(postings.items())
+                            if item[0] not in scores and (check is None or check(item[0]))
+                        )
+                        matches.extend(itertools.islice(newest, self.scan_limit - len(scores)))
+                for entry_id, frequency in matches:
+                    scores[entry_id] = scores.get(entry_id, 0.0) + frequency * idf
+
+            candidates = (
+                (score / math.sqrt(len(self._docs[entry_id][2])), entry_id)
+                for entry_id, score in scores.items()
+            )
+            # Ties go to the most recent entry
+            best = heapq.nlargest(limit, candidates)
+            return [
+                {
+                    'key': self._docs[entry_id][0],
+                    'id': entry_id,
+                    'score': round(score, 6),
+                    **self._docs[entry_id][1]
+                }
+                for score, entry_id in best
+            ]
+
+    def __len__(self) -> int:
+        return len(self._docs)
@@ -1,59 +1,183 @@
 """
 Memory tool for CrewAI agents to maintain context across interactions
 """
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 import json
+import os
 from datetime import datetime
+from tools.memory_backends import MemoryBackend, InMemoryBackend, SQLiteMemoryBackend
 
 
 class MemoryStore:
-    """Simple in-memory storage for agent context"""
+    """
+    Storage for agent context, delegating to a pluggable MemoryBackend
     
-    def __init__(self):
-        self._storage: Dict[str, List[Dict[str, Any]]] = {}
+    Without an explicit backend, a bounded InMemoryBackend is created from
+    the given limits.
+    """
+    
+    def __init__(
+        self,
+        max_entries_per_key: Optional[int] = None,
+        max_total_entries: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        backend: MemoryBackend = None
+    ):
+        self.backend = backend or InMemoryBackend(
+            max_entries_per_key=max_entries_per_key,
+            max_total_entries=max_total_entries,
+            max_total_bytes=max_total_bytes,
+            ttl_seconds=ttl_seconds
+        )
     
     def save(self, key: str, data: Dict[str, Any]) -> None:
-        """Save data to memory with timestamp"""
-        if key not in self._storage:
-            self._storage[key] = []
-        
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'data': data
-        }
-        self._storage[key].append(entry)
+        """Save data to memory; the backend stamps the entry's timestamp"""
+        self.backend.save(key, {'data': data})
     
     def retrieve(self, key: str) -> List[Dict[str, Any]]:
         """Retrieve all entries for a given key"""
-        return self._storage.get(key, [])
+        return self.backend.retrieve(key)
     
     def retrieve_latest(self, key: str) -> Dict[str, Any] | None:
         """Retrieve the most recent entry for a given key"""
-        entries = self.retrieve(key)
-        return entries[-1] if entries else None
+        return self.backend.retrieve_latest(key)
     
     def clear(self, key: str = None) -> None:
         """Clear memory for a specific key or all keys"""
-        if key:
-            self._storage.pop(key, None)
-        else:
-            self._storage.clear()
+        self.backend.clear(key)
     
     def get_all_keys(self) -> List[str]:
         """Get all keys in memory"""
-        return list(self._storage.keys())
+        return self.backend.get_all_keys()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the current memory footprint, limits and eviction counters"""
+        return self.backend.stats()
+    
+    def retrieve_page(
+        self,
+        key: str,
+        cursor: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 100,
+        since: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve one page of entries for a key, oldest first
+        
+        Args:
+            key: Key to read
+            cursor: next_cursor from a previous page
+            offset: Entries to skip (after cursor and since are applied)
+            limit: Maximum number of entries
+            since: Only entries saved at or after this time
+        
+        Returns:
+            Dictionary with entries (each with an "id"), next_cursor, has_more and total
+        """
+        entries, has_more, total = self.backend.retrieve_page(
+            key, after_id=cursor, offset=offset, limit=limit, since=since
+        )
+        return {
+            "entries": entries,
+            "next_cursor": entries[-1]["id"] if has_more and entries else None,
+            "has_more": has_more,
+            "total": total
+        }
+    
+    def iter_entries(
+        self,
+        key: str,
+        since: Optional[datetime] = None,
+        batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over a key's entries page by page without materializing them all"""
+        cursor = None
+        while True:
+            entries, has_more, _ = self.backend.retrieve_page(
+                key, after_id=cursor, limit=batch_size, since=since
+            )
+            yield from entries
+            if not has_more or not entries:
+                return
+            cursor = entries[-1]["id"]
+    
+    def search(
+        self,
+        query: str,
+        creativity_level: Optional[str] = None,
+        key: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Find previously saved entries with a similar topic
+        
+        Args:
+            query: Free text matched against saved topics
+            creativity_level: Only entries saved with this creativity level
+            key: Only entries stored under this key
+            limit: Maximum number of matches
+        
+        Returns:
+            Matching entries with "key", "id" and "score", best match first
+        """
+        return self.backend.search(query, creativity_level=creativity_level, key=key, limit=limit)
+    
+    def flush(self) -> None:
+        """Wait for buffered writes to be persisted"""
+        self.backend.flush()
     
     def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
         """Export memory as dictionary"""
-        return self._storage.copy()
+        return self.backend.to_dict()
     
-    def to_json(self) -> str:
+    def to_json(self, indent: Optional[int] = 2) -> str:
         """Export memory as JSON string"""
-        return json.dumps(self._storage, indent=2)
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def _optional_limit(name: str, default: str, cast=int):
+    """Read a limit from the environment; 0 or empty disables it"""
+    value = os.getenv(name, default)
+    return cast(value) if value and cast(value) > 0 else None
+
+
+def create_memory_store() -> MemoryStore:
+    """
+    Create the memory store from environment configuration
+    
+    MEMORY_BACKEND: memory (default, per process) or sqlite (shared, durable)
+    MEMORY_DB_PATH: SQLite file path (default: .cache/memory.sqlite3)
+    MEMORY_WRITE_BATCH_SIZE: Entries per SQLite write transaction (default: 256)
+    MEMORY_FLUSH_INTERVAL: Seconds to gather a write batch (default: 0.05)
+    MEMORY_MAX_ENTRIES_PER_KEY: Ring buffer size per key (default: 1000)
+    MEMORY_MAX_TOTAL_ENTRIES: Global entry budget (default: 10000)
+    MEMORY_MAX_TOTAL_BYTES: Global budget of serialized entry bytes (default: 50 MB)
+    MEMORY_TTL_SECONDS: Entry lifetime (default: 0, never expire)
+    """
+    limits = {
+        "max_entries_per_key": _optional_limit("MEMORY_MAX_ENTRIES_PER_KEY", "1000"),
+        "max_total_entries": _optional_limit("MEMORY_MAX_TOTAL_ENTRIES", "10000"),
+        "max_total_bytes": _optional_limit("MEMORY_MAX_TOTAL_BYTES", str(50 * 1024 * 1024)),
+        "ttl_seconds": _optional_limit("MEMORY_TTL_SECONDS", "0", cast=float)
+    }
+    
+    backend = os.getenv("MEMORY_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        return MemoryStore(backend=SQLiteMemoryBackend(
+            os.getenv("MEMORY_DB_PATH", ".cache/memory.sqlite3"),
+            batch_size=int(os.getenv("MEMORY_WRITE_BATCH_SIZE", 256)),
+            flush_interval=float(os.getenv("MEMORY_FLUSH_INTERVAL", 0.05)),
+            **limits
+        ))
+    if backend != "memory":
+        raise ValueError(f"Unknown memory backend: {backend}")
+    return MemoryStore(backend=InMemoryBackend(**limits))
 
 
 # Global memory instance
-memory_store = MemoryStore()
+memory_store = create_memory_store()
 
 
 class MemoryTool:
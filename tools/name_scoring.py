@@ -0,0 +1,176 @@
+"""
+Scoring and top-k ranking of generated name candidates
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+import heapq
+import math
+import os
+import re
+import threading
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(__file__), "data", "wordlist.txt")
+VOWELS = set("aeiouy")
+NON_LETTERS = re.compile(r"[^a-z]+")
+CONSONANT_RUN = re.compile(r"[^aeiouy]+")
+
+
+def load_wordlist(path: str = None) -> List[str]:
+    """Read one lower-case word per line, skipping blanks and comments"""
+    with open(path or DEFAULT_WORDLIST, encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if line.strip() and not line.startswith("#")]
+
+
+class NameScorer:
+    """
+    Ranks name candidates by length, pronounceability and letter patterns
+
+    Pronounceability comes from a character n-gram model trained on a
+    wordlist, scaled so the most word-like tenth of the training words score 1
+    and a string of random letters about 0. Length and letter-pattern scores are cheap;
+    top_k() uses them to bound each candidate's best possible score and only
+    runs the n-gram model on candidates that could still make the top k.
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        n: int = 3,
+        weights: Optional[Dict[str, float]] = None,
+        ideal_length: Tuple[int, int] = (4, 10)
+    ):
+        self.n = n
+        self.weights = weights or {"pronounceability": 0.5, "length": 0.25, "pattern": 0.25}
+        self.ideal_length = ideal_length
+        self._grams: Counter = Counter()
+        self._contexts: Counter = Counter()
+        words = [letters for letters in (self.normalize(word) for word in words) if letters]
+        for word in words:
+            padded = self._pad(word)
+            for i in range(len(padded) - n + 1):
+                self._grams[padded[i:i + n]] += 1
+                self._contexts[padded[i:i + n - 1]] += 1
+        # Letters plus the end marker
+        self._vocabulary = len(set("".join(words))) + 1
+
+        # Calibrate: uniform random letters map to 0, the 90th percentile training word to 1
+        self._floor = -math.log(self._vocabulary)
+        likelihoods = sorted(self._log_likelihood(word) for word in words)
+        self._ceiling = likelihoods[len(likelihoods) * 9 // 10] if likelihoods else self._floor
+
+    def _pad(self, word: str) -> str:
+        return "^" * (self.n - 1) + word + "$"
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lower-case letters only, as the n-gram model sees a candidate"""
+        return NON_LETTERS.sub("", name.lower())
+
+    def _log_likelihood(self, letters: str) -> float:
+        """Average log probability per character transition, with add-one smoothing"""
+        padded = self._pad(letters)
+        total = 0.0
+        transitions = len(padded) - self.n + 1
+        for i in range(transitions):
+            gram = padded[i:i + self.n]
+            total += math.log(
+                (self._grams.get(gram, 0) + 1) / (self._contexts.get(gram[:-1], 0) + self._vocabulary)
+            )
+        return total / transitions
+
+    def pronounceability(self, name: str) -> float:
+        """How word-like the candidate's letter sequence is, from 0 to 1"""
+        letters = self.normalize(name)
+        if not letters:
+            return 0.0
+        span = self._ceiling - self._floor
+        if span <= 0:
+            return 0.0
+        return min(max((self._log_likelihood(letters) - self._floor) / span, 0.0), 1.0)
+
+    def length_score(self, name: str) -> float:
+        """1 inside the ideal length range, decaying outside it"""
+        length = len(self.normalize(name))
+        low, high = self.ideal_length
+        if length == 0:
+            return 0.0
+        if length < low:
+            return length / low
+        if length > high:
+            return max(1.0 - (length - high) / high, 0.0)
+        return 1.0
+
+    def pattern_score(self, name: str) -> float:
+        """Penalize separators, digits, consonant clusters, tripled letters and odd vowel ratios"""
+        letters = self.normalize(name)
+        if not letters:
+            return 0.0
+        score = 1.0
+        if len(letters) != len(name):
+            score -= 0.3
+        longest_run = max((len(run) for run in CONSONANT_RUN.findall(letters)), default=0)
+        if longest_run > 3:
+            score -= 0.15 * (longest_run - 3)
+        if re.search(r"(.)\1\1", letters):
+            score -= 0.3
+        vowel_ratio = sum(char in VOWELS for char in letters) / len(letters)
+        if not 0.25 <= vowel_ratio <= 0.65:
+            score -= 0.3
+        return max(score, 0.0)
+
+    def _cheap_score(self, name: str) -> float:
+        return self.weights["length"] * self.length_score(name) + self.weights["pattern"] * self.pattern_score(name)
+
+    def score(self, name: str) -> float:
+        """Weighted score from 0 to 1"""
+        return self._cheap_score(name) + self.weights["pronounceability"] * self.pronounceability(name)
+
+    def top_k(self, candidates: Iterable[str], k: int) -> List[Tuple[str, float]]:
+        """
+        Return the k best unique candidates with their scores, best first
+
+        Candidates are visited in order of their upper bound (cheap score plus
+        the maximum pronounceability weight). Once the k-th best full score
+        exceeds the next bound, the remaining candidates are never scored.
+        Ties keep the original candidate order.
+        """
+        if k <= 0:
+            return []
+        bound = self.weights["pronounceability"]
+        pending = [
+            (-(self._cheap_score(name) + bound), position, name)
+            for position, name in enumerate(dict.fromkeys(candidates))
+        ]
+        heapq.heapify(pending)
+
+        # Min-heap of (score, -position, name) holding the best k so far
+        best: List[tuple] = []
+        while pending:
+            negative_bound, position, name = pending[0]
+            if len(best) == k and -negative_bound < best[0][0]:
+                break
+            heapq.heappop(pending)
+            item = (self.score(name), -position, name)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+        return [(name, round(score, 4)) for score, _, name in sorted(best, reverse=True)]
+
+
+_scorer: Optional[NameScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_name_scorer() -> NameScorer:
+    """
+    Get the shared NameScorer, training it on first use
+
+    NAME_SCORING_WORDLIST: Wordlist to train on (default: tools/data/wordlist.txt)
+    """
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = NameScorer(load_wordlist(os.getenv("NAME_SCORING_WORDLIST") or None))
+    return _scorer
@@ -0,0 +1,111 @@
+"""
+Search result cache with concurrent query deduplication
+"""
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Future
+from tools.cache import CacheBackend, create_cache_backend
+import json
+import os
+import threading
+
+
+class SearchCache:
+    """
+    Caches search results by normalized query
+
+    Concurrent identical queries are deduplicated: the first caller runs the
+    search and the others wait for its result.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(arguments: Dict[str, Any]) -> str:
+        """Build a cache key from search arguments, normalizing the query text"""
+        normalized = {
+            name: " ".join(value.split()).casefold() if isinstance(value, str) else value
+            for name, value in arguments.items()
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    def get_or_search(self, arguments: Dict[str, Any], search: Callable[[], Any]) -> Any:
+        """Return the cached result for the arguments, running search at most once"""
+        if self.backend is None:
+            return search()
+
+        key = self.make_key(arguments)
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = search()
+            self.backend.set(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached search results"""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """Get search cache hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "backend": type(self.backend).__name__ if self.backend is not None else None,
+                "entries": len(self.backend) if self.backend is not None else 0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+            }
+
+
+def create_search_cache() -> SearchCache:
+    """
+    Create the search result cache from environment configuration
+
+    WEB_SEARCH_CACHE_BACKEND: sqlite (default), memory or none
+    WEB_SEARCH_CACHE_TTL: Seconds before a result expires (default: 86400)
+    WEB_SEARCH_CACHE_MAX_ENTRIES: LRU size bound (default: 10000)
+    WEB_SEARCH_CACHE_PATH: SQLite file path (default: .cache/search_cache.sqlite3)
+    """
+    return SearchCache(create_cache_backend(
+        os.getenv("WEB_SEARCH_CACHE_BACKEND", "sqlite"),
+        ttl_seconds=float(os.getenv("WEB_SEARCH_CACHE_TTL", 86400)),
+        max_entries=int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", 10000)),
+        path=os.getenv("WEB_SEARCH_CACHE_PATH", ".cache/search_cache.sqlite3")
+    ))
+
+
+# Shared search result cache
+search_cache = create_search_cache()
@@ -0,0 +1,210 @@
+"""
+Taken-name filter backed by a memory-mapped Bloom filter
+
+The filter is built offline from a list of existing brand and domain names
+(one per line) and mapped read-only at runtime, so loading takes
+milliseconds regardless of size and workers share its pages. Membership
+tests are O(k) hash probes with no false negatives; the false positive rate
+is chosen at build time.
+
+Build the index with:
+    python -m tools.taken_names build names.txt [index path] [--fp-rate 0.001]
+"""
+from typing import Iterable, Iterator, List, Optional
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import unicodedata
+
+MAGIC = b"BLM1"
+# magic, bit count, hash count, item count
+HEADER = struct.Struct("<4sQIQ")
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+DOMAIN = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:www\.)?([^./\s]+)\.[a-z.]{2,}/?$")
+LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+)$")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Reduce a brand name or domain to its comparable form
+
+    Case, separators and punctuation are ignored, and a domain is reduced to
+    its name label, so "Cloud-Storage", "cloud_storage" and
+    "https://www.cloudstorage.com" all become "cloudstorage". Non-ASCII names
+    are NFKD-decomposed and casefolded and keep their letters, digits and
+    accents, so "Café" stays distinct from "Caf" and "Cafe", and "Ｃａｆé"
+    matches "café".
+    """
+    if name.isascii():
+        name = name.strip().lower()
+        match = DOMAIN.match(name)
+        if match:
+            name = match.group(1)
+        return NON_ALPHANUMERIC.sub("", name)
+    name = unicodedata.normalize("NFKD", name.strip()).casefold()
+    match = DOMAIN.match(name)
+    if match:
+        name = match.group(1)
+    # Drop separators, punctuation, symbols and control characters
+    return "".join(char for char in name if unicodedata.category(char)[0] not in "ZPSC")
+
+
+def _probes(name: str, bits: int, hashes: int) -> Iterator[int]:
+    """Bit positions for a normalized name, by double hashing one digest"""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+    first, second = struct.unpack("<QQ", digest)
+    second |= 1
+    for i in range(hashes):
+        yield (first + i * second) % bits
+
+
+def build_filter(names: Iterable[str], path: str, expected: int, fp_rate: float = 0.001) -> int:
+    """
+    Build a Bloom filter file from names
+
+    Args:
+        names: Existing names or domains
+        path: Output file; written to a temporary name and moved into place
+        expected: Expected number of names, used to size the filter
+        fp_rate: Target false positive rate
+
+    Returns:
+        Number of names added
+    """
+    expected = max(expected, 1)
+    bits = max(int(-expected * math.log(fp_rate) / math.log(2) ** 2), 8)
+    hashes = max(round(bits / expected * math.log(2)), 1)
+    array = bytearray((bits + 7) // 8)
+    count = 0
+    for name in names:
+        name = normalize_name(name)
+        if not name:
+            continue
+        for position in _probes(name, bits, hashes):
+            array[position >> 3] |= 1 << (position & 7)
+        count += 1
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(HEADER.pack(MAGIC, bits, hashes, count))
+        f.write(array)
+    os.replace(temp_path, path)
+    return count
+
+
+class TakenNameFilter:
+    """Read-only Bloom filter of taken names"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bits, self.hashes, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a taken-name filter: {path}")
+
+    def __contains__(self, name: str) -> bool:
+        name = normalize_name(name)
+        if not name:
+            return False
+        offset = HEADER.size
+        return all(
+            self._map[offset + (position >> 3)] & (1 << (position & 7))
+            for position in _probes(name, self.bits, self.hashes)
+        )
+
+    def filter(self, candidates: Iterable[str]) -> List[str]:
+        """Keep only candidates that aren't taken"""
+        return [candidate for candidate in candidates if candidate not in self]
+
+    def taken(self, candidates: Iterable[str]) -> List[str]:
+        """Return the candidates that are (probably) taken, without duplicates"""
+        return [candidate for candidate in dict.fromkeys(candidates) if candidate in self]
+
+    def stats(self) -> dict:
+        """Describe the filter and its expected false positive rate"""
+        fp_rate = (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+        return {
+            "path": self.path,
+            "names": self.count,
+            "bytes": len(self._map),
+            "hashes": self.hashes,
+            "false_positive_rate": fp_rate
+        }
+
+
+def extract_candidates(text: str) -> List[str]:
+    """
+    Pull candidate names out of an LLM answer
+
+    List items are taken up to a ":" or " - " explanation and split on
+    commas, so "- CloudNest, SkyVault: storage brands" gives CloudNest and
+    SkyVault.
+    """
+    candidates = []
+    for line in text.splitlines():
+        match = LIST_ITEM.match(line)
+        if not match:
+            continue
+        item = re.split(r":| - | – ", match.group(1), maxsplit=1)[0]
+        for candidate in item.split(","):
+            candidate = candidate.strip(" *_`\"'")
+            if candidate and len(candidate.split()) <= 3:
+                candidates.append(candidate)
+    return list(dict.fromkeys(candidates))
+
+
+_filter: Optional[TakenNameFilter] = None
+_filter_loaded = False
+_filter_lock = threading.Lock()
+
+
+def get_taken_filter() -> Optional[TakenNameFilter]:
+    """
+    Get the shared taken-name filter, or None when filtering is disabled
+
+    TAKEN_NAMES_INDEX: Bloom filter file built with "python -m tools.taken_names build"
+    """
+    global _filter, _filter_loaded
+    if not _filter_loaded:
+        with _filter_lock:
+            if not _filter_loaded:
+                path = os.getenv("TAKEN_NAMES_INDEX")
+                _filter = TakenNameFilter(path) if path else None
+                _filter_loaded = True
+    return _filter
+
+
+def _read_names(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                yield line.split(",")[0]
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m tools.taken_names", description="Build the taken-name Bloom filter")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("names", help="Text file with one existing name or domain per line")
+    parser.add_argument("index", nargs="?", default=os.getenv("TAKEN_NAMES_INDEX", ".cache/taken_names.bloom"))
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Target false positive rate (default: 0.001)")
+    args = parser.parse_args(argv)
+
+    expected = sum(1 for _ in _read_names(args.names))
+    count = build_filter(_read_names(args.names), args.index, expected, args.fp_rate)
+    taken = TakenNameFilter(args.index)
+    print(f"Added {count} names to {args.index} ({taken.stats()['bytes']} bytes, {taken.hashes} hashes)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,20 +1,84 @@
 """
 Web search tool for CrewAI agents using SerperDev API
 """
+from typing import Any
+from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool
+from tools.search_cache import search_cache
+from monitoring.metrics import stage
+from pydantic import BaseModel, Field
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-def get_web_search_tool():
+class StubSearchSchema(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class StubSearchTool(BaseTool):
+    """Local stand-in for SerperDevTool returning deterministic results"""
+
+    name: str = "Search the internet with Serper"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    args_schema: type[BaseModel] = StubSearchSchema
+    latency: float = 0.0
+    n_results: int = 5
+
+    def _run(self, search_query: str, **kwargs: Any) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {
+            "searchParameters": {"q": search_query},
+            "organic": [
+                {
+                    "title": f"{search_query} result {position}",
+                    "link": f"https://example.com/{position}",
+                    "snippet": f"Trending keywords about {search_query}",
+                    "position": position
+                }
+                for position in range(1, self.n_results + 1)
+            ]
+        }
+
+
+class CachedSearchTool(BaseTool):
+    """Wraps a search tool with a SearchCache, keeping its name and arguments"""
+
+    name: str = "Search the internet with Serper"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    search_tool: Any = None
+    cache: Any = None
+
+    def _run(self, **kwargs: Any) -> Any:
+        with stage("search"):
+            return self.cache.get_or_search(kwargs, lambda: self.search_tool._run(**kwargs))
+
+
+def get_web_search_tool(backend: str = None):
     """
-    Initialize and return a web search tool.
+    Initialize and return a cached web search tool.
     Requires SERPER_API_KEY in environment variables.
     Get your API key from: https://serper.dev/
+
+    Args:
+        backend: "serper" or "stub"; defaults to WEB_SEARCH_BACKEND (serper)
     """
-    return SerperDevTool()
+    backend = (backend or os.getenv("WEB_SEARCH_BACKEND", "serper")).lower()
+    if backend == "stub":
+        search_tool = StubSearchTool(latency=float(os.getenv("WEB_SEARCH_STUB_LATENCY", 0)))
+    else:
+        search_tool = SerperDevTool()
+
+    return CachedSearchTool(
+        name=search_tool.name,
+        description=search_tool.description,
+        args_schema=search_tool.args_schema,
+        search_tool=search_tool,
+        cache=search_cache
+    )
 
 
 # Pre-configured search tool instance